@@ -0,0 +1,118 @@
+"""Benchmark connection pool settings on multi-request workloads.
+
+Runs sequential searches, parallel page fetches and a batch of concurrent
+queries against the mock SearXNG server, which adds a delay to each new
+connection to stand in for TCP and TLS setup. Reports the wall time and the
+number of connections the server accepted for each pool setting.
+
+    uv run python benchmarks/bench_pool.py [--latency S] [--connect-latency S]
+    uv run python benchmarks/bench_pool.py --url https://searxng.example.com [--http2]
+
+With --url the workloads run against a real instance instead, where HTTP/2
+can be compared (the mock server only speaks HTTP/1.1) but connections are
+not counted.
+"""
+
+import argparse
+import io
+import time
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from searxngr.batch import run_batch
+from searxngr.cache import EngineCache
+from searxngr.client import SearXNGClient
+from searxngr.testing import MockSearXNGServer
+
+SETTINGS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "no keepalive": {"keepalive_expiry": 0},
+    "max_connections=1": {"max_connections": 1},
+    "max_connections=4": {"max_connections": 4},
+}
+
+
+def sequential(client: SearXNGClient, rounds: int) -> None:
+    for i in range(rounds):
+        client.search(f"sequential {i}")
+
+
+def parallel_pages(client: SearXNGClient, rounds: int) -> None:
+    client.search_pages("parallel pages", range(1, rounds + 1), max_workers=rounds)
+
+
+def batch(client: SearXNGClient, rounds: int) -> None:
+    queries = [f"batch {i}" for i in range(rounds)]
+    run_batch(queries, client.search, concurrency=4, out=io.StringIO())
+
+
+WORKLOADS: Dict[str, Callable[[SearXNGClient, int], None]] = {
+    "sequential": sequential,
+    "parallel pages": parallel_pages,
+    "batch": batch,
+}
+
+
+def run(
+    url: str,
+    workload: Callable[[SearXNGClient, int], None],
+    rounds: int,
+    settings: Dict[str, Any],
+    server: Optional[MockSearXNGServer],
+) -> Dict[str, float]:
+    client = SearXNGClient(url=url, engine_cache=EngineCache(persist=False), **settings)
+    connections = server.connections if server else 0
+    start = time.perf_counter()
+    with patch("searxngr.client.console"):
+        workload(client, rounds)
+    elapsed = time.perf_counter() - start
+    client.client.close()
+    return {
+        "ms": elapsed * 1000,
+        "connections": server.connections - connections if server else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="benchmark a real SearXNG instance")
+    parser.add_argument("--http2", action="store_true", help="add HTTP/2 settings")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, metavar="SECONDS")
+    parser.add_argument(
+        "--connect-latency", type=float, default=0.02, metavar="SECONDS"
+    )
+    args = parser.parse_args()
+
+    settings = dict(SETTINGS)
+    if args.http2:
+        settings["http2"] = {"http2": True}
+        settings["http2 max_connections=1"] = {"http2": True, "max_connections": 1}
+
+    server = None
+    if args.url:
+        url = args.url
+    else:
+        server = MockSearXNGServer(
+            latency=args.latency, connect_latency=args.connect_latency
+        ).start()
+        url = server.url
+
+    try:
+        rows: List[str] = []
+        for workload_name, workload in WORKLOADS.items():
+            for name, setting in settings.items():
+                stats = run(url, workload, args.rounds, setting, server)
+                connections = f"{stats['connections']:>4}" if server else "   -"
+                rows.append(
+                    f"{workload_name:<16} {name:<24} {stats['ms']:>9.1f} ms "
+                    f"{connections} connections"
+                )
+        print("\n".join(rows))
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark the preferences page parsers.
+
+Builds a large preferences page by repeating the engine tables of the saved
+page in searxngr/testing/fixtures, then times the streaming parser against the
+BeautifulSoup tree walk.
+
+    uv run python benchmarks/bench_preferences.py [--copies N] [--rounds N]
+"""
+
+import argparse
+import os
+import re
+import time
+
+from searxngr.engines import (
+    _PreferencesParser,
+    _extract_engines_with_soup,
+    _unique_sorted_engines,
+)
+from searxngr.testing import FIXTURES_DIR
+
+FIXTURE = os.path.join(FIXTURES_DIR, "preferences.html")
+
+
+def build_page(copies: int) -> str:
+    """Repeat each engine table with renamed engines to grow the page."""
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    start = html.index("<table")
+    end = html.rindex("</table>") + len("</table>")
+    tables = html[start:end]
+    copied = [
+        re.sub(r'(<label for="[^"]*">)([^<]+)</label>', rf"\g<1>\2 {i}</label>", tables)
+        for i in range(copies)
+    ]
+    return html[:start] + "\n".join(copied) + html[end:]
+
+
+def parse_streaming(html: str) -> list:
+    parser = _PreferencesParser()
+    parser.feed(html)
+    parser.close()
+    return _unique_sorted_engines(parser.engines)
+
+
+def parse_soup(html: str) -> list:
+    return _unique_sorted_engines(_extract_engines_with_soup(html))
+
+
+def bench(name: str, func, html: str, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        engines = func(html)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<10} {best * 1000:>9.1f} ms  {len(engines)} engines")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    html = build_page(args.copies)
+    print(f"preferences page: {len(html) / 1024:.0f} KiB")
+    streaming = bench("streaming", parse_streaming, html, args.rounds)
+    soup = bench("soup", parse_soup, html, args.rounds)
+    print(f"speedup    {soup / streaming:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Benchmark suite for the searxngr search -> render pipeline.
+
+Uses the recorded SearXNG JSON responses and saved preferences page in
+searxngr/testing/fixtures, and the mock SearXNG server for the end-to-end
+main() runs, so no SearXNG instance is needed. Reports operations per second and the peak
+Python memory allocated by a single operation.
+
+    uv run python benchmarks/run.py [--filter TEXT] [--min-time SECONDS] [--json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+import httpx
+from rich.console import Console
+
+import searxngr.render as render
+from searxngr.cli import main
+from searxngr.client import SearXNGClient
+from searxngr.constants import MAX_CONTENT_WORDS
+from searxngr.engines import extract_engines_from_preferences
+from searxngr.results import to_search_results
+from searxngr.testing.mock_server import (
+    CATEGORY_FIXTURES,
+    FIXTURES_DIR,
+    MockSearXNGServer,
+)
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def measure(func: Callable[[], None], min_time: float) -> Dict[str, float]:
+    func()  # warm up imports and caches
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or count < 3:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+    return {
+        "ops_per_sec": count / elapsed,
+        "mean_ms": elapsed / count * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def decode_benchmark(category: str, repeat: int = 1) -> Callable[[], None]:
+    body = read_fixture(CATEGORY_FIXTURES[category])
+    if repeat > 1:
+        # a large page, as returned by instances with many image engines
+        data = json.loads(body)
+        data["results"] = data["results"] * repeat
+        body = json.dumps(data).encode("utf-8")
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        # send the body in chunks as it would arrive from the network
+        offsets = range(0, len(body) + 65536, 65536)
+        chunks = (body[start:end] for start, end in zip(offsets, offsets[1:]))
+        return httpx.Response(200, content=chunks)
+
+    transport = httpx.MockTransport(respond)
+    client = SearXNGClient(url="http://searxng.test")
+    client.client = httpx.Client(transport=transport)
+
+    def run() -> None:
+        with patch("searxngr.client.console"):
+            client.search("searxngr benchmark")
+
+    return run
+
+
+def preferences_benchmark() -> Callable[[], None]:
+    html = read_fixture("preferences.html").decode("utf-8")
+    return lambda: extract_engines_from_preferences(html)
+
+
+class SlowTerminal:
+    """Output file taking ``latency`` seconds for each write and flush.
+
+    Stands in for a slow terminal emulator, or an SSH session where each
+    write is sent in its own packet.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        return len(text)
+
+    def flush(self) -> None:
+        time.sleep(self.latency)
+
+    def isatty(self) -> bool:
+        return True
+
+
+class TerminalFile:
+    """Output file reporting itself as a terminal, so results go through Rich."""
+
+    def __init__(self, file) -> None:
+        self.file = file
+
+    def write(self, text: str) -> int:
+        return self.file.write(text)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def isatty(self) -> bool:
+        return True
+
+
+def render_benchmark(
+    category: str,
+    devnull,
+    redraw: bool = False,
+    count: int = 0,
+    max_content_words: int = MAX_CONTENT_WORDS,
+    plain: bool = False,
+) -> Callable[[], None]:
+    page = json.loads(read_fixture(CATEGORY_FIXTURES[category]))["results"]
+    if count:
+        # repeat the page for the number of results shown with -n
+        page = (page * (count // len(page) + 1))[:count]
+    results = to_search_results(page)
+    out = TerminalFile(devnull)
+    console = Console(file=out, width=100, force_terminal=True)
+
+    def run() -> None:
+        if not redraw:
+            # measure the first draw of new results, not the cached redraw
+            render.render_cache.clear()
+        with (
+            patch("searxngr.formatter.console", console),
+            contextlib.redirect_stdout(out),
+        ):
+            render.print_results(
+                results,
+                count=len(results),
+                max_content_words=max_content_words,
+                plain=plain,
+            )
+
+    return run
+
+
+def results_benchmark(category: str, keep_raw: bool) -> Callable[[], None]:
+    page = json.loads(read_fixture(CATEGORY_FIXTURES[category]))["results"]
+    return lambda: to_search_results(page, keep_raw)
+
+
+def main_benchmark(url: str, extra_args: List[str], devnull) -> Callable[[], None]:
+    argv = ["searxngr", "--searxng-url", url, "--np", "--no-cache", "-n", "15"]
+    argv += extra_args + ["searxngr benchmark"]
+
+    def run() -> None:
+        with patch.object(sys, "argv", argv), contextlib.redirect_stdout(devnull):
+            try:
+                main()
+            except SystemExit:
+                pass
+
+    return run
+
+
+def main_bench() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only run matching benchmarks")
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        devnull = stack.enter_context(open(os.devnull, "w"))
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        stack.enter_context(
+            patch.dict(os.environ, {"XDG_CONFIG_HOME": tmp, "XDG_CACHE_HOME": tmp})
+        )
+        url = stack.enter_context(MockSearXNGServer(page_size=20)).url
+
+        benchmarks: Dict[str, Callable[[], None]] = {
+            "decode general": decode_benchmark("general"),
+            "decode images": decode_benchmark("images"),
+            "decode images x25": decode_benchmark("images", repeat=25),
+            "preferences parse": preferences_benchmark(),
+            "results general": results_benchmark("general", keep_raw=False),
+            "results general raw": results_benchmark("general", keep_raw=True),
+        }
+        for category in CATEGORY_FIXTURES:
+            benchmarks[f"render {category}"] = render_benchmark(category, devnull)
+        benchmarks["redraw general"] = render_benchmark("general", devnull, redraw=True)
+        # -n 100 -m 0, to /dev/null and to a terminal taking 0.1 ms per write
+        benchmarks["render -n 100 -m 0"] = render_benchmark(
+            "general", devnull, count=100, max_content_words=0
+        )
+        benchmarks["render -n 100 -m 0 slow"] = render_benchmark(
+            "general", SlowTerminal(0.0001), count=100, max_content_words=0
+        )
+        benchmarks["render -n 100 -m 0 plain"] = render_benchmark(
+            "general", devnull, count=100, max_content_words=0, plain=True
+        )
+        benchmarks["main json"] = main_benchmark(url, ["--json"], devnull)
+        benchmarks["main render"] = main_benchmark(url, [], devnull)
+        benchmarks["main render news"] = main_benchmark(url, ["--news"], devnull)
+
+        report = {}
+        for name, func in benchmarks.items():
+            if args.filter not in name:
+                continue
+            report[name] = measure(func, args.min_time)
+            if not args.json:
+                stats = report[name]
+                print(
+                    f"{name:<26} {stats['ops_per_sec']:>10.1f} ops/s "
+                    f"{stats['mean_ms']:>9.2f} ms {stats['peak_kib']:>9.0f} KiB peak"
+                )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,72 @@
+import argparse
+import json
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from .errors import SearXNGError
+
+
+def read_queries(source: TextIO) -> Iterator[str]:
+    """Yield one query per line, skipping blank lines and # comments."""
+    for line in source:
+        query = line.strip()
+        if query and not query.startswith("#"):
+            yield query
+
+
+def run_batch(
+    queries: Iterable[str],
+    search: Callable[[str], list],
+    concurrency: int,
+    out: Optional[TextIO] = None,
+) -> int:
+    """Run queries with bounded concurrency, writing each result as it completes.
+
+    Each completed query is written as a single JSON line, either
+    ``{"query": ..., "results": [...]}`` or ``{"query": ..., "error": ...}``.
+    Queries are read lazily so at most ``2 * concurrency`` are pending at
+    once. Returns the number of failed queries.
+    """
+    out = out or sys.stdout
+    failures = 0
+    pending: Dict[Future, str] = {}
+    queries = iter(queries)
+
+    def write(line: Dict) -> None:
+        out.write(json.dumps(line, ensure_ascii=False) + "\n")
+        out.flush()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency * 2:
+                query = next(queries, None)
+                if query is None:
+                    exhausted = True
+                else:
+                    pending[pool.submit(search, query)] = query
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                query = pending.pop(future)
+                try:
+                    write({"query": query, "results": future.result()})
+                except SearXNGError as e:
+                    failures += 1
+                    write({"query": query, "error": str(e)})
+                except BrokenPipeError:
+                    # output closed early (e.g. piped into head), stop cleanly
+                    for remaining in pending:
+                        remaining.cancel()
+                    return failures
+
+    return failures
+
+
+def open_batch_source(args: argparse.Namespace) -> TextIO:
+    if args.batch == "-":
+        return sys.stdin
+    return open(args.batch, "r", encoding="utf-8")
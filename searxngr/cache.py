@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from xdg_base_dirs import xdg_cache_home
+
+from .constants import (
+    CACHE_TTL,
+    CACHE_MAX_SIZE,
+    RESULT_CACHE_FILE,
+    ENGINE_CACHE_TTL,
+    ENGINE_CACHE_FILE,
+)
+
+
+def cache_dir() -> str:
+    return os.path.join(xdg_cache_home(), "searxngr")
+
+
+class ResultCache:
+    """On-disk cache of search results with a TTL and LRU size eviction.
+
+    Entries are stored in a SQLite database so concurrent searxngr processes
+    can share the cache. ``ttl`` is in seconds and ``max_size`` in bytes.
+    Any database error is treated as a cache miss.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = CACHE_TTL,
+        max_size: int = CACHE_MAX_SIZE * 1024 * 1024,
+    ) -> None:
+        self.path = path if path else os.path.join(cache_dir(), RESULT_CACHE_FILE)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(url: str, params: Tuple[Any, ...]) -> str:
+        """Build a cache key from the instance URL and normalized search params."""
+        data = json.dumps([url.rstrip("/"), *params], separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, created REAL, accessed REAL, "
+                "size INTEGER, data BLOB)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached results for a key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT created, data FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                created, data = row
+                if now - created > self.ttl:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute(
+                    "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+                return json.loads(data)
+            except (sqlite3.Error, OSError, ValueError):
+                return None
+
+    def set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results for a key, evicting least recently used entries."""
+        now = time.time()
+        data = json.dumps(results, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_size:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (key, now, now, len(data), data),
+                )
+                conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+                self._evict(conn)
+                conn.commit()
+            except (sqlite3.Error, OSError):
+                pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        excess = total[0] - self.max_size
+        if excess <= 0:
+            return
+        evict = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed ASC"
+        ):
+            if excess <= 0:
+                break
+            evict.append((key,))
+            excess -= size
+        conn.executemany("DELETE FROM results WHERE key = ?", evict)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM results")
+                conn.commit()
+            except (sqlite3.Error, OSError):
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class EngineCache:
+    """Cache of the engine catalogue parsed from each instance's /preferences page.
+
+    Catalogues are kept in memory for the life of the process and persisted
+    as compact JSON keyed by instance URL, along with the ETag and
+    Last-Modified validators used to revalidate stale entries. With
+    ``persist=False`` the catalogue is only cached in memory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = ENGINE_CACHE_TTL,
+        persist: bool = True,
+    ) -> None:
+        self.path = path if path else os.path.join(cache_dir(), ENGINE_CACHE_FILE)
+        self.ttl = ttl
+        self.persist = persist
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if not self.persist:
+                return self._entries
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    self._entries = entries
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for an instance, fresh or not."""
+        with self._lock:
+            return self._load().get(url.rstrip("/"))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("fetched", 0) <= self.ttl
+
+    def set(
+        self,
+        url: str,
+        engines: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._load()[url.rstrip("/")] = {
+                "fetched": time.time(),
+                "etag": etag,
+                "last_modified": last_modified,
+                "engines": engines,
+            }
+            self._save()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as fresh after the server confirmed it is unchanged."""
+        with self._lock:
+            entry = self._load().get(url.rstrip("/"))
+            if entry is not None:
+                entry["fetched"] = time.time()
+                self._save()
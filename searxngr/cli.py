@@ -1,4 +1,5 @@
 import argparse
+import hashlib
 import json
 import os
 import platform
@@ -6,27 +7,35 @@ import random
 import shlex
 import shutil
 import subprocess
-
-from rich.table import Table
+import sys
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TextIO, Tuple
 
 from .__version__ import __version__
-from .console import InteractiveConsole as Console
 from .config import SearxngrConfig
-from .client import (
-    SearXNGClient,
-    SearXNGError,
-)
-from .formatter import print_results
-from .interactive import run_interactive_loop
 from .constants import (
+    LazyConsole as Console,
     SEARXNG_CATEGORIES,
     TIME_RANGE_OPTIONS,
     TIME_RANGE_SHORT_OPTIONS,
     SAFE_SEARCH_OPTIONS,
     URL_HANDLER,
+    SEARXNG_PAGE_SIZE,
+    PREFETCH_MAX_PAGES,
+    DAEMON_REPLY_MARGIN,
+    RETRY_MAX_BACKOFF,
     console,
     DEBUG,
 )
+from .results import to_search_results
+
+# httpx, rich and the rendering and interactive modules are imported on the
+# code paths that use them to keep start up fast for --version, --help and
+# non-interactive runs
+if TYPE_CHECKING:
+    from .client import SearXNGClient
+    from .render import ResultPrinter
+    from .prefetch import PagePrefetcher
 
 
 def parse_pre_args() -> argparse.Namespace:
@@ -59,11 +68,28 @@ def open_url(url: str, url_handler: str) -> bool:
         return False
 
 
+def write_json_lines(results: list, out: TextIO) -> None:
+    """Write each result as a compact JSON line and flush the page to readers."""
+    out.writelines(
+        json.dumps(result, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for result in results
+    )
+    out.flush()
+
+
 def handle_results(
-    results: list, args: argparse.Namespace, start_at: int = 0
+    results: list,
+    args: argparse.Namespace,
+    start_at: int = 0,
+    printer: Optional["ResultPrinter"] = None,
 ) -> tuple[bool, list]:
+    """Output the fetched results, returning whether to continue interactively.
+
+    With a ``printer`` the results have been printed as their pages arrived,
+    only the rest of them are printed.
+    """
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(json.dumps([result.to_dict() for result in results], indent=2))
         return (False, results)
 
     if not results:
@@ -87,16 +113,186 @@ def handle_results(
             console.print(f"[red]Error:[/red] No URL found in result {result}")
         return (False, results)
 
+    if printer is not None:
+        printer.update()
+        return (True, results)
+
+    from .render import print_results
+
     print_results(
         results,
         count=args.num,
         start_at=start_at,
         expand=args.expand,
         max_content_words=args.max_content_words,
+        plain=args.nocolor,
     )
     return (True, results)
 
 
+def get_search_args(args: argparse.Namespace) -> dict:
+    return dict(
+        safe_search=args.safe_search,
+        engines=args.engines,
+        language=args.language,
+        time_range=args.time_range,
+        site=args.site,
+        http_method=args.http_method.upper(),
+        categories=args.categories,
+    )
+
+
+def get_rate_limit(
+    args: argparse.Namespace, cfg: SearxngrConfig, url: str
+) -> Tuple[float, Optional[int]]:
+    """Return the requests per second and burst allowed for an instance."""
+    rate, burst = cfg.rate_limit_for(url)
+    # the command line options, when given, apply to every instance
+    if args.rate_limit is not None:
+        rate = args.rate_limit
+    if args.rate_limit_burst is not None:
+        burst = args.rate_limit_burst
+    return rate, burst
+
+
+def client_settings(
+    args: argparse.Namespace, cfg: SearxngrConfig, url: str
+) -> Dict[str, Any]:
+    """Return the options that change how the requests to an instance are made.
+
+    A searxngr daemon is only used by runs with the same settings as the run
+    that started it, so a search is never sent with another run's options.
+    The password is only compared by its hash.
+    """
+    password = cfg.searxng_password
+    rate_limit, rate_limit_burst = get_rate_limit(args, cfg, url)
+    return {
+        "username": cfg.searxng_username,
+        "password": (
+            hashlib.sha256(password.encode("utf-8")).hexdigest() if password else None
+        ),
+        "verify_ssl": not args.no_verify_ssl,
+        "no_user_agent": bool(args.noua),
+        "timeout": args.timeout,
+        "connect_timeout": args.connect_timeout,
+        "read_timeout": args.read_timeout,
+        "pool_timeout": args.pool_timeout,
+        "http2": args.http2,
+        "max_connections": args.max_connections,
+        "keepalive_expiry": args.keepalive_expiry,
+        "retries": args.retries,
+        "retry_backoff": args.retry_backoff,
+        "retry_deadline": args.retry_deadline,
+        "rate_limit": rate_limit,
+        "rate_limit_burst": rate_limit_burst,
+        "rate_limit_shared": args.rate_limit_shared,
+        "cache_ttl": cfg.cache_ttl,
+        "engine_cache_ttl": cfg.engine_cache_ttl,
+    }
+
+
+def daemon_reply_timeout(args: argparse.Namespace) -> float:
+    """Return how long to wait for a daemon to answer a forwarded call.
+
+    The daemon may retry a request until the retry deadline and then wait for
+    one more attempt, so a single HTTP timeout is not enough.
+    """
+    retry_time = 0.0
+    if args.retries:
+        retry_time = args.retry_deadline or args.retries * (
+            args.timeout + RETRY_MAX_BACKOFF
+        )
+    return retry_time + args.timeout + DAEMON_REPLY_MARGIN
+
+
+def estimate_page_count(available: int, start_at: int, num: int) -> int:
+    """Estimate the pages ``fetch_results()`` requests to show ``num`` results.
+
+    ``available`` is the number of results already fetched. Pages usually
+    hold ``SEARXNG_PAGE_SIZE`` results, and one more result than shown is
+    fetched so the next page is known to exist.
+    """
+    needed = start_at + num + 1 - available
+    return -(-needed // SEARXNG_PAGE_SIZE) if needed > 0 else 0
+
+
+def prefetch_next_pages(
+    prefetcher: "PagePrefetcher",
+    query: str,
+    args: argparse.Namespace,
+    results: list,
+    start_at: int,
+    pageno: int,
+) -> None:
+    """Prefetch the pages the interactive 'n' command will request.
+
+    'n' shows the buffered results until they run out, then calls
+    ``fetch_results()`` from ``pageno + 1`` for the page of results it moved
+    to, so those pages are fetched in the background now.
+    """
+    if args.num <= 0:
+        return
+    # the first page of results that is not fully buffered
+    next_start = start_at + args.num
+    while len(results) >= next_start + args.num:
+        next_start += args.num
+    page_count = estimate_page_count(len(results), next_start, args.num)
+    search_args = get_search_args(args)
+    for page in range(pageno + 1, pageno + 1 + min(page_count, prefetcher.max_pages)):
+        prefetcher.prefetch(query, page, **search_args)
+
+
+def fetch_results(
+    searxng: "SearXNGClient",
+    query: str,
+    args: argparse.Namespace,
+    results: list,
+    start_at: int,
+    pageno: int,
+    prefetcher: Optional["PagePrefetcher"] = None,
+    on_page: Optional[Callable[[list], None]] = None,
+    keep_raw: bool = True,
+) -> tuple[list, int]:
+    """Fetch pages until ``results`` holds the results to show.
+
+    Pages are added to ``results`` as ``SearchResult`` objects, keeping the
+    raw JSON only if ``keep_raw`` is set. ``on_page`` is called with each raw
+    page as it arrives.
+    """
+    search_args = get_search_args(args)
+
+    if args.parallel_pages and args.num > 0:
+        # estimate the pages needed for the requested results and fetch them
+        # together, then merge back in page order
+        page_count = estimate_page_count(len(results), start_at, args.num)
+        if page_count > 1:
+            pages = searxng.search_pages(
+                query, range(pageno, pageno + page_count), **search_args
+            )
+            for page in pages:
+                if len(page) == 0:
+                    return results, pageno
+                results.extend(to_search_results(page, keep_raw))
+                if on_page:
+                    on_page(page)
+                pageno += 1
+
+    while len(results) <= (start_at + args.num):
+        query_results = (
+            prefetcher.take(query, pageno, **search_args) if prefetcher else None
+        )
+        if query_results is None:
+            query_results = searxng.search(query, pageno=pageno, **search_args)
+        results.extend(to_search_results(query_results, keep_raw))
+        if on_page and query_results:
+            on_page(query_results)
+        if args.num == 0 or len(query_results) == 0:
+            break
+        pageno += 1
+
+    return results, pageno
+
+
 def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Perform a search using SearXNG")
     parser.add_argument(
@@ -121,6 +317,62 @@ def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
         metavar="SEARXNG_URL",
         help=f"SearXNG instance URL (default: {cfg.searxng_url if cfg.searxng_url else 'NOT SET'})",
     )
+    parser.add_argument(
+        "--searxng-urls",
+        type=str,
+        nargs="+",
+        default=cfg.searxng_urls,
+        metavar="SEARXNG_URL",
+        help="search several SearXNG instances at once and merge the results",
+    )
+    parser.add_argument(
+        "--fanout-quorum",
+        type=int,
+        default=cfg.fanout_quorum,
+        metavar="N",
+        help=f"with --searxng-urls, return once N instances have answered, 0 for all (default: {cfg.fanout_quorum})",
+    )
+    parser.add_argument(
+        "--fanout-deadline",
+        type=float,
+        default=cfg.fanout_deadline,
+        metavar="SECONDS",
+        help=(
+            "with --searxng-urls, stop waiting for slower instances after SECONDS, "
+            f"0 for no deadline (default: {cfg.fanout_deadline})"
+        ),
+    )
+    parser.add_argument(
+        "--failover",
+        action="store_true",
+        default=cfg.failover,
+        help="with --searxng-urls, search the fastest healthy instance and fail over to the others on errors",
+    )
+    parser.add_argument(
+        "--hedge",
+        type=float,
+        dest="hedge_percentile",
+        default=cfg.hedge_percentile,
+        metavar="PERCENTILE",
+        help=(
+            "with --failover, also search the next instance when one is slower "
+            "than PERCENTILE of its recent response times, 0 to disable "
+            f"(default: {cfg.hedge_percentile})"
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="FILE",
+        help="run each line of FILE (or - for stdin) as a query and output JSON lines",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=cfg.batch_concurrency,
+        metavar="N",
+        help=f"number of batch queries to run at the same time (default: {cfg.batch_concurrency})",
+    )
     parser.add_argument(
         "-c",
         "--categories",
@@ -181,11 +433,103 @@ def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
         metavar="SECONDS",
         help=f"HTTP request timeout in seconds (default: {cfg.http_timeout})",
     )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=cfg.connect_timeout,
+        metavar="SECONDS",
+        help="timeout for establishing a connection to the server (default: --timeout)",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=cfg.read_timeout,
+        metavar="SECONDS",
+        help="timeout for receiving a response from the server (default: --timeout)",
+    )
+    parser.add_argument(
+        "--pool-timeout",
+        type=float,
+        default=cfg.pool_timeout,
+        metavar="SECONDS",
+        help="timeout for waiting for a free connection in the pool (default: --timeout)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=cfg.retries,
+        metavar="N",
+        help=f"retry requests that time out or fail with 429 or 5xx up to N times (default: {cfg.retries})",
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=float,
+        default=cfg.retry_backoff,
+        metavar="SECONDS",
+        help=f"base of the randomized exponential wait between retries (default: {cfg.retry_backoff})",
+    )
+    parser.add_argument(
+        "--retry-deadline",
+        type=float,
+        default=cfg.retry_deadline,
+        metavar="SECONDS",
+        help=(
+            "do not retry a request once SECONDS have passed since its first attempt, "
+            f"0 for no deadline (default: {cfg.retry_deadline})"
+        ),
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        metavar="RATE",
+        help=f"send at most RATE requests per second to each instance, 0 for no limit (default: {cfg.rate_limit})",
+    )
+    parser.add_argument(
+        "--rate-limit-burst",
+        type=int,
+        default=None,
+        metavar="N",
+        help="number of requests that may be sent at once before the rate limit applies (default: RATE)",
+    )
+    parser.add_argument(
+        "--rate-limit-shared",
+        action="store_true",
+        default=cfg.rate_limit_shared,
+        help="share the rate limit between all searxngr processes on this host",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        default=cfg.http2,
+        help="use HTTP/2 when the server supports it, requires the h2 package",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=cfg.max_connections,
+        metavar="N",
+        help=f"maximum number of connections to the server (default: {cfg.max_connections})",
+    )
+    parser.add_argument(
+        "--keepalive-expiry",
+        type=float,
+        default=cfg.keepalive_expiry,
+        metavar="SECONDS",
+        help=f"close idle connections after SECONDS (default: {cfg.keepalive_expiry})",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
         help="output the search results in JSON format and exit",
     )
+    parser.add_argument(
+        "--ndjson",
+        "--json-lines",
+        action="store_true",
+        dest="ndjson",
+        help="output each search result as a JSON line as soon as its page arrives and exit",
+    )
     parser.add_argument(
         "-l",
         "--language",
@@ -220,7 +564,7 @@ def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
         "--nocolor",
         action="store_true",
         default=cfg.no_color,
-        help="disable colored output",
+        help="disable colored output and write results as plain text",
     )
     parser.add_argument(
         "--np",
@@ -228,6 +572,27 @@ def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
         action="store_true",
         help="just search and exit, do not prompt",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=cfg.no_cache,
+        help="do not read or write cached search results and engine lists",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore cached search results and engine lists and fetch fresh ones from the server",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="run in the foreground as a daemon that keeps connections to the server open for other searxngr commands",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="connect to the server directly even when a searxngr daemon is running",
+    )
     parser.add_argument(
         "--noua",
         action="store_true",
@@ -242,6 +607,18 @@ def create_parser(cfg: SearxngrConfig) -> argparse.ArgumentParser:
         metavar="N",
         help=f"show N results per page (default: {cfg.result_count}); N=0 uses the servers default per page",
     )
+    parser.add_argument(
+        "--parallel-pages",
+        action="store_true",
+        default=cfg.parallel_pages,
+        help="fetch all the pages needed for the requested results concurrently",
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        default=cfg.prefetch,
+        help="fetch the next page of results in the background in interactive mode",
+    )
     parser.add_argument(
         "--safe-search",
         type=str,
@@ -393,13 +770,19 @@ def main() -> None:
             exit(1)
         exit(0)
     if args.version:
-        console.print(__version__)
+        print(__version__)
         exit(0)
     if pre_args.help:
         parser.print_help()
         exit(0)
 
-    if not args.searxng_url:
+    # an explicit --searxng-url searches that instance only
+    if args.searxng_url != cfg.searxng_url or not args.searxng_urls:
+        args.searxng_urls = None
+    elif len(args.searxng_urls) == 1:
+        args.searxng_url = args.searxng_urls[0]
+        args.searxng_urls = None
+    if not args.searxng_url and not args.searxng_urls:
         console.print(
             "[red]Error:[/red] No SearXNG instance URL set. Use --searxng-url or run `searxngr --config`"
         )
@@ -451,6 +834,30 @@ def main() -> None:
         args.num = 1
     if args.unsafe:
         args.safe_search = "none"
+    if args.max_connections < 1:
+        console.print("[red]Error:[/red] --max-connections must be at least 1")
+        exit(1)
+    if args.fanout_quorum < 0 or args.fanout_deadline < 0:
+        console.print(
+            "[red]Error:[/red] --fanout-quorum and --fanout-deadline must not be negative"
+        )
+        exit(1)
+    if args.retries < 0 or args.retry_backoff < 0 or args.retry_deadline < 0:
+        console.print(
+            "[red]Error:[/red] --retries, --retry-backoff and --retry-deadline must not be negative"
+        )
+        exit(1)
+    if (args.rate_limit or 0) < 0 or (args.rate_limit_burst or 0) < 0:
+        console.print(
+            "[red]Error:[/red] --rate-limit and --rate-limit-burst must not be negative"
+        )
+        exit(1)
+    if not 0 <= args.hedge_percentile < 100:
+        console.print("[red]Error:[/red] --hedge must be between 0 and 100")
+        exit(1)
+    if args.searxng_urls and args.daemon:
+        console.print("[red]Error:[/red] --daemon serves a single SearXNG instance")
+        exit(1)
 
     from .constants import validate_url_handler
 
@@ -478,14 +885,131 @@ def main() -> None:
             f"[dim]Default commands for your platform: {URL_HANDLER.get(platform.system(), 'unknown')}[/dim]"
         )
 
-    searxng = SearXNGClient(
-        url=args.searxng_url,
-        username=cfg.searxng_username,
-        password=cfg.searxng_password,
-        verify_ssl=not args.no_verify_ssl,
-        no_user_agent=args.noua,
-        timeout=args.timeout,
-    )
+    from .errors import SearXNGError
+
+    searxng = None
+    retry = None
+    if not (
+        args.searxng_urls
+        or args.daemon
+        or args.no_daemon
+        or args.no_cache
+        or args.refresh
+    ):
+        # forward to a running daemon for the same instance, which already has
+        # warm connections and the engine list in memory
+        from .daemon import connect_daemon
+
+        searxng = connect_daemon(
+            args.searxng_url,
+            timeout=args.timeout,
+            settings=client_settings(args, cfg, args.searxng_url),
+            reply_timeout=daemon_reply_timeout(args),
+        )
+
+    if searxng is None:
+        from .cache import EngineCache, ResultCache
+        from .client import SearXNGClient
+        from .ratelimit import (
+            SharedTokenBucket,
+            TokenBucket,
+            shared_rate_limit_available,
+        )
+        from .retry import RetryPolicy
+
+        cache = None
+        if not args.no_cache and cfg.cache_ttl > 0:
+            cache = ResultCache(
+                ttl=cfg.cache_ttl, max_size=cfg.cache_max_size * 1024 * 1024
+            )
+
+        engine_cache = EngineCache(ttl=cfg.engine_cache_ttl, persist=not args.no_cache)
+        # shared by every client so the retry counts cover all instances
+        retry = RetryPolicy(
+            retries=args.retries,
+            backoff=args.retry_backoff,
+            deadline=args.retry_deadline,
+        )
+
+        if args.rate_limit_shared and not shared_rate_limit_available():
+            console.print(
+                "[yellow]Warning:[/yellow] --rate-limit-shared is not supported on "
+                "this platform, the rate limit applies to this process only."
+            )
+        rate_limiters: Dict[str, "TokenBucket"] = {}
+
+        def create_rate_limiter(url: str) -> Optional["TokenBucket"]:
+            rate, burst = get_rate_limit(args, cfg, url)
+            if not rate:
+                return None
+            key = url.rstrip("/")
+            if key not in rate_limiters:
+                if args.rate_limit_shared and shared_rate_limit_available():
+                    rate_limiters[key] = SharedTokenBucket(url, rate, burst)
+                else:
+                    rate_limiters[key] = TokenBucket(rate, burst)
+            return rate_limiters[key]
+
+        def create_client(url: str) -> "SearXNGClient":
+            return SearXNGClient(
+                url=url,
+                username=cfg.searxng_username,
+                password=cfg.searxng_password,
+                verify_ssl=not args.no_verify_ssl,
+                no_user_agent=args.noua,
+                timeout=args.timeout,
+                cache=cache,
+                refresh_cache=args.refresh,
+                engine_cache=engine_cache,
+                http2=args.http2,
+                max_connections=args.max_connections,
+                keepalive_expiry=args.keepalive_expiry,
+                connect_timeout=args.connect_timeout,
+                read_timeout=args.read_timeout,
+                pool_timeout=args.pool_timeout,
+                retry=retry,
+                rate_limiter=create_rate_limiter(url),
+            )
+
+        if args.searxng_urls and args.failover:
+            from .health import InstanceHealth
+            from .multi import FailoverSearXNGClient
+
+            searxng = FailoverSearXNGClient(
+                [create_client(url) for url in args.searxng_urls],
+                InstanceHealth(persist=not args.no_cache),
+                hedge_percentile=args.hedge_percentile,
+            )
+        elif args.searxng_urls:
+            from .multi import MultiSearXNGClient
+
+            searxng = MultiSearXNGClient(
+                [create_client(url) for url in args.searxng_urls],
+                quorum=args.fanout_quorum,
+                deadline=args.fanout_deadline,
+            )
+        else:
+            searxng = create_client(args.searxng_url)
+
+    if args.daemon:
+        from .daemon import SearXNGDaemon
+
+        daemon = SearXNGDaemon(
+            searxng, settings=client_settings(args, cfg, args.searxng_url)
+        )
+        try:
+            daemon.bind()
+        except (SearXNGError, OSError) as e:
+            console.print(f"[red]Error:[/red] Could not start daemon: {e}")
+            exit(1)
+        console.print(
+            f"searxngr daemon for {args.searxng_url} listening on {daemon.path}"
+        )
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        exit(0)
 
     if args.list_engines:
         try:
@@ -494,6 +1018,8 @@ def main() -> None:
             console.print(f"[red]Error:[/red] {e}")
             exit(1)
 
+        from rich.table import Table
+
         table = Table()
         table.add_column("Engine", style="cyan", no_wrap=True)
         table.add_column("URL")
@@ -528,6 +1054,9 @@ def main() -> None:
         except SearXNGError as e:
             console.print(f"[red]Error:[/red] {e}")
             exit(1)
+
+        from rich.table import Table
+
         table = Table(leading=True)
         table.add_column("Category", style="cyan", no_wrap=True)
         table.add_column("Engines")
@@ -538,45 +1067,134 @@ def main() -> None:
         console.print(table)
         exit(0)
 
+    if args.batch:
+        if args.batch_concurrency < 1:
+            console.print("[red]Error:[/red] --batch-concurrency must be at least 1")
+            exit(1)
+
+        from .batch import open_batch_source, read_queries, run_batch
+
+        def search(batch_query: str) -> list:
+            pages: list = []
+            fetch_results(
+                searxng,
+                batch_query,
+                args,
+                [],
+                0,
+                1,
+                on_page=pages.extend,
+                keep_raw=False,
+            )
+            return pages
+
+        try:
+            source = open_batch_source(args)
+        except OSError as e:
+            console.print(f"[red]Error:[/red] Could not read batch file: {e}")
+            exit(1)
+        # keep stdout clean for the JSON lines, diagnostics go to stderr
+        out = sys.stdout
+        with source, redirect_stdout(sys.stderr):
+            failures = run_batch(
+                read_queries(source), search, args.batch_concurrency, out
+            )
+            if retry is not None and retry.total:
+                counts = ", ".join(f"{k}: {v}" for k, v in sorted(retry.counts.items()))
+                console.print(f"Retried {retry.total} requests ({counts})")
+        exit(1 if failures else 0)
+
     if query == "":
         parser.print_usage()
         exit(0)
 
+    if args.ndjson:
+        # keep stdout clean for the JSON lines, diagnostics go to stderr
+        out = sys.stdout
+        try:
+            with redirect_stdout(sys.stderr):
+                fetch_results(
+                    searxng,
+                    query,
+                    args,
+                    [],
+                    0,
+                    1,
+                    on_page=lambda page: write_json_lines(page, out),
+                    keep_raw=False,
+                )
+        except SearXNGError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            exit(1)
+        except BrokenPipeError:
+            # output closed early (e.g. piped into head), silence the final
+            # flush of stdout at exit
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, out.fileno())
+        exit(0)
+
     pageno = 1
     start_at = 0
     results = []
+    prefetcher = None
+    # the raw JSON is only needed for --json and the interactive 'j' command
+    keep_raw = args.json or not args.np
+    if args.prefetch and not args.np:
+        from .prefetch import PagePrefetcher
+
+        # room for every page the next fetch is expected to need
+        prefetcher = PagePrefetcher(
+            searxng,
+            max_pages=max(PREFETCH_MAX_PAGES, estimate_page_count(0, 0, args.num)),
+        )
 
     while True:
-        while len(results) <= (start_at + args.num):
-            try:
-                query_results = searxng.search(
-                    query,
-                    safe_search=args.safe_search,
-                    engines=args.engines,
-                    language=args.language,
-                    time_range=args.time_range,
-                    site=args.site,
-                    pageno=pageno,
-                    http_method=args.http_method.upper(),
-                    categories=args.categories,
-                )
-            except SearXNGError as e:
-                console.print(f"[red]Error:[/red] {e}")
-                exit(1)
-            results.extend(query_results)
-            if args.num == 0 or len(query_results) == 0:
-                break
-            pageno += 1
+        # print each page of results as it arrives, instead of waiting for all
+        # the pages needed
+        printer = None
+        if not (args.json or args.first or args.lucky):
+            from . import render
 
-        continue_loop, results = handle_results(results, args, start_at)
+            printer = render.ResultPrinter(
+                results,
+                args.num,
+                start_at=start_at,
+                expand=args.expand,
+                max_content_words=args.max_content_words,
+                plain=args.nocolor,
+            )
+            # results left over from the previous page
+            printer.update()
+        try:
+            results, pageno = fetch_results(
+                searxng,
+                query,
+                args,
+                results,
+                start_at,
+                pageno,
+                prefetcher,
+                on_page=lambda page: printer.update() if printer else None,
+                keep_raw=keep_raw,
+            )
+        except SearXNGError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            exit(1)
+
+        continue_loop, results = handle_results(results, args, start_at, printer)
         if not continue_loop:
             exit(0)
 
         if args.np:
             exit(0)
 
+        if prefetcher:
+            prefetch_next_pages(prefetcher, query, args, results, start_at, pageno)
+
+        from .interactive import run_interactive_loop
+
         new_query, start_at, pageno, results = run_interactive_loop(
-            args, results, query, start_at, pageno, searxng
+            args, results, query, start_at, pageno, searxng, prefetcher
         )
         query = new_query
 
@@ -1,48 +1,210 @@
+import asyncio
 import json
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 import httpx
-from typing import List, Dict, Any, Optional, Union
+from typing import (
+    List,
+    Dict,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from .constants import (
     USER_AGENT,
     SAFE_SEARCH_OPTIONS,
+    MAX_PARALLEL_PAGES,
+    MAX_CONNECTIONS,
+    KEEPALIVE_EXPIRY,
     PREFERENCES_URL_PATH,
     console,
 )
 from .engines import extract_engines_from_preferences
+from .cache import EngineCache, ResultCache
+from .ratelimit import TokenBucket
+from .retry import RetryPolicy, parse_retry_after
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .stream import SearchResponseDecoder
+
+# the exception types are also importable from this module
+from .errors import (  # noqa: F401
+    SearXNGError,
+    SearXNGConnectionError,
+    SearXNGTimeoutError,
+    SearXNGHTTPError,
+    SearXNGJSONError,
+)
 
 
-class SearXNGError(Exception):
-    """Base exception for SearXNG client errors"""
-
-    pass
-
-
-class SearXNGConnectionError(SearXNGError):
-    """Connection error to SearXNG instance"""
-
-    pass
-
-
-class SearXNGTimeoutError(SearXNGError):
-    """Timeout error when connecting to SearXNG instance"""
-
-    pass
-
-
-class SearXNGHTTPError(SearXNGError):
-    """HTTP error response from SearXNG instance"""
-
-    pass
-
-
-class SearXNGJSONError(SearXNGError):
-    """JSON decode error from SearXNG response"""
-
-    pass
-
+@contextmanager
+def _translate_errors(
+    url: str, path: str, timeout: Union[int, float]
+) -> Iterator[None]:
+    """Map httpx exceptions raised while sending a request to SearXNGError types."""
+    try:
+        yield
+    except httpx.HTTPStatusError as e:
+        raise SearXNGHTTPError(
+            str(e),
+            e.response.status_code,
+            parse_retry_after(e.response.headers.get("Retry-After")),
+        ) from e
+    except httpx.ConnectError as ce:
+        raise SearXNGConnectionError(
+            f"Could not connect to SearXNG instance at {url}{path}"
+        ) from ce
+    except httpx.TimeoutException as te:
+        raise SearXNGTimeoutError(
+            f"Request to SearXNG instance at {url}{path} "
+            f"timed out after {timeout} seconds."
+        ) from te
+
+
+def build_search_request(
+    query: str,
+    pageno: int = 0,
+    safe_search: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    engines: Optional[List[str]] = None,
+    language: Optional[str] = None,
+    time_range: Optional[str] = None,
+    site: Optional[str] = None,
+    http_method: str = "GET",
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Build the search path and, for POST requests, the form body."""
+    query = f"site:{site} {query}" if site else query
+    path = None
+    body = None
+
+    if engines and categories:
+        console.print("Engines setting ignored when using categories")
+
+    if http_method == "POST":
+        path = "/search"
+        body = {
+            "q": query,
+            "format": "json",
+        }
+        if categories:
+            if "social+media" in categories:
+                for i in range(len(categories)):
+                    if categories[i] == "social+media":
+                        categories[i] = "social media"
+            body["categories"] = ",".join(categories)
+        if engines and not categories:
+            body["engines"] = ",".join(engines)
+        if language:
+            body["language"] = language
+        if pageno > 1:
+            body["pageno"] = str(pageno)
+        if safe_search:
+            body["safesearch"] = str(SAFE_SEARCH_OPTIONS[safe_search])
+        if time_range:
+            body["time_range"] = time_range
+
+    elif http_method == "GET":
+        path = f"/search?q={query}&format=json"
+        path += f"&categories={','.join(categories)}" if categories else ""
+        path += f"&engines={','.join(engines)}" if engines and not categories else ""
+        path += f"&language={language}" if language else ""
+        path += f"&safesearch={SAFE_SEARCH_OPTIONS[safe_search]}" if safe_search else ""
+        path += f"&time_range={time_range}" if time_range else ""
+        path += f"&pageno={pageno}" if pageno > 1 else ""
+    else:
+        raise ValueError("Invalid http_method specified. Use 'GET' or 'POST'.")
+
+    path = "".join(c for c in path if c.isprintable())
+    return path, body
+
+
+def normalize_search_params(
+    query: str,
+    pageno: int = 0,
+    safe_search: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    engines: Optional[List[str]] = None,
+    language: Optional[str] = None,
+    time_range: Optional[str] = None,
+    site: Optional[str] = None,
+    http_method: str = "GET",
+) -> Tuple[Any, ...]:
+    """Return a hashable key identifying the results a search request returns.
+
+    Requests that differ only in ways SearXNG ignores (page 0 vs 1, engine
+    order, engines alongside categories) produce the same key.
+    """
+    categories = sorted(c.replace("+", " ") for c in categories) if categories else []
+    engines = sorted(engines) if engines and not categories else []
+    return (
+        query.strip(),
+        max(pageno, 1),
+        safe_search,
+        tuple(categories),
+        tuple(engines),
+        language,
+        time_range,
+        site,
+        http_method.upper(),
+    )
+
+
+def report_unresponsive_engines(unresponsive_engines: List[List[str]]) -> None:
+    unique_list = [
+        list(item) for item in {tuple(sublist) for sublist in unresponsive_engines}
+    ]
+    for engine, error in unique_list:
+        console.print(f"Engine: {engine} [red]{error}[/red]")
+
+
+def extract_search_results(data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Report unresponsive engines and return the results list of a search response."""
+    if (
+        data
+        and "unresponsive_engines" in data
+        and len(data["unresponsive_engines"]) > 0
+    ):
+        report_unresponsive_engines(data["unresponsive_engines"])
+
+    if data and "results" in data:
+        return data["results"]
+    else:
+        return []
+
+
+def group_engines_by_category(engines: List[Dict[str, Any]]) -> Dict[str, set]:
+    """Build a sorted mapping of category name to the set of engine names."""
+    unique_categories = dict()
+    for engine in engines:
+        for category in engine["categories"]:
+            if category not in unique_categories.keys():
+                unique_categories[category] = set()
+            if engine["name"] not in unique_categories[category]:
+                unique_categories[category].add(engine["name"])
+
+    sorted_categories = dict(sorted(unique_categories.items()))
+    return sorted_categories
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _BaseSearXNGClient(ABC):
+    """Connection settings shared by the sync and async SearXNG clients."""
 
-class SearXNGClient:
     def __init__(
         self,
         url: str,
@@ -51,6 +213,19 @@ class SearXNGClient:
         verify_ssl: bool = True,
         no_user_agent: Optional[bool] = None,
         timeout: Union[int, float] = 30,
+        cache: Optional[ResultCache] = None,
+        refresh_cache: bool = False,
+        engine_cache: Optional[EngineCache] = None,
+        http2: bool = False,
+        max_connections: int = MAX_CONNECTIONS,
+        keepalive_expiry: Optional[float] = KEEPALIVE_EXPIRY,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        on_response_time: Optional[Callable[[float], None]] = None,
+        on_unresponsive_engines: Optional[Callable[[List[List[str]]], None]] = None,
     ) -> None:
         self.url = url
         self.username = username
@@ -58,52 +233,188 @@ class SearXNGClient:
         self.verify_ssl = verify_ssl
         self.no_user_agent = no_user_agent
         self.timeout = timeout
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self.engine_cache = engine_cache
+        # GET requests and searches are retried, both are safe to repeat
+        self.retry = retry if retry is not None else RetryPolicy()
+        # every request to the instance, retries included, takes a token
+        self.rate_limiter = rate_limiter
+        # called with the seconds each search request to the instance took,
+        # searches answered from the result cache are not reported
+        self.on_response_time = on_response_time
+        # called with the unresponsive engines a search response lists, instead
+        # of printing them
+        self.on_unresponsive_engines = on_unresponsive_engines
         self.default_headers = {
             "Accept": "application/json",
             "Accept-Encoding": "gzip, deflate",
             "User-Agent": USER_AGENT,
         }
 
-        if username and password:
-            auth = httpx.BasicAuth(username, password)
-            self.client = httpx.Client(
-                verify=verify_ssl,
-                timeout=httpx.Timeout(timeout),
-                auth=auth,
-            )
-        else:
-            self.client = httpx.Client(
-                verify=verify_ssl, timeout=httpx.Timeout(timeout)
+        if http2 and not _http2_available():
+            console.print(
+                "[yellow]Warning:[/yellow] HTTP/2 needs the h2 package, install "
+                "searxngr[http2] to enable it. Using HTTP/1.1."
             )
+            http2 = False
+        self.http2 = http2
+
+        client_args: Dict[str, Any] = {
+            "verify": verify_ssl,
+            "timeout": httpx.Timeout(
+                timeout,
+                connect=timeout if connect_timeout is None else connect_timeout,
+                read=timeout if read_timeout is None else read_timeout,
+                pool=timeout if pool_timeout is None else pool_timeout,
+            ),
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            "http2": http2,
+        }
+        if username and password:
+            client_args["auth"] = httpx.BasicAuth(username, password)
+        self.client = self._create_client(**client_args)
+        # identical searches and engine list downloads made at the same time
+        # share one request
+        self._in_flight = self._create_single_flight()
 
         if no_user_agent:
             del self.client.headers["User-Agent"]
             del self.default_headers["User-Agent"]
 
+    @abstractmethod
+    def _create_client(self, **kwargs: Any) -> Union[httpx.Client, httpx.AsyncClient]:
+        """Return the httpx client requests are sent with."""
+
+    @abstractmethod
+    def _create_single_flight(self) -> Union[SingleFlight, AsyncSingleFlight]:
+        """Return the group identical in-flight requests are shared through."""
+
+    def _request_headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        if headers is None:
+            headers = {}
+        headers.update(self.default_headers)
+        return headers
+
+    def _cache_key(self, query: str, **search_args: Any) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return ResultCache.make_key(
+            self.url, normalize_search_params(query, **search_args)
+        )
+
+    def _cached_results(
+        self, cache_key: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        if cache_key is None or self.refresh_cache:
+            return None
+        return self.cache.get(cache_key)
+
+    def _store_results(
+        self, cache_key: Optional[str], results: List[Dict[str, Any]]
+    ) -> None:
+        # empty pages are usually transient engine failures, keep retrying them
+        if cache_key is not None and results:
+            self.cache.set(cache_key, results)
+
+    def _stream_args(
+        self, path: str, body: Optional[Dict[str, Any]], http_method: str
+    ) -> Dict[str, Any]:
+        """Return the ``client.stream()`` arguments for a search request."""
+        headers = {}
+        if http_method == "POST":
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        return {
+            "method": http_method,
+            "url": f"{self.url}{path}",
+            "data": body,
+            "headers": self._request_headers(headers),
+            "follow_redirects": True,
+        }
+
+    def _finish_search(
+        self,
+        decoder: SearchResponseDecoder,
+        cache_key: Optional[str],
+        results: Optional[List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Decode the end of a search response and return its last results."""
+        remaining = decoder.close()
+        if decoder.unresponsive_engines:
+            if self.on_unresponsive_engines is not None:
+                self.on_unresponsive_engines(decoder.unresponsive_engines)
+            else:
+                report_unresponsive_engines(decoder.unresponsive_engines)
+        if results is not None:
+            results.extend(remaining)
+            self._store_results(cache_key, results)
+        return remaining
+
+    def _report_response_time(self, start: float) -> None:
+        if self.on_response_time is not None:
+            self.on_response_time(time.monotonic() - start)
+
+    def _cached_engines(self) -> Optional[Dict[str, Any]]:
+        if self.engine_cache is None or self.refresh_cache:
+            return None
+        return self.engine_cache.get(self.url)
+
+    def _preferences_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {"Accept": "application/html"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _not_modified(
+        self, entry: Optional[Dict[str, Any]], error: SearXNGHTTPError
+    ) -> bool:
+        if entry is not None and error.status_code == 304:
+            self.engine_cache.touch(self.url)
+            return True
+        return False
+
+    def _parse_engines(self, response: httpx.Response) -> List[Dict[str, Any]]:
+        engines = extract_engines_from_preferences(response.text)
+        if self.engine_cache is not None:
+            self.engine_cache.set(
+                self.url,
+                engines,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return engines
+
+
+class SearXNGClient(_BaseSearXNGClient):
+    def _create_client(self, **kwargs: Any) -> httpx.Client:
+        return httpx.Client(**kwargs)
+
+    def _create_single_flight(self) -> SingleFlight:
+        return SingleFlight()
+
     def get(
         self, path: str, headers: Optional[Dict[str, str]] = None
     ) -> httpx.Response:
-        try:
-            if headers is None:
-                headers = {}
-            headers.update(self.default_headers)
-            response = self.client.get(
-                f"{self.url}{path}", headers=headers, follow_redirects=True
-            )
-            response.raise_for_status()
-            return response
+        headers = self._request_headers(headers)
 
-        except httpx.HTTPStatusError as e:
-            raise SearXNGHTTPError(str(e)) from e
-        except httpx.ConnectError as ce:
-            raise SearXNGConnectionError(
-                f"Could not connect to SearXNG instance at {self.url}{path}"
-            ) from ce
-        except httpx.TimeoutException as te:
-            raise SearXNGTimeoutError(
-                f"Request to SearXNG instance at {self.url}{path} "
-                f"timed out after {self.timeout} seconds."
-            ) from te
+        def request() -> httpx.Response:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with _translate_errors(self.url, path, self.timeout):
+                response = self.client.get(
+                    f"{self.url}{path}", headers=headers, follow_redirects=True
+                )
+                response.raise_for_status()
+                return response
+
+        return self.retry.call(request)
 
     def post(
         self,
@@ -111,52 +422,33 @@ class SearXNGClient:
         data: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> httpx.Response:
-        try:
-            if headers is None:
-                headers = {}
-            headers.update(self.default_headers)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with _translate_errors(self.url, path, self.timeout):
+            headers = self._request_headers(headers)
             response = self.client.post(
                 f"{self.url}{path}", data=data, headers=headers, follow_redirects=True
             )
             response.raise_for_status()
             return response
 
-        except httpx.HTTPStatusError as e:
-            raise SearXNGHTTPError(str(e)) from e
-        except httpx.ConnectError as ce:
-            raise SearXNGConnectionError(
-                f"Could not connect to SearXNG instance at {self.url}{path}"
-            ) from ce
-        except httpx.TimeoutException as te:
-            raise SearXNGTimeoutError(
-                f"Request to SearXNG instance at {self.url}{path} "
-                f"timed out after {self.timeout} seconds."
-            ) from te
-
-    def _fetch_preferences(self) -> str:
-        headers = {"Accept": "application/html"}
-        response = self.get(PREFERENCES_URL_PATH, headers)
-        data = response.text
-        return data
-
     def engines(self) -> List[Dict[str, Any]]:
-        html = self._fetch_preferences()
-        data = extract_engines_from_preferences(html)
-        return data
+        return self._in_flight.do("engines", self._fetch_engines)
+
+    def _fetch_engines(self) -> List[Dict[str, Any]]:
+        entry = self._cached_engines()
+        if entry is not None and self.engine_cache.is_fresh(entry):
+            return entry["engines"]
+        try:
+            response = self.get(PREFERENCES_URL_PATH, self._preferences_headers(entry))
+        except SearXNGHTTPError as e:
+            if self._not_modified(entry, e):
+                return entry["engines"]
+            raise
+        return self._parse_engines(response)
 
     def categories(self) -> Dict[str, set]:
-        html = self._fetch_preferences()
-        data = extract_engines_from_preferences(html)
-        unique_categories = dict()
-        for engine in data:
-            for category in engine["categories"]:
-                if category not in unique_categories.keys():
-                    unique_categories[category] = set()
-                if engine["name"] not in unique_categories[category]:
-                    unique_categories[category].add(engine["name"])
-
-        sorted_categories = dict(sorted(unique_categories.items()))
-        return sorted_categories
+        return group_engines_by_category(self.engines())
 
     def search(
         self,
@@ -170,86 +462,316 @@ class SearXNGClient:
         site: Optional[str] = None,
         http_method: str = "GET",
     ) -> List[Dict[str, Any]]:
-        query = f"site:{site} {query}" if site else query
-        path = None
-        body = None
+        """Return the results of a search.
+
+        Concurrent calls with the same normalized parameters share one
+        request, and each caller gets its own list of the results.
+        """
+        search_args = dict(
+            pageno=pageno,
+            safe_search=safe_search,
+            categories=categories,
+            engines=engines,
+            language=language,
+            time_range=time_range,
+            site=site,
+            http_method=http_method,
+        )
+        key = normalize_search_params(query, **search_args)
+        return list(
+            self._in_flight.do(
+                ("search", key), lambda: list(self.iter_search(query, **search_args))
+            )
+        )
 
-        if engines and categories:
-            console.print("Engines setting ignored when using categories")
+    def iter_search(
+        self,
+        query: str,
+        pageno: int = 0,
+        safe_search: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        engines: Optional[List[str]] = None,
+        language: Optional[str] = None,
+        time_range: Optional[str] = None,
+        site: Optional[str] = None,
+        http_method: str = "GET",
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the results of a search as they are decoded from the response.
+
+        The response body is decoded as it is received, so the first results
+        are available before the whole page has arrived and the full body is
+        never held in memory.
+        """
+        search_args = dict(
+            pageno=pageno,
+            safe_search=safe_search,
+            categories=categories,
+            engines=engines,
+            language=language,
+            time_range=time_range,
+            site=site,
+            http_method=http_method,
+        )
+        cache_key = self._cache_key(query, **search_args)
+        cached = self._cached_results(cache_key)
+        if cached is not None:
+            yield from cached
+            return
+
+        path, body = build_search_request(query, **search_args)
+        start = time.monotonic()
+        attempt = 0
 
-        if http_method == "POST":
-            path = "/search"
-            body = {
-                "q": query,
-                "format": "json",
-            }
-            if categories:
-                if "social+media" in categories:
-                    for i in range(len(categories)):
-                        if categories[i] == "social+media":
-                            categories[i] = "social media"
-                body["categories"] = ",".join(categories)
-            if engines and not categories:
-                body["engines"] = ",".join(engines)
-            if language:
-                body["language"] = language
-            if pageno > 1:
-                body["pageno"] = str(pageno)
-            if safe_search:
-                body["safesearch"] = str(SAFE_SEARCH_OPTIONS[safe_search])
-            if time_range:
-                body["time_range"] = time_range
-
-        elif http_method == "GET":
-            path = f"/search?q={query}&format=json"
-            path += f"&categories={','.join(categories)}" if categories else ""
-            path += (
-                f"&engines={','.join(engines)}" if engines and not categories else ""
+        try:
+            while True:
+                decoder = SearchResponseDecoder()
+                # only kept when the page is cached, callers get each result
+                # as it is yielded
+                results: Optional[List[Dict[str, Any]]] = [] if cache_key else None
+                received = False
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                request_start = time.monotonic()
+                try:
+                    with _translate_errors(self.url, path, self.timeout):
+                        with self.client.stream(
+                            **self._stream_args(path, body, http_method)
+                        ) as response:
+                            response.raise_for_status()
+                            for chunk in response.iter_bytes():
+                                for result in decoder.feed(chunk):
+                                    received = True
+                                    if results is not None:
+                                        results.append(result)
+                                    yield result
+                    self._report_response_time(request_start)
+                    break
+                except SearXNGError as e:
+                    # results already handed out can not be taken back
+                    if received:
+                        raise
+                    time.sleep(self.retry.delay(attempt, e, start))
+                    attempt += 1
+            yield from self._finish_search(decoder, cache_key, results)
+
+        except json.JSONDecodeError as e:
+            raise SearXNGJSONError(f"Could not decode JSON response: {e}") from e
+
+    def search_pages(
+        self,
+        query: str,
+        pagenos: Iterable[int],
+        max_workers: int = MAX_PARALLEL_PAGES,
+        **search_args: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch several result pages concurrently, returned in page order."""
+        pagenos = list(pagenos)
+        if not pagenos:
+            return []
+        categories = search_args.pop("categories", None)
+
+        def fetch(pageno: int) -> List[Dict[str, Any]]:
+            return self.search(
+                query,
+                pageno=pageno,
+                categories=list(categories) if categories else categories,
+                **search_args,
             )
-            path += f"&language={language}" if language else ""
-            path += (
-                f"&safesearch={SAFE_SEARCH_OPTIONS[safe_search]}" if safe_search else ""
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pagenos))) as pool:
+            return list(pool.map(fetch, pagenos))
+
+
+class AsyncSearXNGClient(_BaseSearXNGClient):
+    """asyncio variant of SearXNGClient built on httpx.AsyncClient.
+
+    Offers the same search/engines/categories surface and raises the same
+    SearXNGError subclasses, so many searches can share one event loop.
+    """
+
+    def _create_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        return httpx.AsyncClient(**kwargs)
+
+    def _create_single_flight(self) -> AsyncSingleFlight:
+        return AsyncSingleFlight()
+
+    async def __aenter__(self) -> "AsyncSearXNGClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def get(
+        self, path: str, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        headers = self._request_headers(headers)
+
+        async def request() -> httpx.Response:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+            with _translate_errors(self.url, path, self.timeout):
+                response = await self.client.get(
+                    f"{self.url}{path}", headers=headers, follow_redirects=True
+                )
+                response.raise_for_status()
+                return response
+
+        return await self.retry.acall(request)
+
+    async def post(
+        self,
+        path: str,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire()
+        with _translate_errors(self.url, path, self.timeout):
+            headers = self._request_headers(headers)
+            response = await self.client.post(
+                f"{self.url}{path}", data=data, headers=headers, follow_redirects=True
             )
-            path += f"&time_range={time_range}" if time_range else ""
-            path += f"&pageno={pageno}" if pageno > 1 else ""
-        else:
-            raise ValueError("Invalid http_method specified. Use 'GET' or 'POST'.")
+            response.raise_for_status()
+            return response
 
-        path = "".join(c for c in path if c.isprintable())
+    async def engines(self) -> List[Dict[str, Any]]:
+        return await self._in_flight.do("engines", self._fetch_engines)
 
+    async def _fetch_engines(self) -> List[Dict[str, Any]]:
+        entry = self._cached_engines()
+        if entry is not None and self.engine_cache.is_fresh(entry):
+            return entry["engines"]
         try:
-            response = None
+            response = await self.get(
+                PREFERENCES_URL_PATH, self._preferences_headers(entry)
+            )
+        except SearXNGHTTPError as e:
+            if self._not_modified(entry, e):
+                return entry["engines"]
+            raise
+        return self._parse_engines(response)
 
-            if http_method == "POST":
-                headers = {
-                    "Content-Type": "application/x-www-form-urlencoded",
-                }
-                response = self.post(path, data=body, headers=headers)
-            else:
-                response = self.get(path)
-
-            data = response.json()
-
-            if (
-                data
-                and "unresponsive_engines" in data
-                and len(data["unresponsive_engines"]) > 0
-            ):
-                unique_list = [
-                    list(item)
-                    for item in {
-                        tuple(sublist) for sublist in data["unresponsive_engines"]
-                    }
-                ]
-                for engine, error in unique_list:
-                    console.print(f"Engine: {engine} [red]{error}[/red]")
-
-            if data and "results" in data:
-                return data["results"]
-            else:
-                return []
+    async def categories(self) -> Dict[str, set]:
+        return group_engines_by_category(await self.engines())
+
+    async def search(
+        self,
+        query: str,
+        pageno: int = 0,
+        safe_search: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        engines: Optional[List[str]] = None,
+        language: Optional[str] = None,
+        time_range: Optional[str] = None,
+        site: Optional[str] = None,
+        http_method: str = "GET",
+    ) -> List[Dict[str, Any]]:
+        """Return the results of a search, sharing identical concurrent searches."""
+        search_args = dict(
+            pageno=pageno,
+            safe_search=safe_search,
+            categories=categories,
+            engines=engines,
+            language=language,
+            time_range=time_range,
+            site=site,
+            http_method=http_method,
+        )
+
+        async def search() -> List[Dict[str, Any]]:
+            return [result async for result in self.iter_search(query, **search_args)]
+
+        key = normalize_search_params(query, **search_args)
+        return list(await self._in_flight.do(("search", key), search))
+
+    async def iter_search(
+        self,
+        query: str,
+        pageno: int = 0,
+        safe_search: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        engines: Optional[List[str]] = None,
+        language: Optional[str] = None,
+        time_range: Optional[str] = None,
+        site: Optional[str] = None,
+        http_method: str = "GET",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the results of a search as they are decoded from the response."""
+        search_args = dict(
+            pageno=pageno,
+            safe_search=safe_search,
+            categories=categories,
+            engines=engines,
+            language=language,
+            time_range=time_range,
+            site=site,
+            http_method=http_method,
+        )
+        cache_key = self._cache_key(query, **search_args)
+        cached = self._cached_results(cache_key)
+        if cached is not None:
+            for result in cached:
+                yield result
+            return
+
+        path, body = build_search_request(query, **search_args)
+        start = time.monotonic()
+        attempt = 0
+
+        try:
+            while True:
+                decoder = SearchResponseDecoder()
+                results: Optional[List[Dict[str, Any]]] = [] if cache_key else None
+                received = False
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.aacquire()
+                request_start = time.monotonic()
+                try:
+                    with _translate_errors(self.url, path, self.timeout):
+                        async with self.client.stream(
+                            **self._stream_args(path, body, http_method)
+                        ) as response:
+                            response.raise_for_status()
+                            async for chunk in response.aiter_bytes():
+                                for result in decoder.feed(chunk):
+                                    received = True
+                                    if results is not None:
+                                        results.append(result)
+                                    yield result
+                    self._report_response_time(request_start)
+                    break
+                except SearXNGError as e:
+                    if received:
+                        raise
+                    await asyncio.sleep(self.retry.delay(attempt, e, start))
+                    attempt += 1
+            for result in self._finish_search(decoder, cache_key, results):
+                yield result
 
         except json.JSONDecodeError as e:
             raise SearXNGJSONError(f"Could not decode JSON response: {e}") from e
-        except SearXNGError:
-            raise
+
+    async def search_pages(
+        self,
+        query: str,
+        pagenos: Iterable[int],
+        max_workers: int = MAX_PARALLEL_PAGES,
+        **search_args: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch several result pages concurrently, returned in page order."""
+        categories = search_args.pop("categories", None)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(pageno: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search(
+                    query,
+                    pageno=pageno,
+                    categories=list(categories) if categories else categories,
+                    **search_args,
+                )
+
+        return list(await asyncio.gather(*(fetch(pageno) for pageno in pagenos)))
@@ -4,8 +4,7 @@ import shlex
 import shutil
 import textwrap
 import configparser
-import httpx
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from xdg_base_dirs import xdg_config_home
 
 from .constants import (
@@ -17,10 +16,30 @@ from .constants import (
     CONFIG_FILE,
     HTTP_METHOD,
     HTTP_TIMEOUT,
+    HTTP2,
+    MAX_CONNECTIONS,
+    KEEPALIVE_EXPIRY,
     URL_HANDLER,
     SECONDARY_URL_HANDLER,
     SEARXNG_CATEGORIES,
     MAX_CONTENT_WORDS,
+    PARALLEL_PAGES,
+    PREFETCH,
+    NO_CACHE,
+    CACHE_TTL,
+    CACHE_MAX_SIZE,
+    ENGINE_CACHE_TTL,
+    BATCH_CONCURRENCY,
+    FANOUT_QUORUM,
+    FANOUT_DEADLINE,
+    FAILOVER,
+    HEDGE_PERCENTILE,
+    RETRIES,
+    RETRY_BACKOFF,
+    RETRY_DEADLINE,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_SHARED,
     console,
 )
 
@@ -110,6 +129,11 @@ class SearxngrConfig:
             f"""
             [searxngr]
             searxng_url = {searxng_url}
+            # searxng_urls = https://searx1.example.com https://searx2.example.com
+            # fanout_quorum = {FANOUT_QUORUM}
+            # fanout_deadline = {FANOUT_DEADLINE}
+            # failover = {str(FAILOVER).lower()}
+            # hedge_percentile = {HEDGE_PERCENTILE}
             # result_count = {RESULT_COUNT}
             # categories = general news social+media
             # safe_search = {SAFE_SEARCH}
@@ -118,12 +142,36 @@ class SearxngrConfig:
             # language = en
             # http_method = {HTTP_METHOD}
             # timeout = {HTTP_TIMEOUT}
+            # connect_timeout = {HTTP_TIMEOUT}
+            # read_timeout = {HTTP_TIMEOUT}
+            # pool_timeout = {HTTP_TIMEOUT}
+            # http2 = {str(HTTP2).lower()}
+            # max_connections = {MAX_CONNECTIONS}
+            # keepalive_expiry = {KEEPALIVE_EXPIRY}
+            # retries = {RETRIES}
+            # retry_backoff = {RETRY_BACKOFF}
+            # retry_deadline = {RETRY_DEADLINE}
+            # rate_limit = {RATE_LIMIT}
+            # rate_limit_burst = {RATE_LIMIT_BURST}
+            # rate_limit_shared = {str(RATE_LIMIT_SHARED).lower()}
             {no_verify_ssl_line}
             # no_user_agent = false
             # no_color = false
             # max_content_words = {MAX_CONTENT_WORDS}
+            # parallel_pages = {str(PARALLEL_PAGES).lower()}
+            # prefetch = {str(PREFETCH).lower()}
+            # no_cache = {str(NO_CACHE).lower()}
+            # cache_ttl = {CACHE_TTL}
+            # cache_max_size = {CACHE_MAX_SIZE}
+            # engine_cache_ttl = {ENGINE_CACHE_TTL}
+            # batch_concurrency = {BATCH_CONCURRENCY}
             url_handler = {url_handler}
             # secondary_url_handler =
+
+            # settings for one instance, overriding the ones above
+            # [https://searx1.example.com]
+            # rate_limit = 1
+            # rate_limit_burst = 2
         """
         ).split("\n", 1)[1:][0]
 
@@ -140,6 +188,8 @@ class SearxngrConfig:
         exit(0)
 
     def validate_searxng_url(self, url: str, verify_ssl: bool) -> tuple[bool, str]:
+        import httpx
+
         try:
             client = httpx.Client(verify=verify_ssl, timeout=10)
             response = client.get(f"{url.rstrip('/')}/search?q=test&format=json")
@@ -208,8 +258,8 @@ class SearxngrConfig:
             return default
 
     def get_config_float(
-        self, parser: configparser.ConfigParser, key: str, default: float
-    ) -> float:
+        self, parser: configparser.ConfigParser, key: str, default: Optional[float]
+    ) -> Optional[float]:
         try:
             return (
                 float(parser["searxngr"][key])
@@ -238,6 +288,38 @@ class SearxngrConfig:
             )
             return default
 
+    def get_instance_rate_limits(
+        self, parser: configparser.ConfigParser
+    ) -> Dict[str, Tuple[Optional[float], Optional[int]]]:
+        """Return the rate_limit and rate_limit_burst set in each instance section.
+
+        Sections other than [searxngr] are named after an instance URL, a
+        setting missing from the section is None.
+        """
+        limits = {}
+        for section in parser.sections():
+            if section == "searxngr":
+                continue
+            try:
+                rate = parser[section].getfloat("rate_limit")
+                burst = parser[section].getint("rate_limit_burst")
+            except ValueError as ve:
+                console.print(
+                    f'[red]Error:[/red] unable to set rate limit for "{section}", '
+                    f"using default setting. [dim]{ve}[/dim]"
+                )
+                continue
+            limits[section.rstrip("/")] = (rate, burst)
+        return limits
+
+    def rate_limit_for(self, url: str) -> Tuple[float, int]:
+        """Return the rate limit and burst for an instance."""
+        rate, burst = self.instance_rate_limits.get(url.rstrip("/"), (None, None))
+        return (
+            self.rate_limit if rate is None else rate,
+            self.rate_limit_burst if burst is None else burst,
+        )
+
     @classmethod
     def validate_category(cls, category: str) -> bool:
         if category not in SEARXNG_CATEGORIES:
@@ -258,6 +340,16 @@ class SearxngrConfig:
                 parser.read(self.config_file)
 
         self.searxng_url = self.get_config_str(parser, "searxng_url", None)
+        # searching several instances at once replaces searxng_url when set
+        self.searxng_urls = self.get_config_list(parser, "searxng_urls", None)
+        self.fanout_quorum = self.get_config_int(parser, "fanout_quorum", FANOUT_QUORUM)
+        self.fanout_deadline = self.get_config_float(
+            parser, "fanout_deadline", FANOUT_DEADLINE
+        )
+        self.failover = self.get_config_bool(parser, "failover", FAILOVER)
+        self.hedge_percentile = self.get_config_float(
+            parser, "hedge_percentile", HEDGE_PERCENTILE
+        )
         self.searxng_username = self.get_config_str(parser, "searxng_username", None)
         self.searxng_password = self.get_config_str(parser, "searxng_password", None)
         self.result_count = self.get_config_int(parser, "result_count", RESULT_COUNT)
@@ -275,9 +367,50 @@ class SearxngrConfig:
         self.debug = self.get_config_bool(parser, "debug", False)
         self.http_method = self.get_config_str(parser, "http_method", HTTP_METHOD)
         self.http_timeout = self.get_config_float(parser, "timeout", HTTP_TIMEOUT)
+        # the connect, read and pool timeouts fall back to timeout when unset
+        self.connect_timeout = self.get_config_float(parser, "connect_timeout", None)
+        self.read_timeout = self.get_config_float(parser, "read_timeout", None)
+        self.pool_timeout = self.get_config_float(parser, "pool_timeout", None)
+        self.http2 = self.get_config_bool(parser, "http2", HTTP2)
+        self.max_connections = self.get_config_int(
+            parser, "max_connections", MAX_CONNECTIONS
+        )
+        self.keepalive_expiry = self.get_config_float(
+            parser, "keepalive_expiry", KEEPALIVE_EXPIRY
+        )
+        self.retries = self.get_config_int(parser, "retries", RETRIES)
+        self.retry_backoff = self.get_config_float(
+            parser, "retry_backoff", RETRY_BACKOFF
+        )
+        self.retry_deadline = self.get_config_float(
+            parser, "retry_deadline", RETRY_DEADLINE
+        )
+        self.rate_limit = self.get_config_float(parser, "rate_limit", RATE_LIMIT)
+        self.rate_limit_burst = self.get_config_int(
+            parser, "rate_limit_burst", RATE_LIMIT_BURST
+        )
+        self.rate_limit_shared = self.get_config_bool(
+            parser, "rate_limit_shared", RATE_LIMIT_SHARED
+        )
+        self.instance_rate_limits = self.get_instance_rate_limits(parser)
         self.no_user_agent = self.get_config_bool(parser, "no_user_agent", False)
         self.no_verify_ssl = self.get_config_bool(parser, "no_verify_ssl", False)
         self.no_color = self.get_config_bool(parser, "no_color", False)
         self.max_content_words = self.get_config_int(
             parser, "max_content_words", MAX_CONTENT_WORDS
         )
+        self.parallel_pages = self.get_config_bool(
+            parser, "parallel_pages", PARALLEL_PAGES
+        )
+        self.prefetch = self.get_config_bool(parser, "prefetch", PREFETCH)
+        self.no_cache = self.get_config_bool(parser, "no_cache", NO_CACHE)
+        self.cache_ttl = self.get_config_float(parser, "cache_ttl", CACHE_TTL)
+        self.cache_max_size = self.get_config_int(
+            parser, "cache_max_size", CACHE_MAX_SIZE
+        )
+        self.engine_cache_ttl = self.get_config_float(
+            parser, "engine_cache_ttl", ENGINE_CACHE_TTL
+        )
+        self.batch_concurrency = self.get_config_int(
+            parser, "batch_concurrency", BATCH_CONCURRENCY
+        )
@@ -1,9 +1,10 @@
-from typing import Optional, List, Union, Any
+from typing import TYPE_CHECKING, Optional, List, Union, Any
 from rich.console import Console
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import InMemoryHistory
 from getpass import getpass
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
 
 # This allows the prompt to accept up/down arrows for history navigation
 # based on https://github.com/Textualize/rich/issues/262#issuecomment-2546430217
@@ -11,15 +12,18 @@ class InteractiveConsole(Console):
     def __init__(
         self, history: Optional[Union[str, List[str]]] = None, *args: Any, **kwargs: Any
     ) -> None:
-        self._history = InMemoryHistory(history)
-        self._session: Optional[PromptSession] = None
+        self._history = history
+        self._session: Optional["PromptSession"] = None
         super().__init__(*args, **kwargs)
 
     @property
-    def session(self) -> PromptSession:
+    def session(self) -> "PromptSession":
         """Lazy-load the PromptSession only when needed for interactive input."""
         if self._session is None:
-            self._session = PromptSession(history=self._history)
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.history import InMemoryHistory
+
+            self._session = PromptSession(history=InMemoryHistory(self._history))
         return self._session
 
     def input(
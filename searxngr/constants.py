@@ -1,13 +1,33 @@
 import shutil
 import shlex
-from typing import List
+from typing import Any, List
 
-from .console import InteractiveConsole as Console
 from .__version__ import __version__
 
+
+class LazyConsole:
+    """Stand-in for an ``InteractiveConsole`` that is created on first use.
+
+    Rich is only imported once something is printed through the console, so
+    runs that write their results as plain text never load it.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._args = args
+        self._kwargs = kwargs
+        self._console = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from .console import InteractiveConsole
+
+            self._console = InteractiveConsole(*self._args, **self._kwargs)
+        return getattr(self._console, name)
+
+
 DEBUG = False
 
-console = Console()
+console = LazyConsole()
 
 SAMPLE_SEARXNG_URL = "https://searxng.example.com"
 SEARXNG_URL = ""
@@ -18,10 +38,57 @@ EXPAND = False
 CONFIG_FILE = "config.ini"
 HTTP_METHOD = "GET"
 HTTP_TIMEOUT = 30.0
+HTTP2 = False
+# httpx defaults, all pooled connections are kept alive for reuse
+MAX_CONNECTIONS = 100
+KEEPALIVE_EXPIRY = 5.0
 USER_AGENT = f"searxngr/{__version__}"
 CATEGORIES = None
 
 MAX_CONTENT_WORDS = 128
+PARALLEL_PAGES = False
+# Typical number of results SearXNG returns per page, used to estimate how
+# many pages to request at once when fetching pages in parallel.
+SEARXNG_PAGE_SIZE = 10
+MAX_PARALLEL_PAGES = 5
+PREFETCH = False
+PREFETCH_MAX_PAGES = 2
+NO_CACHE = False
+CACHE_TTL = 900
+CACHE_MAX_SIZE = 50
+RESULT_CACHE_FILE = "results.sqlite3"
+ENGINE_CACHE_TTL = 3600
+ENGINE_CACHE_FILE = "engines.json"
+BATCH_CONCURRENCY = 4
+# searches sent to several instances wait for all of them (quorum 0) with no
+# deadline unless these are set
+FANOUT_QUORUM = 0
+FANOUT_DEADLINE = 0.0
+FAILOVER = False
+# hedging is off unless a latency percentile is set
+HEDGE_PERCENTILE = 0.0
+HEALTH_FILE = "health.json"
+# weight of the newest request in the rolling instance statistics, the number
+# of recent response times kept for percentiles and needed before hedging, and
+# how long an unhealthy instance is skipped after it last failed
+HEALTH_ALPHA = 0.3
+HEALTH_SAMPLES = 50
+HEALTH_MIN_SAMPLES = 5
+HEALTH_RETRY_AFTER = 60.0
+# transient failures are not retried unless retries is set; the wait before
+# retry n is up to RETRY_BACKOFF * 2 ** n seconds, capped at RETRY_MAX_BACKOFF
+RETRIES = 0
+RETRY_BACKOFF = 0.5
+RETRY_MAX_BACKOFF = 10.0
+RETRY_DEADLINE = 60.0
+# requests per second sent to an instance, 0 for no limit; the burst defaults
+# to one second of requests
+RATE_LIMIT = 0.0
+RATE_LIMIT_BURST = 0
+RATE_LIMIT_SHARED = False
+DAEMON_SOCKET_FILE = "daemon.sock"
+# seconds added to the longest time a daemon may take over a forwarded call
+DAEMON_REPLY_MARGIN = 10.0
 PREFERENCES_URL_PATH = "/preferences"
 
 SAFE_SEARCH_OPTIONS = {
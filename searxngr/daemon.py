@@ -0,0 +1,377 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from xdg_base_dirs import xdg_runtime_dir
+
+from .__version__ import __version__
+from .cache import cache_dir
+from .constants import DAEMON_SOCKET_FILE, MAX_PARALLEL_PAGES
+from .errors import (
+    SearXNGError,
+    SearXNGConnectionError,
+    SearXNGTimeoutError,
+    SearXNGHTTPError,
+    SearXNGJSONError,
+)
+
+# the client side of the daemon only needs the standard library so forwarded
+# searches skip loading httpx
+if TYPE_CHECKING:
+    from .client import SearXNGClient
+
+ERROR_TYPES = {
+    error.__name__: error
+    for error in (
+        SearXNGError,
+        SearXNGConnectionError,
+        SearXNGTimeoutError,
+        SearXNGHTTPError,
+        SearXNGJSONError,
+    )
+}
+
+
+def daemon_socket_path() -> str:
+    """Return the Unix socket path, under $XDG_RUNTIME_DIR when it is set."""
+    runtime_dir = xdg_runtime_dir()
+    base = os.path.join(runtime_dir, "searxngr") if runtime_dir else cache_dir()
+    return os.path.join(base, DAEMON_SOCKET_FILE)
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return (
+        json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        + b"\n"
+    )
+
+
+def encode_error(error: SearXNGError) -> Dict[str, Any]:
+    return {
+        "type": type(error).__name__,
+        "message": str(error),
+        "status_code": getattr(error, "status_code", None),
+    }
+
+
+def decode_error(error: Dict[str, Any]) -> SearXNGError:
+    error_type = ERROR_TYPES.get(error.get("type", ""), SearXNGError)
+    message = error.get("message", "Unknown searxngr daemon error")
+    if error_type is SearXNGHTTPError:
+        return SearXNGHTTPError(message, error.get("status_code"))
+    return error_type(message)
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Answer each JSON line request on a connection with one JSON line."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"error": encode_error(SearXNGError(f"Bad request: {e}"))}
+            else:
+                response = self.server.searxngr_daemon.dispatch(request)
+            try:
+                self.wfile.write(encode_message(response))
+                self.wfile.flush()
+            except OSError:
+                return
+
+
+class SearXNGDaemon:
+    """Serve searches for the CLI over a Unix socket from a long running process.
+
+    The daemon holds one ``SearXNGClient`` so its connection pool and engine
+    list stay warm between ``searxngr`` invocations. Requests are JSON lines of
+    the form ``{"method": ..., "params": {...}}`` and each is answered with
+    ``{"result": ...}`` or ``{"error": {"type": ..., "message": ...}}``.
+    Search replies also carry the ``unresponsive_engines`` the instance
+    reported, for the CLI to print.
+
+    ``settings`` holds the client options the daemon was started with. They
+    are returned by ``ping`` so ``connect_daemon()`` can skip a daemon that
+    would send requests with other options than the caller's.
+    """
+
+    def __init__(
+        self,
+        searxng: "SearXNGClient",
+        path: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.searxng = searxng
+        self.path = path if path else daemon_socket_path()
+        self.settings = settings
+        self._server: Optional[socketserver.BaseServer] = None
+        # the unresponsive engines reported while a thread runs a search
+        self._local = threading.local()
+        searxng.on_unresponsive_engines = self._collect_unresponsive_engines
+
+    def _collect_unresponsive_engines(self, engines: List[List[str]]) -> None:
+        collected = getattr(self._local, "unresponsive_engines", None)
+        if collected is not None:
+            collected.extend(engines)
+
+    def _search(
+        self, unresponsive_engines: List[List[str]], **params: Any
+    ) -> List[Dict[str, Any]]:
+        self._local.unresponsive_engines = unresponsive_engines
+        try:
+            return self.searxng.search(**params)
+        finally:
+            self._local.unresponsive_engines = None
+
+    def _search_pages(
+        self,
+        unresponsive_engines: List[List[str]],
+        query: str,
+        pagenos: Iterable[int],
+        max_workers: int = MAX_PARALLEL_PAGES,
+        **search_args: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        # each page is searched here rather than by SearXNGClient.search_pages,
+        # so the engines reported in the worker threads are collected
+        pagenos = list(pagenos)
+        if not pagenos:
+            return []
+        categories = search_args.pop("categories", None)
+
+        def fetch(pageno: int) -> List[Dict[str, Any]]:
+            return self._search(
+                unresponsive_engines,
+                query=query,
+                pageno=pageno,
+                categories=list(categories) if categories else categories,
+                **search_args,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pagenos))) as pool:
+            return list(pool.map(fetch, pagenos))
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method")
+        params = request.get("params") or {}
+        unresponsive_engines: List[List[str]] = []
+        try:
+            if method == "ping":
+                result: Any = {
+                    "url": self.searxng.url,
+                    "version": __version__,
+                    "settings": self.settings,
+                }
+            elif method == "search":
+                result = self._search(unresponsive_engines, **params)
+            elif method == "search_pages":
+                result = self._search_pages(unresponsive_engines, **params)
+            elif method == "engines":
+                result = self.searxng.engines()
+            elif method == "categories":
+                result = {
+                    category: sorted(engines)
+                    for category, engines in self.searxng.categories().items()
+                }
+            else:
+                raise SearXNGError(f"Unknown searxngr daemon method '{method}'")
+        except SearXNGError as e:
+            return {"error": encode_error(e)}
+        except (TypeError, ValueError) as e:
+            return {"error": encode_error(SearXNGError(f"Bad request: {e}"))}
+        if unresponsive_engines:
+            return {"result": result, "unresponsive_engines": unresponsive_engines}
+        return {"result": result}
+
+    def bind(self) -> None:
+        """Create the socket, replacing a stale one left by a daemon that died."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise SearXNGError("Unix sockets are not supported on this platform")
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            if DaemonClient(self.path, timeout=1).ping() is not None:
+                raise SearXNGError(
+                    f"A searxngr daemon is already running at {self.path}"
+                )
+            os.unlink(self.path)
+        server = socketserver.ThreadingUnixStreamServer(
+            self.path, _DaemonRequestHandler, bind_and_activate=False
+        )
+        try:
+            server.server_bind()
+            # only the current user may connect, set before the socket accepts
+            # any connection
+            os.chmod(self.path, 0o600)
+            server.server_activate()
+        except BaseException:
+            server.server_close()
+            raise
+        server.daemon_threads = True
+        server.searxngr_daemon = self
+        self._server = server
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        if self._server is None:
+            self.bind()
+        try:
+            self._server.serve_forever(poll_interval)
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() running in another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+class DaemonClient:
+    """Forward searches to a running searxngr daemon.
+
+    Exposes the same ``search()``, ``search_pages()``, ``engines()`` and
+    ``categories()`` methods as ``SearXNGClient``. Each call opens its own
+    connection so one client can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        url: Optional[str] = None,
+        timeout: Optional[Union[int, float]] = None,
+        reply_timeout: Optional[Union[int, float]] = None,
+    ) -> None:
+        self.path = path if path else daemon_socket_path()
+        self.url = url
+        # timeout applies to connecting and sending, reply_timeout to waiting
+        # for the answer, which may include the daemon's retries
+        self.timeout = timeout
+        self.reply_timeout = reply_timeout if reply_timeout is not None else timeout
+
+    def _call(self, method: str, **params: Any) -> Any:
+        return self._request(method, params, self.reply_timeout)
+
+    def _request(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        reply_timeout: Optional[Union[int, float]],
+    ) -> Any:
+        request = encode_message({"method": method, "params": params})
+        timeout = self.timeout
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(self.path)
+                sock.sendall(request)
+                timeout = reply_timeout
+                sock.settimeout(timeout)
+                with sock.makefile("rb") as reader:
+                    line = reader.readline()
+        except socket.timeout as te:
+            raise SearXNGTimeoutError(
+                f"Request to searxngr daemon at {self.path} "
+                f"timed out after {timeout} seconds."
+            ) from te
+        except OSError as e:
+            raise SearXNGConnectionError(
+                f"Could not connect to searxngr daemon at {self.path}"
+            ) from e
+        if not line.strip():
+            raise SearXNGConnectionError(
+                f"searxngr daemon at {self.path} closed the connection"
+            )
+        try:
+            response = json.loads(line)
+        except ValueError as e:
+            raise SearXNGJSONError(
+                f"Invalid response from searxngr daemon at {self.path}"
+            ) from e
+        if not isinstance(response, dict) or not (
+            "error" in response or "result" in response
+        ):
+            raise SearXNGJSONError(
+                f"Invalid response from searxngr daemon at {self.path}"
+            )
+        if "error" in response:
+            raise decode_error(response["error"])
+        if response.get("unresponsive_engines"):
+            # only imported when there is something to report, as it loads httpx
+            from .client import report_unresponsive_engines
+
+            report_unresponsive_engines(response["unresponsive_engines"])
+        return response["result"]
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """Return the daemon instance URL and version, or None if it is not running."""
+        try:
+            return self._request("ping", {}, self.timeout)
+        except (SearXNGError, ValueError):
+            return None
+
+    def engines(self) -> List[Dict[str, Any]]:
+        return self._call("engines")
+
+    def categories(self) -> Dict[str, set]:
+        return {
+            category: set(engines)
+            for category, engines in self._call("categories").items()
+        }
+
+    def search(self, query: str, **search_args: Any) -> List[Dict[str, Any]]:
+        return self._call("search", query=query, **search_args)
+
+    def search_pages(
+        self,
+        query: str,
+        pagenos: Iterable[int],
+        max_workers: int = MAX_PARALLEL_PAGES,
+        **search_args: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        return self._call(
+            "search_pages",
+            query=query,
+            pagenos=list(pagenos),
+            max_workers=max_workers,
+            **search_args,
+        )
+
+
+def connect_daemon(
+    url: str,
+    path: Optional[str] = None,
+    timeout: Optional[Union[int, float]] = None,
+    settings: Optional[Dict[str, Any]] = None,
+    reply_timeout: Optional[Union[int, float]] = None,
+) -> Optional[DaemonClient]:
+    """Return a client for a running daemon serving ``url``, otherwise None.
+
+    With ``settings``, the daemon must also have been started with the same
+    client settings.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    client = DaemonClient(path, url, timeout, reply_timeout)
+    info = client.ping()
+    if (
+        info is None
+        or info.get("version") != __version__
+        or str(info.get("url", "")).rstrip("/") != url.rstrip("/")
+    ):
+        return None
+    # compare the settings as they come back from JSON
+    if settings is not None and info.get("settings") != json.loads(
+        json.dumps(settings)
+    ):
+        return None
+    return client
@@ -1,19 +1,267 @@
 import re
-from typing import List, Dict, Any
-
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Tuple
+
+# elements that never have an end tag, so are not pushed on the parse stack
+VOID_ELEMENTS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
 
 
 def extract_engines_from_preferences(html_content: str) -> List[Dict[str, Any]]:
     """
     Extracts engine information from SearXNG preferences HTML.
 
+    Uses a single-pass streaming parser, falling back to a BeautifulSoup
+    tree walk if the page markup is not recognised.
+
     Args:
         html_content (str): HTML content of the preferences page
 
     Returns:
         list: List of dictionaries containing engine information
     """
+    parser = _PreferencesParser()
+    parser.feed(html_content)
+    parser.close()
+    engines = parser.engines
+
+    if not engines:
+        engines = _extract_engines_with_soup(html_content)
+
+    return _unique_sorted_engines(engines)
+
+
+def _unique_sorted_engines(engines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    unique_engines = {}
+    for engine in engines:
+        if engine["name"] not in unique_engines:
+            unique_engines[engine["name"]] = engine
+
+    return sorted(unique_engines.values(), key=lambda x: x["name"].lower())
+
+
+def _parse_bangs(texts: List[str]) -> List[str]:
+    bangs = []
+    for text in texts:
+        bang_text = text.strip()
+        if re.match(r"^![a-zA-Z0-9_]+$", bang_text):
+            bangs.append(bang_text)
+    return bangs
+
+
+def _parse_categories(tooltip_text: str) -> List[str]:
+    categories = []
+    try:
+        categories_match = re.search(
+            r"!bang for its categories(.*?)(?=!bang|$)", tooltip_text, re.DOTALL
+        )
+        if categories_match:
+            categories_section = categories_match.group(1)
+            category_matches = re.findall(r"(![a-zA-Z0-9_]+)", categories_section)
+            categories = list(set(category_matches))
+    except re.error:
+        pass
+    return categories
+
+
+class _EngineRow:
+    """Fields collected while streaming through a single table row."""
+
+    def __init__(self, parent_id: int, depth: int, classes: List[str]) -> None:
+        self.parent_id = parent_id
+        self.depth = depth
+        self.is_pref_group = "pref-group" in classes
+        self.first_th_colspan: Optional[str] = None
+        self.seen_th = False
+        self.has_name_th = False
+        self.in_name_th = False
+        self.seen_label = False
+        self.label: Optional[List[str]] = None
+        self.seen_tooltip = False
+        self.tooltip: List[str] = []
+        self.in_tooltip = False
+        self.url: Optional[str] = None
+        self.seen_shortcut = False
+        self.in_shortcut = False
+        self.bangs: List[List[str]] = []
+        self.last_td: Optional[Dict[str, Any]] = None
+
+    def engine_info(self) -> Optional[Dict[str, Any]]:
+        engine_name = "".join(self.label).strip() if self.label else ""
+        if not engine_name:
+            return None
+
+        reliability = None
+        errors = None
+        if self.last_td is not None:
+            span = self.last_td["span"]
+            reliability = "".join(span).strip() if span is not None else None
+            paragraphs = self.last_td["paragraphs"]
+            if len(paragraphs) > 1:
+                errors = "".join(paragraphs[1]).strip()
+
+        return {
+            "name": engine_name,
+            "url": self.url if self.url is not None else "",
+            "bangs": _parse_bangs(["".join(text) for text in self.bangs]),
+            "categories": _parse_categories("".join(self.tooltip)),
+            "reliability": reliability,
+            "errors": errors,
+        }
+
+
+class _PreferencesParser(HTMLParser):
+    """Streaming parser for the engines tables of the preferences page.
+
+    Rows are handled as they close, so the document is read once and no
+    tree is built. Matches the BeautifulSoup extraction: engine rows are the
+    ``tr`` siblings following a ``tr.pref-group`` header whose first ``th``
+    spans two columns.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.engines: List[Dict[str, Any]] = []
+        # open elements as (tag, element id) pairs
+        self._stack: List[Tuple[str, int]] = []
+        self._next_id = 0
+        # ids of elements whose later tr children are engine rows
+        self._active_parents = set()
+        self._row: Optional[_EngineRow] = None
+        # text buffers collecting until the element at the given depth closes
+        self._collectors: List[Tuple[int, List[str]]] = []
+        self._closers: List[Tuple[int, str]] = []
+
+    def _collect(self, buffer: List[str]) -> List[str]:
+        self._collectors.append((len(self._stack), buffer))
+        return buffer
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag in VOID_ELEMENTS:
+            return
+        parent_id = self._stack[-1][1] if self._stack else -1
+        self._next_id += 1
+        self._stack.append((tag, self._next_id))
+        depth = len(self._stack)
+        row = self._row
+
+        attributes = dict(attrs)
+        classes = (attributes.get("class") or "").split()
+
+        if tag == "tr" and row is None:
+            self._row = _EngineRow(parent_id, depth, classes)
+            return
+        if row is None:
+            return
+
+        if tag == "th":
+            if not row.seen_th:
+                row.seen_th = True
+                row.first_th_colspan = attributes.get("colspan")
+            if "name" in classes and not row.has_name_th:
+                row.has_name_th = True
+                row.in_name_th = True
+                self._closers.append((depth, "name_th"))
+        elif tag == "label" and row.in_name_th and not row.seen_label:
+            row.seen_label = True
+            row.label = self._collect([])
+        elif tag == "div" and "engine-tooltip" in classes:
+            if not row.seen_tooltip:
+                row.seen_tooltip = True
+                row.in_tooltip = True
+                self._collect(row.tooltip)
+                self._closers.append((depth, "tooltip"))
+            td = row.last_td
+            if td is not None and not td["seen_tooltip"]:
+                td["seen_tooltip"] = True
+                td["in_tooltip"] = True
+                self._closers.append((depth, "td_tooltip"))
+        elif tag == "a" and row.in_tooltip and row.url is None:
+            row.url = attributes.get("href") or ""
+        elif tag == "td":
+            row.last_td = {
+                "span": None,
+                "seen_tooltip": False,
+                "in_tooltip": False,
+                "paragraphs": [],
+            }
+            if "shortcut" in classes and not row.seen_shortcut:
+                row.seen_shortcut = True
+                row.in_shortcut = True
+                self._closers.append((depth, "shortcut"))
+        elif tag == "span":
+            if row.in_shortcut and "bang" in classes:
+                row.bangs.append(self._collect([]))
+            td = row.last_td
+            if td is not None and td["span"] is None:
+                td["span"] = self._collect([])
+        elif tag == "p":
+            td = row.last_td
+            if td is not None and td["in_tooltip"]:
+                td["paragraphs"].append(self._collect([]))
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self._stack) > index:
+            self._close_element()
+
+    def _close_element(self) -> None:
+        depth = len(self._stack)
+        tag, element_id = self._stack.pop()
+
+        while self._collectors and self._collectors[-1][0] >= depth:
+            self._collectors.pop()
+        row = self._row
+        while self._closers and self._closers[-1][0] >= depth:
+            closer = self._closers.pop()[1]
+            if closer == "name_th":
+                row.in_name_th = False
+            elif closer == "tooltip":
+                row.in_tooltip = False
+            elif closer == "td_tooltip":
+                if row.last_td is not None:
+                    row.last_td["in_tooltip"] = False
+            elif closer == "shortcut":
+                row.in_shortcut = False
+
+        if row is not None and depth == row.depth:
+            self._row = None
+            if row.has_name_th and row.parent_id in self._active_parents:
+                engine_entry = row.engine_info()
+                if engine_entry:
+                    self.engines.append(engine_entry)
+            if row.is_pref_group and row.first_th_colspan == "2":
+                self._active_parents.add(row.parent_id)
+        else:
+            self._active_parents.discard(element_id)
+
+    def handle_data(self, data: str) -> None:
+        for _, buffer in self._collectors:
+            buffer.append(data)
+
+
+def _extract_engines_with_soup(html_content: str) -> List[Dict[str, Any]]:
+    """Extract engines by walking a BeautifulSoup tree of the page."""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, "html.parser")
     engines = []
 
@@ -29,17 +277,10 @@ def extract_engines_from_preferences(html_content: str) -> List[Dict[str, Any]]:
                     if engine_entry:
                         engines.append(engine_entry)
 
-    unique_engines = {}
-    for engine in engines:
-        if engine["name"] not in unique_engines:
-            unique_engines[engine["name"]] = engine
-
-    sorted_engines = sorted(unique_engines.values(), key=lambda x: x["name"].lower())
+    return engines
 
-    return sorted_engines
 
-
-def _extract_engine_info(engine_row: BeautifulSoup) -> Dict[str, Any]:
+def _extract_engine_info(engine_row) -> Dict[str, Any]:
     """Extract engine information from a single engine row."""
     name_element = engine_row.find("th", class_="name")
     if not name_element:
@@ -68,7 +309,7 @@ def _extract_engine_info(engine_row: BeautifulSoup) -> Dict[str, Any]:
     }
 
 
-def _extract_engine_url(engine_row: BeautifulSoup) -> str:
+def _extract_engine_url(engine_row) -> str:
     """Extract engine URL from tooltip."""
     tooltip = engine_row.find("div", class_="engine-tooltip")
     if not tooltip:
@@ -78,45 +319,29 @@ def _extract_engine_url(engine_row: BeautifulSoup) -> str:
     return link.get("href", "") if link else ""
 
 
-def _extract_bangs(engine_row: BeautifulSoup) -> List[str]:
+def _extract_bangs(engine_row) -> List[str]:
     """Extract bang commands from shortcut column."""
-    bangs = []
     shortcut_cell = engine_row.find("td", class_="shortcut")
     if not shortcut_cell:
-        return bangs
+        return []
 
     bang_spans = shortcut_cell.find_all("span", class_="bang")
-    for span in bang_spans:
-        bang_text = span.text.strip()
-        if re.match(r"^![a-zA-Z0-9_]+$", bang_text):
-            bangs.append(bang_text)
-
-    return bangs
+    return _parse_bangs([span.text for span in bang_spans])
 
 
-def _extract_categories(engine_row: BeautifulSoup) -> List[str]:
+def _extract_categories(engine_row) -> List[str]:
     """Extract category bangs from tooltip."""
-    categories = []
     tooltip = engine_row.find("div", class_="engine-tooltip")
     if not tooltip:
-        return categories
+        return []
 
     try:
-        tooltip_text = tooltip.get_text()
-        categories_match = re.search(
-            r"!bang for its categories(.*?)(?=!bang|$)", tooltip_text, re.DOTALL
-        )
-        if categories_match:
-            categories_section = categories_match.group(1)
-            category_matches = re.findall(r"(![a-zA-Z0-9_]+)", categories_section)
-            categories = list(set(category_matches))
-    except (AttributeError, re.error):
-        pass
-
-    return categories
+        return _parse_categories(tooltip.get_text())
+    except AttributeError:
+        return []
 
 
-def _extract_reliability_and_errors(engine_row: BeautifulSoup) -> tuple:
+def _extract_reliability_and_errors(engine_row) -> tuple:
     """Extract reliability score and error messages."""
     reliability = None
     errors = None
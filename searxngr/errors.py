@@ -0,0 +1,40 @@
+from typing import Optional
+
+
+class SearXNGError(Exception):
+    """Base exception for SearXNG client errors"""
+
+    pass
+
+
+class SearXNGConnectionError(SearXNGError):
+    """Connection error to SearXNG instance"""
+
+    pass
+
+
+class SearXNGTimeoutError(SearXNGError):
+    """Timeout error when connecting to SearXNG instance"""
+
+    pass
+
+
+class SearXNGHTTPError(SearXNGError):
+    """HTTP error response from SearXNG instance"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        # seconds the server asked clients to wait, from a Retry-After header
+        self.retry_after = retry_after
+
+
+class SearXNGJSONError(SearXNGError):
+    """JSON decode error from SearXNG response"""
+
+    pass
@@ -1,131 +1,124 @@
-import os
-import textwrap
-from typing import List, Dict, Any
-from urllib.parse import urlparse
-from dateutil.parser import parse
-from babel.dates import format_date
-from html2text import html2text
+from typing import List, Optional
+from rich.console import Group, RenderableType
+from rich.text import Text
 
-from .constants import MAX_CONTENT_WORDS, DEBUG, console
+from .constants import console
+from .render import RenderContext, render_cache
+from .results import SearchResult
 
 
-def print_results(
-    results: List[Dict[str, Any]],
-    count: int,
-    start_at: int = 0,
-    expand: bool = False,
-    max_content_words: int = MAX_CONTENT_WORDS,
+def print_rich_range(
+    results: List[SearchResult],
+    first: int,
+    last: int,
+    context: RenderContext,
+    blank_line: bool = False,
 ) -> None:
-    console.print()
-    for i, result in enumerate(
-        results[start_at:(start_at + count)], start=start_at + 1
-    ):
-        title = result.get("title", "No title")
-        title = textwrap.shorten(title, width=70, placeholder="...")
+    """Print ``results[first:last]`` with a single write to the console.
 
-        url = result.get("url", "")
-        domain = ""
-        if url:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
+    The lines of every result are collected in one ``Group`` instead of being
+    printed one at a time, so Rich lays out the whole range in one pass and
+    the terminal gets one write, however many lines there are.
+    """
+    lines: List[RenderableType] = [Text()] if blank_line else []
+    lines.extend(_render_range(results, first, last, context))
+    console.print(Group(*lines))
 
-        engine = result.get("engine", None)
-        template = result.get("template", None)
-        category = result.get("category", None)
 
-        content = result.get("content", "")
-        content_text = html2text(content).strip() if content else ""
-        content_words = content_text.split(" ") if content_text else []
-        content = None
-        if max_content_words == 0:
-            # Disable truncation
-            content = " ".join(content_words)
-        elif len(content_words) > max_content_words:
-            content = " ".join(content_words[:max_content_words]) + " ..."
-        else:
-            content = " ".join(content_words)
-        # Get terminal width for wrapping, use fallback if not available
-        try:
-            terminal_width = os.get_terminal_size().columns
-            wrap_width = terminal_width - 5
-        except OSError:
-            # Fallback to a reasonable default if terminal size can't be determined
-            wrap_width = 80
-        content = textwrap.wrap(content, width=wrap_width)
+def _render_range(
+    results: List[SearchResult],
+    first: int,
+    last: int,
+    context: RenderContext,
+) -> List[RenderableType]:
+    lines: List[RenderableType] = []
+    expand = context.expand
+    highlight = context.highlight
 
-        published_date = None
-        if result.get("publishedDate"):
-            try:
-                date_str = result["publishedDate"].strip()
-                if date_str:
-                    parsed_date = parse(date_str)
-                    published_date = format_date(parsed_date)
-            except Exception as e:
-                if DEBUG:
-                    console.print(f"[dim]Error parsing date: {e}[/dim]")
+    def add(*objects: str, highlight: Optional[bool] = None) -> None:
+        lines.append(console.render_str(" ".join(objects), highlight=highlight))
 
-        console.print(
+    for i, result in enumerate(results[first:last], start=first + 1):
+        rendered = render_cache.get(results, result)
+        title = rendered.title
+        domain = rendered.domain
+        url = result.url or ""
+
+        engine = result.engine
+        template = result.template
+        category = result.category
+
+        content = rendered.content_lines(context.max_content_words, context.wrap_width)
+        published_date = rendered.published_date
+
+        add(
             f" [cyan]{i:>2}.[/cyan] [bold green]{title}[/bold green] [yellow]\\[{domain}][/yellow]",
+            highlight=highlight,
         )
         if expand:
-            console.print(f"     [link={url}]{url}[/link]")
+            add(f"     [link={url}]{url}[/link]", highlight=highlight)
         if content:
             for line in content:
-                console.print(f"     {line}", highlight=False)
+                add(f"     {line}", highlight=False)
 
         if category == "news" and published_date:
-            console.print(
-                f"     [cyan dim]{published_date}[/cyan dim]", highlight=False
-            )
+            add(f"     [cyan dim]{published_date}[/cyan dim]", highlight=False)
         if category == "images":
-            source = result.get("source")
-            resolution = result.get("resolution")
-            img_src = result.get("img_src")
+            source = result.source
+            resolution = result.resolution
+            img_src = result.img_src
             if source or resolution:
-                console.print(
-                    f"     [cyan dim]{resolution if resolution else ''}[/cyan dim] {source if source else ''}"
+                add(
+                    f"     [cyan dim]{resolution if resolution else ''}[/cyan dim] {source if source else ''}",
+                    highlight=highlight,
                 )
-            console.print(f"     [link={img_src}]{img_src}[/link]", highlight=False)
+            add(f"     [link={img_src}]{img_src}[/link]", highlight=False)
         if category == "videos":
-            author = result.get("author")
-            length = result.get("length")
+            author = result.author
+            length = result.length
             if isinstance(length, float):
                 length = f"{int(length // 60):02}:{int(length % 60):02}"
             if author or length:
-                console.print(
-                    f"     [cyan dim]{length if length else ''}[/cyan dim] {author if author else ''}"
+                add(
+                    f"     [cyan dim]{length if length else ''}[/cyan dim] {author if author else ''}",
+                    highlight=highlight,
                 )
-        if category == "music" and result.get("publishedDate"):
-            author = result.get("author")
-            length = result.get("length")
+        if category == "music" and result.published_date:
+            author = result.author
+            length = result.length
             if isinstance(length, float):
                 length = f"{int(length // 60):02}:{int(length % 60):02}"
             if author or length:
-                console.print(
-                    f"     [cyan dim]{length if length else ''}[/cyan dim] {author if author else ''}"
+                add(
+                    f"     [cyan dim]{length if length else ''}[/cyan dim] {author if author else ''}",
+                    highlight=highlight,
                 )
         if category == "map":
-            address = result.get("address")
+            address = result.address
             if address:
                 house_number = address.get("house_number")
                 road = address.get("road")
                 locality = address.get("locality")
                 postcode = address.get("postcode")
                 country = address.get("country")
-                console.print(
+                add(
                     f"     {house_number + ' ' if house_number else ''}{road if road else ''}\n",
                     f"    {locality if locality else ''}, {postcode if postcode else ''}\n",
                     f"    {country if country else ''}",
+                    highlight=highlight,
                 )
-            longitude = result.get("longitude")
-            latitude = result.get("latitude")
-            console.print(f"     [cyan dim]{latitude}, {longitude}[/cyan dim]")
+            longitude = result.longitude
+            latitude = result.latitude
+            add(
+                f"     [cyan dim]{latitude}, {longitude}[/cyan dim]",
+                highlight=highlight,
+            )
         if category == "it":
             pass
         if category == "science":
-            journal = result.get("journal")
-            publisher = result.get("publisher")
-            console.print(
+            journal = result.journal
+            publisher = result.publisher
+            add(
                 f"     [cyan dim][bold]{published_date + ' ' if published_date else ''}[/bold]"
                 + f"{journal + ' ' if journal else ''}"
                 + f"{publisher + ' ' if publisher else ''}[/cyan dim]",
@@ -133,25 +126,28 @@ def print_results(
             )
         if category == "files":
             if template == "torrent.html":
-                magnet_link = result.get("magnetlink")
-                seed = result.get("seed")
-                leech = result.get("leech")
-                filesize = result.get("filesize")
-                console.print(f"     [dim]{magnet_link}[/dim]", highlight=False)
-                console.print(
-                    f"     [cyan dim]{filesize}[/cyan dim] ↑{seed} seeders, ↓{leech} leechers"
+                magnet_link = result.magnetlink
+                seed = result.seed
+                leech = result.leech
+                filesize = result.filesize
+                add(f"     [dim]{magnet_link}[/dim]", highlight=False)
+                add(
+                    f"     [cyan dim]{filesize}[/cyan dim] ↑{seed} seeders, ↓{leech} leechers",
+                    highlight=highlight,
                 )
             elif template == "files.html":
-                metadata = result.get("metadata")
-                size = result.get("size")
-                console.print(f"     [cyan dim]{size} {metadata}[/cyan dim]")
+                metadata = result.metadata
+                size = result.size
+                add(f"     [cyan dim]{size} {metadata}[/cyan dim]", highlight=highlight)
         if category == "social media":
             if published_date:
-                console.print(f"     [cyan dim]{published_date}[/cyan dim]")
+                add(f"     [cyan dim]{published_date}[/cyan dim]", highlight=highlight)
 
-        engines = result.get("engines", [])
-        engines.remove(engine) if engine in engines else None
-        console.print(
-            f"     [dim]\\[[bold]{engine}[/bold]{(', ' + ', '.join(engines)) if len(engines) > 0 else ''}][/dim]"
+        # the other engines, without removing the engine from the result
+        engines = [name for name in result.engines if name != engine]
+        add(
+            f"     [dim]\\[[bold]{engine}[/bold]{(', ' + ', '.join(engines)) if len(engines) > 0 else ''}][/dim]",
+            highlight=highlight,
         )
-        console.print()
+        lines.append(Text())
+    return lines
@@ -0,0 +1,144 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .cache import cache_dir
+from .constants import (
+    HEALTH_ALPHA,
+    HEALTH_FILE,
+    HEALTH_RETRY_AFTER,
+    HEALTH_SAMPLES,
+    HEALTH_MIN_SAMPLES,
+)
+
+
+class InstanceHealth:
+    """Rolling latency and error statistics for each SearXNG instance.
+
+    Each instance keeps an exponentially weighted moving average (EWMA) of
+    its response time and error rate, and its most recent response times
+    for latency percentiles. The statistics are persisted as compact JSON
+    keyed by instance URL so they carry over between runs. With
+    ``persist=False`` they are only kept in memory.
+
+    An instance is unhealthy while its error rate is at least one half,
+    until ``retry_after`` seconds after its last failure, when it is given
+    another chance.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        alpha: float = HEALTH_ALPHA,
+        retry_after: float = HEALTH_RETRY_AFTER,
+        persist: bool = True,
+    ) -> None:
+        self.path = path if path else os.path.join(cache_dir(), HEALTH_FILE)
+        self.alpha = alpha
+        self.retry_after = retry_after
+        self.persist = persist
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if not self.persist:
+                return self._entries
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    self._entries = entries
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _entry(self, url: str) -> Dict[str, Any]:
+        return self._load().setdefault(
+            url.rstrip("/"),
+            {"latency": None, "errors": 0.0, "samples": [], "failed": 0.0},
+        )
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the statistics of an instance, or None if it has none yet."""
+        with self._lock:
+            return self._load().get(url.rstrip("/"))
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Record a successful request that took ``latency`` seconds."""
+        with self._lock:
+            entry = self._entry(url)
+            previous = entry["latency"]
+            entry["latency"] = (
+                latency
+                if previous is None
+                else self.alpha * latency + (1 - self.alpha) * previous
+            )
+            entry["errors"] = (1 - self.alpha) * entry["errors"]
+            samples = entry["samples"]
+            samples.append(round(latency, 4))
+            del samples[:-HEALTH_SAMPLES]
+            self._save()
+
+    def record_failure(self, url: str) -> None:
+        """Record a failed request."""
+        with self._lock:
+            entry = self._entry(url)
+            entry["errors"] = self.alpha + (1 - self.alpha) * entry["errors"]
+            entry["failed"] = time.time()
+            self._save()
+
+    def is_healthy(self, url: str) -> bool:
+        entry = self.get(url)
+        if entry is None or entry["errors"] < 0.5:
+            return True
+        return time.time() - entry["failed"] >= self.retry_after
+
+    def latency_percentile(self, url: str, percentile: float) -> Optional[float]:
+        """Return a percentile of the recent response times of an instance.
+
+        Returns None until enough requests have been recorded for the
+        percentile to be meaningful.
+        """
+        entry = self.get(url)
+        if entry is None or len(entry["samples"]) < HEALTH_MIN_SAMPLES:
+            return None
+        samples = sorted(entry["samples"])
+        rank = math.ceil(percentile / 100 * len(samples))
+        return samples[min(max(rank, 1), len(samples)) - 1]
+
+    def rank(self, urls: List[str]) -> List[str]:
+        """Order instances fastest healthy first, then the unhealthy ones.
+
+        The average latency is scaled up by the error rate, so an instance
+        that fails now and then ranks behind an equally fast reliable one.
+        Instances with no statistics yet count as the fastest so they are
+        tried, and ties keep the given order.
+        """
+
+        def key(url: str) -> tuple:
+            entry = self.get(url)
+            if entry is None:
+                return (False, 0.0)
+            healthy = self.is_healthy(url)
+            if entry["latency"] is None:
+                return (not healthy, math.inf if entry["errors"] else 0.0)
+            return (not healthy, entry["latency"] / max(1 - entry["errors"], 0.01))
+
+        return sorted(urls, key=key)
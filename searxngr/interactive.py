@@ -2,9 +2,8 @@ import json
 import shlex
 import subprocess
 import textwrap
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from rich.prompt import Prompt
-import pyperclip
 from html2text import html2text
 
 from .constants import (
@@ -14,8 +13,9 @@ from .constants import (
     console,
     DEBUG,
 )
-from .formatter import print_results
+from .render import print_results, redraw_if_resized
 from .client import SearXNGClient
+from .prefetch import PagePrefetcher
 
 
 def run_interactive_loop(
@@ -25,8 +25,11 @@ def run_interactive_loop(
     start_at: int,
     pageno: int,
     searxng: SearXNGClient,
+    prefetcher: Optional[PagePrefetcher] = None,
 ):
     while True:
+        # lay the results out again if the terminal was resized since
+        redraw_if_resized()
         try:
             new_query = Prompt.ask(
                 "[bold]searxngr[/bold] [dim](? for help)[/dim] ", console=console
@@ -124,6 +127,8 @@ def run_interactive_loop(
                 result = results[int(index) - 1]
                 url = result.get("url")
                 if url:
+                    import pyperclip
+
                     pyperclip.copy(url)
                 else:
                     console.print(
@@ -151,6 +156,8 @@ def run_interactive_loop(
                     content = html2text(content_raw).strip() if content_raw else ""
 
                 if content:
+                    import pyperclip
+
                     pyperclip.copy(content)
                 else:
                     console.print("No content found for the selected result.")
@@ -180,6 +187,7 @@ def run_interactive_loop(
                 start_at=start_at,
                 expand=args.expand,
                 max_content_words=args.max_content_words,
+                plain=args.nocolor,
             )
             continue
         elif new_query.strip() == "f":
@@ -190,6 +198,7 @@ def run_interactive_loop(
                 start_at=start_at,
                 expand=args.expand,
                 max_content_words=args.max_content_words,
+                plain=args.nocolor,
             )
             continue
         elif new_query.strip() == "t" or new_query.strip().startswith("t "):
@@ -213,6 +222,8 @@ def run_interactive_loop(
                     )
                 else:
                     args.time_range = time_range
+                if prefetcher:
+                    prefetcher.cancel()
                 new_query = query
                 start_at = 0
                 pageno = 1
@@ -231,6 +242,8 @@ def run_interactive_loop(
                 console.print(
                     f"[green]Safe search filter set to:[/green] {safe_search_filter}"
                 )
+                if prefetcher:
+                    prefetcher.cancel()
                 new_query = query
                 start_at = 0
                 pageno = 1
@@ -289,6 +302,8 @@ def run_interactive_loop(
                             current_engines.append(engine)
 
                     args.engines = current_engines
+                    if prefetcher:
+                        prefetcher.cancel()
                     console.print(
                         f"[green]Engines updated:[/green] {', '.join(current_engines)}"
                     )
@@ -304,6 +319,8 @@ def run_interactive_loop(
 
                     if valid_engines:
                         args.engines = valid_engines
+                        if prefetcher:
+                            prefetcher.cancel()
                         console.print(
                             f"[green]Engines set to:[/green] {', '.join(valid_engines)}"
                         )
@@ -324,6 +341,8 @@ def run_interactive_loop(
         elif new_query.strip().startswith("site:"):
             site = new_query[5:].strip()
             args.site = site
+            if prefetcher:
+                prefetcher.cancel()
             new_query = query
             start_at = 0
             pageno = 1
@@ -332,7 +351,12 @@ def run_interactive_loop(
         elif new_query.strip() == "x":
             args.expand = not args.expand
             print_results(
-                results, count=args.num, start_at=start_at, expand=args.expand
+                results,
+                count=args.num,
+                start_at=start_at,
+                expand=args.expand,
+                max_content_words=args.max_content_words,
+                plain=args.nocolor,
             )
             continue
         elif new_query.strip() == "s":
@@ -420,11 +444,15 @@ def run_interactive_loop(
                 continue
             if index.isdigit() and int(index) in range(1, len(results) + 1):
                 index = int(index) - 1
-                console.print(json.dumps(results[index], indent=2, ensure_ascii=False))
+                console.print(
+                    json.dumps(results[index].to_dict(), indent=2, ensure_ascii=False)
+                )
             else:
                 console.print("[red]Error:[/red] Invalid index specified.")
             continue
         elif new_query.strip() != "":
+            if prefetcher:
+                prefetcher.cancel()
             query = new_query.strip()
             start_at = 0
             pageno = 1
@@ -0,0 +1,297 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from .constants import HEDGE_PERCENTILE, MAX_PARALLEL_PAGES, console
+from .errors import SearXNGError
+
+if TYPE_CHECKING:
+    from .client import SearXNGClient
+    from .health import InstanceHealth
+
+
+def normalize_result_url(url: str) -> str:
+    """Return the key results from different instances are matched on.
+
+    Like SearXNG's own merging, the scheme, a leading ``www.``, a trailing
+    slash, percent-encoding in the path and the fragment are ignored.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = unquote(parts.path).rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def result_score(result: Dict[str, Any], rank: int) -> float:
+    """Return the SearXNG score of a result, or one derived from its positions."""
+    score = result.get("score")
+    if isinstance(score, (int, float)):
+        return float(score)
+    positions = result.get("positions")
+    if positions:
+        return sum(1.0 / position for position in positions if position > 0)
+    return 1.0 / (rank + 1)
+
+
+def merge_results(pages: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge the same page from several instances, ranked by combined score.
+
+    Results with the same normalized URL are merged into one, with the
+    engines and positions of each copy and the sum of their scores, so
+    results found by more instances rank higher. Ties keep instance order.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    ranked: List[Dict[str, Any]] = []
+    for page in pages:
+        for rank, result in enumerate(page):
+            score = result_score(result, rank)
+            url = result.get("url")
+            key = normalize_result_url(url) if url else None
+            existing = merged.get(key) if key else None
+            if existing is None:
+                # copy so cached results are not changed by merging
+                existing = dict(result)
+                existing["engines"] = list(result.get("engines") or [])
+                existing["positions"] = list(result.get("positions") or [])
+                existing["score"] = score
+                if key:
+                    merged[key] = existing
+                ranked.append(existing)
+                continue
+            for engine in result.get("engines") or []:
+                if engine not in existing["engines"]:
+                    existing["engines"].append(engine)
+            existing["positions"].extend(result.get("positions") or [])
+            existing["score"] += score
+    # sort is stable, so equal scores keep instance and rank order
+    ranked.sort(key=lambda result: -result["score"])
+    return ranked
+
+
+class MultiSearXNGClient:
+    """Send each search to several SearXNG instances and merge the results.
+
+    Offers the same ``search()``, ``search_pages()``, ``engines()`` and
+    ``categories()`` methods as ``SearXNGClient``. A search returns once
+    ``quorum`` instances have answered (0 waits for all of them), or once
+    ``deadline`` seconds have passed and at least one instance has answered.
+    Instances that fail are reported and left out; the search only fails if
+    every instance does. Slower instances finish in daemon threads so they
+    never delay exiting the program.
+    """
+
+    def __init__(
+        self,
+        clients: List["SearXNGClient"],
+        quorum: int = 0,
+        deadline: Optional[float] = None,
+    ) -> None:
+        if not clients:
+            raise ValueError("MultiSearXNGClient needs at least one client")
+        self.clients = clients
+        self.url = clients[0].url
+        self.quorum = quorum if 0 < quorum <= len(clients) else len(clients)
+        self.deadline = deadline if deadline else None
+
+    def _submit(
+        self, client: "SearXNGClient", query: str, **search_args: Any
+    ) -> Future:
+        future: Future = Future()
+        # build_search_request rewrites the categories list in place
+        categories = search_args.pop("categories", None)
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(
+                    self._search_instance(
+                        client,
+                        query,
+                        categories=list(categories) if categories else categories,
+                        **search_args,
+                    )
+                )
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="searxngr-fanout", daemon=True).start()
+        return future
+
+    def _search_instance(
+        self, client: "SearXNGClient", query: str, **search_args: Any
+    ) -> List[Dict[str, Any]]:
+        return client.search(query, **search_args)
+
+    def _report_errors(self, errors: Dict[int, SearXNGError]) -> None:
+        for index in sorted(errors):
+            console.print(
+                f"Instance: {self.clients[index].url} [red]{errors[index]}[/red]"
+            )
+
+    def search(self, query: str, **search_args: Any) -> List[Dict[str, Any]]:
+        futures = {
+            self._submit(client, query, **search_args): index
+            for index, client in enumerate(self.clients)
+        }
+        deadline_at = (
+            time.monotonic() + self.deadline if self.deadline is not None else None
+        )
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        errors: Dict[int, SearXNGError] = {}
+        pending = set(futures)
+        while pending and len(pages) < self.quorum:
+            # past the deadline, return as soon as any instance has answered
+            timeout = None
+            if deadline_at is not None and pages:
+                timeout = max(0.0, deadline_at - time.monotonic())
+            done, pending = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                index = futures[future]
+                try:
+                    pages[index] = future.result()
+                except SearXNGError as e:
+                    errors[index] = e
+
+        if not pages:
+            raise errors[min(errors)]
+        self._report_errors(errors)
+        return merge_results([pages[index] for index in sorted(pages)])
+
+    def search_pages(
+        self,
+        query: str,
+        pagenos: Iterable[int],
+        max_workers: int = MAX_PARALLEL_PAGES,
+        **search_args: Any,
+    ) -> List[List[Dict[str, Any]]]:
+        """Fetch several result pages concurrently, returned in page order."""
+        pagenos = list(pagenos)
+        if not pagenos:
+            return []
+
+        def fetch(pageno: int) -> List[Dict[str, Any]]:
+            return self.search(query, pageno=pageno, **search_args)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pagenos))) as pool:
+            return list(pool.map(fetch, pagenos))
+
+    def engines(self) -> List[Dict[str, Any]]:
+        """Return the engine list of the first instance that answers."""
+        error: Optional[SearXNGError] = None
+        for client in self.clients:
+            try:
+                return client.engines()
+            except SearXNGError as e:
+                error = e
+        raise error
+
+    def categories(self) -> Dict[str, set]:
+        from .client import group_engines_by_category
+
+        return group_engines_by_category(self.engines())
+
+
+class FailoverSearXNGClient(MultiSearXNGClient):
+    """Send each search to the fastest healthy instance, failing over on errors.
+
+    Instances are ranked by their ``InstanceHealth`` statistics before each
+    request. When an instance fails the next one is tried, and the search
+    only fails if every instance does. With ``hedge_percentile`` set, the
+    next instance is also queried once the current one has taken longer
+    than that percentile of its recent response times, and the first
+    answer is used.
+    """
+
+    def __init__(
+        self,
+        clients: List["SearXNGClient"],
+        health: "InstanceHealth",
+        hedge_percentile: float = HEDGE_PERCENTILE,
+    ) -> None:
+        super().__init__(clients)
+        self.health = health
+        self.hedge_percentile = hedge_percentile
+        # the clients time the requests they send, so results from their
+        # result cache are not taken for fast responses
+        for client in clients:
+            client.on_response_time = partial(health.record_success, client.url)
+
+    def _ranked(self) -> List[int]:
+        ranked = self.health.rank([client.url for client in self.clients])
+        indexes = {client.url: index for index, client in enumerate(self.clients)}
+        return [indexes[url] for url in ranked]
+
+    def _search_instance(
+        self, client: "SearXNGClient", query: str, **search_args: Any
+    ) -> List[Dict[str, Any]]:
+        try:
+            return client.search(query, **search_args)
+        except SearXNGError:
+            self.health.record_failure(client.url)
+            raise
+
+    def _hedge_delay(self, index: int) -> Optional[float]:
+        if not self.hedge_percentile:
+            return None
+        return self.health.latency_percentile(
+            self.clients[index].url, self.hedge_percentile
+        )
+
+    def search(self, query: str, **search_args: Any) -> List[Dict[str, Any]]:
+        ranked = self._ranked()
+        futures: Dict[Future, int] = {}
+        errors: Dict[int, SearXNGError] = {}
+        tried = 0
+        started = 0.0
+
+        def start_next() -> None:
+            nonlocal tried, started
+            index = ranked[tried]
+            futures[self._submit(self.clients[index], query, **search_args)] = index
+            tried += 1
+            started = time.monotonic()
+
+        start_next()
+        while futures:
+            # hedge with the next instance if the last one is slower than usual,
+            # counting from when it was started rather than from this pass
+            timeout = None
+            if tried < len(ranked):
+                delay = self._hedge_delay(ranked[tried - 1])
+                if delay is not None:
+                    timeout = max(0.0, started + delay - time.monotonic())
+            done, _ = wait(futures, timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                start_next()
+                continue
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    results = future.result()
+                except SearXNGError as e:
+                    errors[index] = e
+                    continue
+                self._report_errors(errors)
+                return results
+            if not futures and tried < len(ranked):
+                start_next()
+
+        raise errors[ranked[0]]
+
+    def engines(self) -> List[Dict[str, Any]]:
+        """Return the engine list of the fastest healthy instance that answers."""
+        error: Optional[SearXNGError] = None
+        for index in self._ranked():
+            try:
+                return self.clients[index].engines()
+            except SearXNGError as e:
+                error = e
+        raise error
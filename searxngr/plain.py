@@ -0,0 +1,115 @@
+import sys
+from typing import List, Optional, TextIO
+
+from .render import RenderContext, render_cache
+from .results import SearchResult
+
+
+def _length(length) -> Optional[str]:
+    if isinstance(length, float):
+        return f"{int(length // 60):02}:{int(length % 60):02}"
+    return length
+
+
+def plain_lines(
+    results: List[SearchResult],
+    first: int,
+    last: int,
+    context: RenderContext,
+) -> List[str]:
+    """Return the lines of ``results[first:last]`` as plain text.
+
+    The layout is the same as the Rich output without colour, but the lines
+    are built as plain strings, with no markup to parse, and are not wrapped
+    again to the terminal width, so each result line can be matched with
+    grep. Only the content is wrapped, to ``context.wrap_width``.
+    """
+    lines: List[str] = []
+    add = lines.append
+    for i, result in enumerate(results[first:last], start=first + 1):
+        rendered = render_cache.get(results, result)
+        url = result.url or ""
+        engine = result.engine
+        template = result.template
+        category = result.category
+        published_date = rendered.published_date
+
+        add(f" {i:>2}. {rendered.title} [{rendered.domain}]")
+        if context.expand:
+            add(f"     {url}")
+        for line in rendered.content_lines(
+            context.max_content_words, context.wrap_width
+        ):
+            add(f"     {line}")
+
+        if category == "news" and published_date:
+            add(f"     {published_date}")
+        if category == "images":
+            source = result.source
+            resolution = result.resolution
+            if source or resolution:
+                add(
+                    f"     {resolution if resolution else ''} {source if source else ''}"
+                )
+            add(f"     {result.img_src}")
+        if category == "videos" or (category == "music" and result.published_date):
+            author = result.author
+            length = _length(result.length)
+            if author or length:
+                add(f"     {length if length else ''} {author if author else ''}")
+        if category == "map":
+            address = result.address
+            if address:
+                house_number = address.get("house_number")
+                road = address.get("road")
+                locality = address.get("locality")
+                postcode = address.get("postcode")
+                country = address.get("country")
+                add(
+                    f"     {house_number + ' ' if house_number else ''}{road if road else ''}"
+                )
+                add(
+                    f"     {locality if locality else ''}, {postcode if postcode else ''}"
+                )
+                add(f"     {country if country else ''}")
+            add(f"     {result.latitude}, {result.longitude}")
+        if category == "science":
+            journal = result.journal
+            publisher = result.publisher
+            add(
+                f"     {published_date + ' ' if published_date else ''}"
+                + f"{journal + ' ' if journal else ''}"
+                + f"{publisher + ' ' if publisher else ''}"
+            )
+        if category == "files":
+            if template == "torrent.html":
+                add(f"     {result.magnetlink}")
+                add(
+                    f"     {result.filesize} ↑{result.seed} seeders, ↓{result.leech} leechers"
+                )
+            elif template == "files.html":
+                add(f"     {result.size} {result.metadata}")
+        if category == "social media" and published_date:
+            add(f"     {published_date}")
+
+        engines = [name for name in result.engines if name != engine]
+        add(f"     [{engine}{(', ' + ', '.join(engines)) if engines else ''}]")
+        add("")
+    return lines
+
+
+def write_plain_range(
+    results: List[SearchResult],
+    first: int,
+    last: int,
+    context: RenderContext,
+    blank_line: bool = False,
+    out: Optional[TextIO] = None,
+) -> None:
+    """Write ``results[first:last]`` as plain text with a single write."""
+    out = out if out is not None else sys.stdout
+    lines = plain_lines(results, first, last, context)
+    if blank_line:
+        lines.insert(0, "")
+    out.write("\n".join(lines) + "\n")
+    out.flush()
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from .client import SearXNGClient, SearXNGError, normalize_search_params
+from .constants import PREFETCH_MAX_PAGES
+
+
+class PagePrefetcher:
+    """Fetch result pages in the background before they are requested.
+
+    At most ``max_pages`` pages are held at once; requesting another evicts
+    the oldest. Pages are keyed on the full search parameters so a page
+    fetched for a different query or filter is never handed out.
+    """
+
+    def __init__(
+        self, searxng: SearXNGClient, max_pages: int = PREFETCH_MAX_PAGES
+    ) -> None:
+        self.searxng = searxng
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[Any, ...], Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prefetch(self, query: str, pageno: int, **search_args: Any) -> None:
+        """Start fetching a page in a background thread."""
+        key = normalize_search_params(query, pageno=pageno, **search_args)
+        future: Future = Future()
+        with self._lock:
+            if key in self._pages:
+                return
+            while len(self._pages) >= self.max_pages:
+                self._pages.popitem(last=False)[1].cancel()
+            self._pages[key] = future
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(
+                    self.searxng.search(query, pageno=pageno, **search_args)
+                )
+            except BaseException as e:
+                future.set_exception(e)
+
+        # daemon thread so a slow prefetch never delays exiting the program
+        threading.Thread(target=run, name="searxngr-prefetch", daemon=True).start()
+
+    def take(self, query: str, pageno: int, **search_args: Any) -> Optional[List]:
+        """Return a prefetched page, waiting for it if still in flight.
+
+        Returns None if the page was not prefetched or the prefetch failed,
+        in which case the caller should run the search itself.
+        """
+        key = normalize_search_params(query, pageno=pageno, **search_args)
+        with self._lock:
+            future = self._pages.pop(key, None)
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result()
+        except SearXNGError:
+            return None
+
+    def cancel(self) -> None:
+        """Discard all prefetched pages, e.g. when the query or filters change."""
+        with self._lock:
+            pages: Dict[Tuple[Any, ...], Future] = dict(self._pages)
+            self._pages.clear()
+        for future in pages.values():
+            future.cancel()
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from .cache import cache_dir
+
+
+def shared_rate_limit_available() -> bool:
+    return fcntl is not None
+
+
+class TokenBucket:
+    """Token bucket limiting requests to ``rate`` per second on average.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens
+    a second. Each request takes a token, and when the bucket is empty it
+    reserves the next one and waits for it, so concurrent callers are let
+    through in the order they asked, evenly spaced.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = rate
+        self.burst = max(1, burst if burst else int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float, elapsed: float) -> Tuple[float, float]:
+        """Take a token from a bucket last holding ``tokens`` ``elapsed`` seconds
+        ago, returning the tokens left (negative once reserved) and the wait."""
+        tokens = min(float(self.burst), tokens + max(elapsed, 0.0) * self.rate) - 1
+        return tokens, (-tokens / self.rate if tokens < 0 else 0.0)
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(self._tokens, now - self._updated)
+            self._updated = now
+            return wait
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Wait until a request may be sent, without blocking the event loop."""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket shared by every searxngr process on the host.
+
+    The bucket is kept in a small file per instance under the cache
+    directory and updated under an exclusive ``flock``, so concurrent
+    processes draw on one budget. Only available where ``fcntl`` is.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate: float,
+        burst: Optional[int] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        super().__init__(rate, burst)
+        if path is None:
+            name = hashlib.sha256(url.rstrip("/").encode("utf-8")).hexdigest()[:16]
+            path = os.path.join(cache_dir(), "ratelimit", f"{name}.json")
+        self.path = path
+
+    def reserve(self) -> float:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                    tokens, updated = float(state["tokens"]), float(state["updated"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated = float(self.burst), 0.0
+                # wall clock time, monotonic clocks are not comparable between
+                # processes
+                now = time.time()
+                tokens, wait = self._take(tokens, now - updated)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": now}))
+                f.flush()
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,293 @@
+import os
+import sys
+import textwrap
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .constants import MAX_CONTENT_WORDS, DEBUG, console
+from .results import SearchResult
+
+# Rich and html2text are imported on the code paths that use them, so results
+# written as plain text to a pipe never load Rich
+
+
+class _RenderedResult:
+    """Display values derived from one result, independent of the terminal."""
+
+    __slots__ = ("title", "domain", "content_words", "published_date", "wrapped")
+
+    def __init__(self, result: SearchResult) -> None:
+        self.title = textwrap.shorten(
+            result.title or "No title", width=70, placeholder="..."
+        )
+
+        url = result.url
+        self.domain = urlparse(url).netloc if url else ""
+
+        content = result.content
+        content_text = ""
+        if content:
+            from html2text import html2text
+
+            content_text = html2text(content).strip()
+        self.content_words = content_text.split(" ") if content_text else []
+
+        self.published_date = None
+        if result.published_date:
+            from dateutil.parser import parse
+            from babel.dates import format_date
+
+            try:
+                date_str = result.published_date.strip()
+                if date_str:
+                    parsed_date = parse(date_str)
+                    self.published_date = format_date(parsed_date)
+            except Exception as e:
+                if DEBUG:
+                    console.print(f"[dim]Error parsing date: {e}[/dim]")
+
+        # wrapped content lines, keyed on (max_content_words, wrap_width) so
+        # redraws at a width used before are not wrapped again
+        self.wrapped: Dict[Tuple[int, int], List[str]] = {}
+
+    def content_lines(self, max_content_words: int, wrap_width: int) -> List[str]:
+        key = (max_content_words, wrap_width)
+        lines = self.wrapped.get(key)
+        if lines is None:
+            content_words = self.content_words
+            if max_content_words == 0:
+                # Disable truncation
+                content = " ".join(content_words)
+            elif len(content_words) > max_content_words:
+                content = " ".join(content_words[:max_content_words]) + " ..."
+            else:
+                content = " ".join(content_words)
+            lines = self.wrapped[key] = textwrap.wrap(content, width=wrap_width)
+        return lines
+
+
+class RenderCache:
+    """Cache of ``_RenderedResult`` values reused when results are redrawn.
+
+    html2text, date parsing and URL parsing run once per result instead of on
+    every redraw. Entries are kept for one results list at a time, so a new
+    search starts with an empty cache.
+
+    The cache also remembers the range of results printed last and the
+    ``RenderContext`` it was printed with, for ``redraw_if_resized()``.
+    """
+
+    def __init__(self) -> None:
+        self._results: Optional[List[SearchResult]] = None
+        self._entries: Dict[int, Tuple[SearchResult, _RenderedResult]] = {}
+        self.last_pass: Optional[Tuple[int, int, "RenderContext"]] = None
+
+    def _use(self, results: List[SearchResult]) -> None:
+        if results is not self._results:
+            self._results = results
+            self._entries = {}
+            self.last_pass = None
+
+    def get(self, results: List[SearchResult], result: SearchResult) -> _RenderedResult:
+        self._use(results)
+        entry = self._entries.get(id(result))
+        if entry is None or entry[0] is not result:
+            entry = (result, _RenderedResult(result))
+            self._entries[id(result)] = entry
+        return entry[1]
+
+    def record_pass(
+        self,
+        results: List[SearchResult],
+        first: int,
+        last: int,
+        context: "RenderContext",
+    ) -> None:
+        """Remember that ``results[first:last]`` are on screen."""
+        self._use(results)
+        self.last_pass = (first, last, context)
+
+    @property
+    def results(self) -> Optional[List[SearchResult]]:
+        return self._results
+
+    def clear(self) -> None:
+        self._results = None
+        self._entries = {}
+        self.last_pass = None
+
+
+render_cache = RenderCache()
+
+
+def _wrap_width() -> int:
+    # Get terminal width for wrapping, use fallback if not available
+    try:
+        terminal_width = os.get_terminal_size().columns
+        return terminal_width - 5
+    except OSError:
+        # Fallback to a reasonable default if terminal size can't be determined
+        return 80
+
+
+class RenderContext:
+    """Terminal settings and display options captured once per render pass.
+
+    The wrap width is read from the terminal once, so every result of a
+    pass is laid out the same even if the terminal is resized part way
+    through, and the colour system decides whether Rich's highlighter is
+    worth running. With ``plain`` the results are written as plain text by
+    ``searxngr.plain`` instead of through Rich.
+    """
+
+    __slots__ = (
+        "wrap_width",
+        "color_system",
+        "expand",
+        "max_content_words",
+        "plain",
+    )
+
+    def __init__(
+        self,
+        wrap_width: int,
+        color_system: Optional[str],
+        expand: bool = False,
+        max_content_words: int = MAX_CONTENT_WORDS,
+        plain: bool = False,
+    ) -> None:
+        self.wrap_width = wrap_width
+        self.color_system = color_system
+        self.expand = expand
+        self.max_content_words = max_content_words
+        self.plain = plain
+
+    @classmethod
+    def capture(
+        cls,
+        expand: bool = False,
+        max_content_words: int = MAX_CONTENT_WORDS,
+        plain: bool = False,
+    ) -> "RenderContext":
+        # output that does not go to a terminal, such as a pipe, is always
+        # plain; this is decided before the console, and Rich, is loaded
+        plain = plain or not sys.stdout.isatty()
+        color_system = None if plain else console.color_system
+        return cls(_wrap_width(), color_system, expand, max_content_words, plain)
+
+    @property
+    def highlight(self) -> Optional[bool]:
+        # highlighting only adds styles, which are dropped without colour
+        return None if self.color_system else False
+
+    def with_wrap_width(self, wrap_width: int) -> "RenderContext":
+        return RenderContext(
+            wrap_width,
+            self.color_system,
+            self.expand,
+            self.max_content_words,
+            self.plain,
+        )
+
+
+def print_results(
+    results: List[SearchResult],
+    count: int,
+    start_at: int = 0,
+    expand: bool = False,
+    max_content_words: int = MAX_CONTENT_WORDS,
+    plain: bool = False,
+) -> None:
+    context = RenderContext.capture(expand, max_content_words, plain)
+    _write_range(results, start_at, start_at + count, context, blank_line=True)
+    render_cache.record_pass(
+        results, start_at, min(len(results), start_at + count), context
+    )
+
+
+def redraw_if_resized() -> bool:
+    """Print the last results again if the terminal width has changed.
+
+    The content is wrapped again from the cached text of each result, so
+    nothing is parsed twice. Returns whether the results were redrawn.
+
+    This is called between interactive commands rather than from a
+    SIGWINCH handler, as prompt_toolkit replaces the handler while the
+    prompt is shown and resets it when the prompt returns.
+    """
+    results = render_cache.results
+    if results is None or render_cache.last_pass is None:
+        return False
+    first, last, context = render_cache.last_pass
+    wrap_width = _wrap_width()
+    if last <= first or wrap_width == context.wrap_width:
+        return False
+    context = context.with_wrap_width(wrap_width)
+    _write_range(results, first, last, context, blank_line=True)
+    render_cache.record_pass(results, first, last, context)
+    return True
+
+
+class ResultPrinter:
+    """Print a page of results as they arrive, while later pages load.
+
+    Each ``update()`` prints the results added to ``results`` since the
+    last call, up to ``start_at + count``. Results are numbered by their
+    position in the whole list, so the numbering matches ``print_results()``
+    however the pages arrive. The ``RenderContext`` is captured when the
+    printer is created, so the whole page is printed at one width.
+    """
+
+    def __init__(
+        self,
+        results: List[SearchResult],
+        count: int,
+        start_at: int = 0,
+        expand: bool = False,
+        max_content_words: int = MAX_CONTENT_WORDS,
+        plain: bool = False,
+    ) -> None:
+        self.results = results
+        self.start_at = start_at
+        self.end = start_at + count
+        self.printed = start_at
+        self.context = RenderContext.capture(expand, max_content_words, plain)
+
+    @property
+    def started(self) -> bool:
+        """Whether any result has been printed."""
+        return self.printed > self.start_at
+
+    def update(self) -> int:
+        """Print the results that arrived since the last call, return how many."""
+        last = min(len(self.results), self.end)
+        if last <= self.printed:
+            return 0
+        _write_range(
+            self.results,
+            self.printed,
+            last,
+            self.context,
+            blank_line=not self.started,
+        )
+        printed, self.printed = last - self.printed, last
+        render_cache.record_pass(self.results, self.start_at, last, self.context)
+        return printed
+
+
+def _write_range(
+    results: List[SearchResult],
+    first: int,
+    last: int,
+    context: RenderContext,
+    blank_line: bool = False,
+) -> None:
+    """Write ``results[first:last]`` as plain text or through Rich."""
+    if context.plain:
+        from .plain import write_plain_range
+
+        write_plain_range(results, first, last, context, blank_line)
+    else:
+        from .formatter import print_rich_range
+
+        print_rich_range(results, first, last, context, blank_line)
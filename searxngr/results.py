@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# JSON keys that differ from the attribute they are stored in
+FIELD_ALIASES = {"publishedDate": "published_date"}
+FIELD_KEYS = {name: key for key, name in FIELD_ALIASES.items()}
+
+
+class SearchResult:
+    """A search result keeping only the fields searxngr displays.
+
+    Results are built from the SearXNG JSON with ``from_dict()``; results in
+    categories with extra fields use a subclass adding their own slots. The
+    full JSON is kept as a compact string only when ``keep_raw`` is set, for
+    the interactive ``j`` command and ``--json``. ``get()`` mirrors
+    ``dict.get`` with the SearXNG key names for code that still expects a
+    dict.
+    """
+
+    __slots__ = (
+        "url",
+        "title",
+        "content",
+        "engine",
+        "engines",
+        "category",
+        "template",
+        "published_date",
+        "_raw",
+    )
+    # extra fields of a category subclass, and every public field name
+    fields: Tuple[str, ...] = ()
+    field_names: Tuple[str, ...] = __slots__[:-1]
+
+    def __init__(self, data: Dict[str, Any], keep_raw: bool = False) -> None:
+        self.url: Optional[str] = data.get("url")
+        self.title: Optional[str] = data.get("title")
+        self.content: Optional[str] = data.get("content")
+        self.engine: Optional[str] = data.get("engine")
+        self.engines: List[str] = data.get("engines") or []
+        self.category: Optional[str] = data.get("category")
+        self.template: Optional[str] = data.get("template")
+        self.published_date: Optional[str] = data.get("publishedDate")
+        self._raw: Optional[str] = (
+            json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+            if keep_raw
+            else None
+        )
+        for field in self.fields:
+            setattr(self, field, data.get(field))
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.fields = cls.__dict__.get("__slots__", ())
+        cls.field_names = SearchResult.field_names + cls.fields
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], keep_raw: bool = False) -> "SearchResult":
+        result_type = RESULT_TYPES.get(data.get("category") or "", cls)
+        return result_type(data, keep_raw)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by its SearXNG key name, or default if it is not set."""
+        name = FIELD_ALIASES.get(key, key)
+        if name not in self.field_names:
+            return default
+        value = getattr(self, name)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the SearXNG JSON, or the kept fields when it was not kept."""
+        if self._raw is not None:
+            return json.loads(self._raw)
+        data = {}
+        for name in self.field_names:
+            value = getattr(self, name)
+            if value is not None:
+                data[FIELD_KEYS.get(name, name)] = value
+        return data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(title={self.title!r}, url={self.url!r})"
+
+
+class ImageResult(SearchResult):
+    __slots__ = ("img_src", "source", "resolution")
+
+
+class MediaResult(SearchResult):
+    __slots__ = ("author", "length")
+
+
+class MapResult(SearchResult):
+    __slots__ = ("address", "latitude", "longitude")
+
+
+class ScienceResult(SearchResult):
+    __slots__ = ("journal", "publisher")
+
+
+class FileResult(SearchResult):
+    __slots__ = ("magnetlink", "seed", "leech", "filesize", "metadata", "size")
+
+
+RESULT_TYPES: Dict[str, Type[SearchResult]] = {
+    "images": ImageResult,
+    "videos": MediaResult,
+    "music": MediaResult,
+    "map": MapResult,
+    "science": ScienceResult,
+    "files": FileResult,
+}
+
+
+def to_search_results(
+    page: List[Dict[str, Any]], keep_raw: bool = False
+) -> List[SearchResult]:
+    return [SearchResult.from_dict(data, keep_raw) for data in page]
@@ -0,0 +1,131 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .constants import RETRIES, RETRY_BACKOFF, RETRY_DEADLINE, RETRY_MAX_BACKOFF
+from .errors import (
+    SearXNGConnectionError,
+    SearXNGError,
+    SearXNGHTTPError,
+    SearXNGTimeoutError,
+)
+
+T = TypeVar("T")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the seconds to wait from a Retry-After header, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_reason(error: SearXNGError) -> Optional[str]:
+    """Return why a failed request may be retried, or None if it should not be.
+
+    Timeouts, connection errors, 429 Too Many Requests and 5xx responses are
+    usually transient; other errors fail the same way every time.
+    """
+    if isinstance(error, SearXNGTimeoutError):
+        return "timeout"
+    if isinstance(error, SearXNGConnectionError):
+        return "connection"
+    if isinstance(error, SearXNGHTTPError) and error.status_code:
+        if error.status_code == 429 or error.status_code >= 500:
+            return str(error.status_code)
+    return None
+
+
+class RetryPolicy:
+    """Retry transient request failures with exponential backoff and full jitter.
+
+    A request is retried up to ``retries`` times. Before retry ``n`` the
+    policy waits a random time between 0 and ``backoff * 2 ** n`` seconds,
+    capped at ``max_backoff``, or the time the server asked for in a
+    ``Retry-After`` header. No retry is started that would end after
+    ``deadline`` seconds from the first attempt. With no deadline (0) a
+    request is not retried when the server asks for a wait longer than
+    ``max_backoff``.
+
+    ``counts`` holds the number of retries taken by reason ("timeout",
+    "connection" or the HTTP status), shared by every request using the
+    policy.
+    """
+
+    def __init__(
+        self,
+        retries: int = RETRIES,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+        deadline: float = RETRY_DEADLINE,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Return the number of retries taken."""
+        with self._lock:
+            return sum(self.counts.values())
+
+    def delay(self, attempt: int, error: SearXNGError, start: float) -> float:
+        """Return how long to wait before retrying a failed request.
+
+        ``attempt`` counts the retries already made and ``start`` is the
+        ``time.monotonic()`` of the first attempt. Raises ``error`` again
+        when it should not be retried.
+        """
+        reason = retry_reason(error)
+        if reason is None or attempt >= self.retries:
+            raise error
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            if not self.deadline and retry_after > self.max_backoff:
+                raise error
+            delay = retry_after
+        else:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if self.deadline and time.monotonic() - start + delay > self.deadline:
+            raise error
+        with self._lock:
+            self.counts[reason] += 1
+        return delay
+
+    def call(self, request: Callable[[], T]) -> T:
+        """Call ``request``, retrying it when it fails with a transient error."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except SearXNGError as e:
+                time.sleep(self.delay(attempt, e, start))
+                attempt += 1
+
+    async def acall(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Await ``request()``, retrying it when it fails with a transient error."""
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await request()
+            except SearXNGError as e:
+                await asyncio.sleep(self.delay(attempt, e, start))
+                attempt += 1
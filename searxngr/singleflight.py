@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one call between threads asking for the same key at the same time.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait for it and get its result, or its exception, instead of
+    making their own. Once the call completes the key is forgotten, so
+    later callers start a new one.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """asyncio variant of SingleFlight for coroutines on one event loop.
+
+    The shared call runs as its own task, so a caller being cancelled does
+    not cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+
+            def forget(done: asyncio.Future) -> None:
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
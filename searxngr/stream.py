@@ -0,0 +1,202 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# characters that can continue a number json.JSONDecoder stopped before, as in
+# "12." or "1e" cut off at the end of a chunk
+_NUMBER_CONTINUATION = frozenset(".eE+-")
+
+
+def _number_may_continue(value: Any, buffer: str, end: int) -> bool:
+    """Return whether a number decoded up to end may continue in the next chunk."""
+    if type(value) not in (int, float):
+        return False
+    return end == len(buffer) or buffer[end] in _NUMBER_CONTINUATION
+
+
+# parser states
+_START, _KEY, _VALUE, _RESULTS, _END = range(5)
+
+
+class SearchResponseDecoder:
+    """Decode a SearXNG JSON search response incrementally as it is received.
+
+    Pass the response body to ``feed()`` in chunks as they arrive; each call
+    returns the results decoded so far, so the first results are available
+    before the whole response has been read. Only the ``results`` array and
+    ``unresponsive_engines`` are kept, other top level values (infoboxes,
+    suggestions, answers) are decoded one at a time and dropped.
+
+    Malformed or truncated JSON raises ``json.JSONDecodeError``, the same
+    error ``json.loads`` raises for the whole body.
+    """
+
+    def __init__(self) -> None:
+        self.unresponsive_engines: List[Any] = []
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key: Optional[str] = None
+        # number of results decoded, and whether a comma was read after the last
+        self._count = 0
+        self._expect_result = False
+        # the same for the members of the top level object
+        self._members = 0
+        self._expect_member = False
+        # after running out of data mid value, wait for the buffered part to
+        # double before decoding it again so large values parse in linear time
+        self._wait = 0
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Add the next part of the body and return the newly decoded results."""
+        self._buffer += self._text.decode(chunk)
+        if len(self._buffer) - self._pos < self._wait:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish decoding and return the remaining results."""
+        self._buffer += self._text.decode(b"", final=True)
+        results = self._parse(final=True)
+        if self._state != _END:
+            raise json.JSONDecodeError(
+                "Unexpected end of search response", self._buffer, len(self._buffer)
+            )
+        return results
+
+    def _skip_whitespace(self) -> Optional[str]:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode(self, pos: int, final: bool) -> Optional[tuple]:
+        """Decode the value at pos, or return None if more data is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # a number at the end of the buffer may continue in the next chunk
+        if not final and _number_may_continue(value, self._buffer, end):
+            return None
+        return value, end
+
+    def _decode_results(self, results: List[Dict[str, Any]], final: bool) -> bool:
+        """Decode the results array, returning True once its end is reached."""
+        # the hot loop of the decoder, kept to local variables
+        buffer = self._buffer
+        size = len(buffer)
+        skip = _WHITESPACE.match
+        raw_decode = self._decoder.raw_decode
+        pos = self._pos
+        try:
+            while True:
+                pos = skip(buffer, pos).end()
+                if pos == size:
+                    return False
+                if not self._expect_result:
+                    char = buffer[pos]
+                    if char == "]":
+                        pos += 1
+                        return True
+                    if self._count:
+                        if char != ",":
+                            raise json.JSONDecodeError(
+                                "Expecting ',' delimiter", buffer, pos
+                            )
+                        pos += 1
+                        self._expect_result = True
+                        continue
+                try:
+                    result, end = raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    return False
+                if not final and _number_may_continue(result, buffer, end):
+                    return False
+                results.append(result)
+                self._count += 1
+                self._expect_result = False
+                pos = end
+        finally:
+            self._pos = pos
+
+    def _parse(self, final: bool) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        while True:
+            char = self._skip_whitespace()
+            if char is None:
+                break
+            if self._state == _START:
+                if char != "{":
+                    raise json.JSONDecodeError("Expecting '{'", self._buffer, self._pos)
+                self._pos += 1
+                self._state = _KEY
+            elif self._state == _KEY:
+                if not self._expect_member:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = _END
+                        continue
+                    if self._members:
+                        if char != ",":
+                            raise json.JSONDecodeError(
+                                "Expecting ',' delimiter", self._buffer, self._pos
+                            )
+                        self._pos += 1
+                        self._expect_member = True
+                        continue
+                if char != '"':
+                    raise json.JSONDecodeError(
+                        "Expecting property name enclosed in double quotes",
+                        self._buffer,
+                        self._pos,
+                    )
+                decoded = self._decode(self._pos, final)
+                if decoded is None:
+                    break
+                key, end = decoded
+                end = _WHITESPACE.match(self._buffer, end).end()
+                if end == len(self._buffer):
+                    break
+                if self._buffer[end] != ":" or not isinstance(key, str):
+                    raise json.JSONDecodeError(
+                        "Expecting ':' delimiter", self._buffer, end
+                    )
+                self._key = key
+                self._pos = end + 1
+                self._state = _VALUE
+                self._members += 1
+                self._expect_member = False
+            elif self._state == _VALUE:
+                if self._key == "results" and char == "[":
+                    self._pos += 1
+                    self._state = _RESULTS
+                    continue
+                decoded = self._decode(self._pos, final)
+                if decoded is None:
+                    break
+                value, self._pos = decoded
+                if self._key == "results" and isinstance(value, list):
+                    results.extend(value)
+                elif self._key == "unresponsive_engines" and value:
+                    self.unresponsive_engines = value
+                self._state = _KEY
+            elif self._state == _RESULTS:
+                if self._decode_results(results, final):
+                    self._state = _KEY
+                else:
+                    break
+            else:
+                raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+        # drop the consumed text and remember how much is left undecoded
+        consumed, self._pos = self._pos, 0
+        self._buffer = self._buffer[consumed:]
+        self._wait = 2 * len(self._buffer) if self._buffer else 0
+        return results
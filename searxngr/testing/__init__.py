@@ -0,0 +1,3 @@
+from .mock_server import MockSearXNGServer, FIXTURES_DIR
+
+__all__ = ["MockSearXNGServer", "FIXTURES_DIR"]
@@ -0,0 +1,303 @@
+"""Local stand-in for a SearXNG instance, for offline load and latency testing.
+
+Serves ``/search?format=json`` and ``/preferences`` from fixture files, with
+configurable latency, jitter, error rate, unresponsive engines and
+pagination. Runs in a background thread:
+
+    with MockSearXNGServer(latency=0.2, jitter=0.05) as server:
+        client = SearXNGClient(url=server.url)
+
+or from the command line:
+
+    python -m searxngr.testing.mock_server --port 8888 --latency 0.2
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+CATEGORY_FIXTURES = {
+    "general": "search_general.json",
+    "news": "search_news.json",
+    "images": "search_images.json",
+    "videos": "search_videos.json",
+    "music": "search_music.json",
+    "map": "search_map.json",
+    "science": "search_science.json",
+    "files": "search_files.json",
+    "social media": "search_social_media.json",
+}
+
+
+class MockSearXNGServer:
+    """Serve SearXNG API responses from fixtures on a local port.
+
+    Each page holds ``page_size`` results taken in turn from the category's
+    fixture, with the URL made unique per page, up to ``max_pages`` pages.
+    ``error_rate`` is the fraction of requests answered with
+    ``error_status``, and the first ``fail_first`` requests always fail.
+    Error responses carry a ``Retry-After`` header when ``retry_after`` is
+    set. ``latency`` and ``jitter`` are in seconds.
+    Connections are kept alive, ``connect_latency`` delays each new
+    connection to stand in for TCP and TLS setup, and ``connections``
+    counts the connections accepted.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        fixtures_dir: str = FIXTURES_DIR,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        unresponsive_engines: Optional[List[Tuple[str, str]]] = None,
+        page_size: int = 10,
+        max_pages: int = 10,
+        seed: Optional[int] = None,
+        connect_latency: float = 0.0,
+        fail_first: int = 0,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.unresponsive_engines = unresponsive_engines
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.connect_latency = connect_latency
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._fixtures: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockSearXNGServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="searxngr-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockSearXNGServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _fixture(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._fixtures:
+                with open(os.path.join(self.fixtures_dir, name), "rb") as f:
+                    data = f.read()
+                self._fixtures[name] = (
+                    json.loads(data) if name.endswith(".json") else data
+                )
+            return self._fixtures[name]
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency + jitter)
+
+    def _fail(self) -> bool:
+        with self._lock:
+            if len(self.requests) <= self.fail_first:
+                return True
+            return self._random.random() < self.error_rate
+
+    def search_response(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Build the JSON response for a search request."""
+        categories = params.get("categories", "general").replace("+", " ")
+        category = categories.split(",")[0]
+        fixture = self._fixture(
+            CATEGORY_FIXTURES.get(category, CATEGORY_FIXTURES["general"])
+        )
+        pageno = max(int(params.get("pageno", "1") or "1"), 1)
+
+        results = []
+        pool = fixture["results"]
+        if pool and pageno <= self.max_pages:
+            first = (pageno - 1) * self.page_size
+            for index in range(first, first + self.page_size):
+                result = copy.deepcopy(pool[index % len(pool)])
+                result["url"] = f"{result['url']}?page={pageno}&index={index}"
+                results.append(result)
+
+        response = dict(fixture, results=results)
+        response["query"] = params.get("q", "")
+        if self.unresponsive_engines is not None:
+            response["unresponsive_engines"] = [
+                list(item) for item in self.unresponsive_engines
+            ]
+        return response
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # headers and body are written separately, without this
+                # delayed ACKs stall every response on a reused connection
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server._lock:
+                    server.connections += 1
+                time.sleep(server.connect_latency)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                self._handle(url.path, parse_qs(url.query))
+
+            def do_POST(self) -> None:
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8")
+                self._handle(url.path, parse_qs(body))
+
+            def _handle(self, path: str, query: Dict[str, List[str]]) -> None:
+                params = {key: values[0] for key, values in query.items()}
+                with server._lock:
+                    server.requests.append(
+                        {
+                            "method": self.command,
+                            "path": path,
+                            "params": params,
+                            "headers": dict(self.headers),
+                        }
+                    )
+                time.sleep(server._delay())
+
+                if path not in ("/search", "/preferences"):
+                    self._send(404, b"Not Found", "text/plain")
+                elif server._fail():
+                    headers = {}
+                    if server.retry_after is not None:
+                        headers["Retry-After"] = server.retry_after
+                    self._send(
+                        server.error_status, b"Mock error", "text/plain", headers
+                    )
+                elif path == "/search":
+                    if params.get("format") != "json":
+                        self._send(403, b"Forbidden", "text/plain")
+                        return
+                    body = json.dumps(server.search_response(params)).encode("utf-8")
+                    self._send(200, body, "application/json")
+                else:
+                    body = server._fixture("preferences.html")
+                    etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, b"", None, {"ETag": etag})
+                    else:
+                        self._send(
+                            200, body, "text/html; charset=utf-8", {"ETag": etag}
+                        )
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                content_type: Optional[str],
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a mock SearXNG instance")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, metavar="SECONDS")
+    parser.add_argument("--jitter", type=float, default=0.0, metavar="SECONDS")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="RATE")
+    parser.add_argument("--error-status", type=int, default=500, metavar="STATUS")
+    parser.add_argument(
+        "--unresponsive-engine",
+        nargs=2,
+        action="append",
+        metavar=("ENGINE", "ERROR"),
+        help="report an unresponsive engine in every search response",
+    )
+    parser.add_argument("--page-size", type=int, default=10, metavar="N")
+    parser.add_argument("--max-pages", type=int, default=10, metavar="N")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--connect-latency", type=float, default=0.0, metavar="SECONDS")
+    parser.add_argument("--fail-first", type=int, default=0, metavar="N")
+    parser.add_argument("--retry-after", default=None, metavar="SECONDS")
+    args = parser.parse_args()
+
+    server = MockSearXNGServer(
+        host=args.host,
+        port=args.port,
+        fixtures_dir=args.fixtures_dir,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        unresponsive_engines=args.unresponsive_engine,
+        page_size=args.page_size,
+        max_pages=args.max_pages,
+        seed=args.seed,
+        connect_latency=args.connect_latency,
+        fail_first=args.fail_first,
+        retry_after=args.retry_after,
+    )
+    print(f"Mock SearXNG instance listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import io
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from searxngr.batch import read_queries, run_batch
+from searxngr.cli import main
+from searxngr.client import SearXNGConnectionError
+from searxngr.testing import MockSearXNGServer
+
+
+class TestBatch:
+    """Test batch query mode"""
+
+    def test_read_queries(self):
+        """Test blank lines and comments are skipped"""
+        source = io.StringIO("first query\n\n  # comment\n second query \n")
+
+        assert list(read_queries(source)) == ["first query", "second query"]
+
+    def test_run_batch_streams_results(self):
+        """Test each query is written as a JSON line as it completes"""
+        out = io.StringIO()
+
+        def search(query):
+            if query == "slow":
+                time.sleep(0.1)
+            return [{"title": query}]
+
+        failures = run_batch(["slow", "fast"], search, concurrency=2, out=out)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert failures == 0
+        assert [line["query"] for line in lines] == ["fast", "slow"]
+        assert lines[0]["results"] == [{"title": "fast"}]
+
+    def test_run_batch_bounded_concurrency(self):
+        """Test no more than concurrency queries run at the same time"""
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def search(query):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return []
+
+        run_batch((str(i) for i in range(20)), search, concurrency=3, out=io.StringIO())
+
+        assert max_running == 3
+
+    def test_run_batch_reports_errors(self):
+        """Test failed queries are written as errors and counted"""
+        out = io.StringIO()
+
+        def search(query):
+            raise SearXNGConnectionError("Could not connect")
+
+        failures = run_batch(["query"], search, concurrency=1, out=out)
+
+        assert failures == 1
+        assert json.loads(out.getvalue()) == {
+            "query": "query",
+            "error": "Could not connect",
+        }
+
+    def test_batch_main(self, tmp_path, monkeypatch, capsys):
+        """Test --batch runs every query against one client"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        queries = tmp_path / "queries.txt"
+        queries.write_text("first query\nsecond query\nthird query\n")
+
+        with MockSearXNGServer() as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache", "-n", "5"]
+            argv += ["--url-handler", "true", "--batch", str(queries)]
+            with patch("sys.argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        output = capsys.readouterr().out
+        lines = [json.loads(line) for line in output.splitlines()]
+        assert sorted(line["query"] for line in lines) == [
+            "first query",
+            "second query",
+            "third query",
+        ]
+        assert all(len(line["results"]) == 10 for line in lines)
@@ -0,0 +1,154 @@
+import os
+from unittest.mock import patch
+
+from searxngr.cache import EngineCache, ResultCache
+from searxngr.client import normalize_search_params
+
+
+class TestResultCache:
+    """Test on-disk search result cache"""
+
+    def make_cache(self, tmp_path, **kwargs):
+        return ResultCache(path=os.path.join(tmp_path, "results.sqlite3"), **kwargs)
+
+    def test_set_and_get(self, tmp_path):
+        """Test cached results are returned for the same key"""
+        cache = self.make_cache(tmp_path)
+        key = ResultCache.make_key(
+            "https://example.com", normalize_search_params("query")
+        )
+
+        assert cache.get(key) is None
+        cache.set(key, [{"title": "Test Result"}])
+
+        assert cache.get(key) == [{"title": "Test Result"}]
+
+    def test_key_covers_request_params(self):
+        """Test the key changes with every search parameter"""
+        base = dict(
+            pageno=1,
+            safe_search="strict",
+            categories=["general"],
+            language="en",
+            time_range="week",
+            site="example.com",
+            http_method="GET",
+        )
+        key = ResultCache.make_key(
+            "https://example.com", normalize_search_params("query", **base)
+        )
+
+        for name, value in [
+            ("pageno", 2),
+            ("safe_search", "none"),
+            ("categories", ["news"]),
+            ("language", "de"),
+            ("time_range", "day"),
+            ("site", "example.org"),
+            ("http_method", "POST"),
+        ]:
+            params = normalize_search_params("query", **dict(base, **{name: value}))
+            assert ResultCache.make_key("https://example.com", params) != key
+        assert (
+            ResultCache.make_key(
+                "https://example.org", normalize_search_params("query", **base)
+            )
+            != key
+        )
+
+    def test_key_normalizes_equivalent_requests(self):
+        """Test requests SearXNG treats the same share a key"""
+        assert normalize_search_params("query", pageno=0) == normalize_search_params(
+            " query ", pageno=1
+        )
+        assert normalize_search_params(
+            "query", engines=["google", "brave"]
+        ) == normalize_search_params("query", engines=["brave", "google"])
+        assert normalize_search_params(
+            "query", categories=["news"], engines=["google"]
+        ) == normalize_search_params("query", categories=["news"])
+
+    def test_expired_entries_are_ignored(self, tmp_path):
+        """Test entries older than the TTL are treated as missing"""
+        cache = self.make_cache(tmp_path, ttl=60)
+        with patch("searxngr.cache.time.time", return_value=1000.0):
+            cache.set("key", [{"title": "Old Result"}])
+        with patch("searxngr.cache.time.time", return_value=1061.0):
+            assert cache.get("key") is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used entries are evicted beyond max_size"""
+        result = [{"content": "x" * 100}]
+        cache = self.make_cache(tmp_path, max_size=300)
+        with patch("searxngr.cache.time.time", return_value=1000.0):
+            cache.set("first", result)
+        with patch("searxngr.cache.time.time", return_value=1001.0):
+            cache.set("second", result)
+        with patch("searxngr.cache.time.time", return_value=1002.0):
+            cache.get("first")
+        with patch("searxngr.cache.time.time", return_value=1003.0):
+            cache.set("third", result)
+
+        with patch("searxngr.cache.time.time", return_value=1004.0):
+            assert cache.get("first") == result
+            assert cache.get("second") is None
+            assert cache.get("third") == result
+
+    def test_unwritable_cache_is_a_miss(self, tmp_path):
+        """Test database errors degrade to cache misses"""
+        blocker = os.path.join(tmp_path, "file")
+        open(blocker, "w").close()
+        cache = ResultCache(path=os.path.join(blocker, "results.sqlite3"))
+
+        cache.set("key", [{"title": "Test Result"}])
+        assert cache.get("key") is None
+
+
+class TestEngineCache:
+    """Test engine catalogue cache"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.engines = [
+            {
+                "name": "google",
+                "url": "https://www.google.com",
+                "bangs": ["!go"],
+                "categories": ["!general"],
+                "reliability": "100",
+                "errors": None,
+            }
+        ]
+
+    def test_persisted_between_instances(self, tmp_path):
+        """Test catalogues are written as compact JSON keyed by instance URL"""
+        path = os.path.join(tmp_path, "engines.json")
+        EngineCache(path=path).set("https://example.com/", self.engines, etag='"v1"')
+
+        with open(path) as f:
+            assert ", " not in f.read()
+        entry = EngineCache(path=path).get("https://example.com")
+        assert entry["engines"] == self.engines
+        assert entry["etag"] == '"v1"'
+        assert EngineCache(path=path).get("https://example.org") is None
+
+    def test_memory_only(self, tmp_path):
+        """Test persist=False keeps the catalogue in memory only"""
+        path = os.path.join(tmp_path, "engines.json")
+        cache = EngineCache(path=path, persist=False)
+        cache.set("https://example.com", self.engines)
+
+        assert cache.get("https://example.com")["engines"] == self.engines
+        assert not os.path.exists(path)
+
+    def test_freshness_and_touch(self, tmp_path):
+        """Test entries go stale after the TTL and touch revalidates them"""
+        cache = EngineCache(path=os.path.join(tmp_path, "engines.json"), ttl=60)
+        with patch("searxngr.cache.time.time", return_value=1000.0):
+            cache.set("https://example.com", self.engines)
+        entry = cache.get("https://example.com")
+
+        with patch("searxngr.cache.time.time", return_value=1061.0):
+            assert not cache.is_fresh(entry)
+            cache.touch("https://example.com")
+            assert cache.is_fresh(cache.get("https://example.com"))
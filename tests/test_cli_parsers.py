@@ -73,6 +73,12 @@ class TestCreateParser:
         config.safe_search = "moderate"
         config.url_handler = "open"
         config.secondary_url_handler = None
+        config.connect_timeout = None
+        config.read_timeout = None
+        config.pool_timeout = None
+        config.http2 = False
+        config.max_connections = 100
+        config.keepalive_expiry = 5.0
         return config
 
     def test_create_parser_returns_argparse(self, mock_config):
@@ -145,3 +151,15 @@ class TestCreateParser:
         parser = create_parser(mock_config)
         with pytest.raises(SystemExit):
             parser.parse_args(["--http-method", "INVALID"])
+
+    def test_create_parser_has_connection_options(self, mock_config):
+        """Test parser has HTTP/2, pool and per phase timeout options"""
+        parser = create_parser(mock_config)
+        args = parser.parse_args(
+            ["--http2", "--max-connections", "4", "--connect-timeout", "2"]
+        )
+        assert args.http2 is True
+        assert args.max_connections == 4
+        assert args.connect_timeout == 2.0
+        assert args.read_timeout is None
+        assert args.keepalive_expiry == 5.0
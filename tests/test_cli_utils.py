@@ -1,8 +1,23 @@
+import argparse
+import io
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 import subprocess
+import threading
 
-from searxngr.cli import open_url
+from searxngr.cli import (
+    fetch_results,
+    get_rate_limit,
+    main,
+    open_url,
+    prefetch_next_pages,
+    write_json_lines,
+)
+from searxngr.client import SearXNGClient
+from searxngr.render import ResultPrinter
+from searxngr.testing import MockSearXNGServer
 
 
 class TestOpenUrl:
@@ -54,3 +69,309 @@ class TestOpenUrl:
         mock_run.assert_called_once()
         called_command = mock_run.call_args[0][0]
         assert called_command == ["open", "https://example.com"]
+
+
+def make_fetch_args(**kwargs):
+    args = argparse.Namespace(
+        safe_search="strict",
+        engines=None,
+        language=None,
+        time_range=None,
+        site=None,
+        http_method="GET",
+        categories=None,
+        num=10,
+        parallel_pages=False,
+    )
+    for key, value in kwargs.items():
+        setattr(args, key, value)
+    return args
+
+
+class TestGetRateLimit:
+    """Test get_rate_limit function"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cfg = MagicMock(rate_limit=2.0, rate_limit_burst=4)
+        self.cfg.rate_limit_for.return_value = (0.5, 1)
+
+    def test_instance_settings_without_options(self):
+        """Test an instance section applies when the options are not given"""
+        args = argparse.Namespace(rate_limit=None, rate_limit_burst=None)
+
+        assert get_rate_limit(args, self.cfg, "https://slow.example.com") == (0.5, 1)
+
+    def test_options_override_instance_settings(self):
+        """Test the options override an instance section even at the global values"""
+        args = argparse.Namespace(rate_limit=2.0, rate_limit_burst=4)
+
+        assert get_rate_limit(args, self.cfg, "https://slow.example.com") == (2.0, 4)
+
+
+class TestFetchResults:
+    """Test fetch_results function"""
+
+    def page(self, pageno, size=10):
+        return [{"title": f"{pageno}-{i}"} for i in range(size)]
+
+    def test_fetch_results_sequential(self):
+        """Test pages are fetched one at a time until enough results"""
+        searxng = MagicMock()
+        searxng.search.side_effect = lambda query, pageno, **kw: self.page(pageno)
+
+        results, pageno = fetch_results(
+            searxng, "query", make_fetch_args(num=25), [], 0, 1
+        )
+
+        assert len(results) == 30
+        assert pageno == 4
+        searxng.search_pages.assert_not_called()
+        assert searxng.search.call_count == 3
+
+    def test_fetch_results_parallel(self):
+        """Test the needed pages are fetched together and merged in page order"""
+        searxng = MagicMock()
+        searxng.search_pages.side_effect = lambda query, pagenos, **kw: [
+            self.page(p) for p in pagenos
+        ]
+
+        results, pageno = fetch_results(
+            searxng, "query", make_fetch_args(num=25, parallel_pages=True), [], 0, 1
+        )
+
+        assert list(searxng.search_pages.call_args[0][1]) == [1, 2, 3]
+        assert [r["title"] for r in results[::10]] == ["1-0", "2-0", "3-0"]
+        assert pageno == 4
+        searxng.search.assert_not_called()
+
+    def test_fetch_results_parallel_short_pages(self):
+        """Test short pages fall back to sequential fetches for the remainder"""
+        searxng = MagicMock()
+        searxng.search_pages.side_effect = lambda query, pagenos, **kw: [
+            self.page(p, size=5) for p in pagenos
+        ]
+        searxng.search.side_effect = lambda query, pageno, **kw: self.page(
+            pageno, size=5
+        )
+
+        results, pageno = fetch_results(
+            searxng, "query", make_fetch_args(num=20, parallel_pages=True), [], 0, 1
+        )
+
+        assert len(results) == 25
+        assert [r["title"] for r in results[::5]] == ["1-0", "2-0", "3-0", "4-0", "5-0"]
+        assert pageno == 6
+
+    def test_fetch_results_uses_prefetched_page(self):
+        """Test a prefetched page is used instead of a new search"""
+        searxng = MagicMock()
+        prefetcher = MagicMock()
+        prefetcher.take.return_value = self.page(3)
+
+        results, pageno = fetch_results(
+            searxng, "query", make_fetch_args(num=5), [], 0, 3, prefetcher
+        )
+
+        assert results[0]["title"] == "3-0"
+        assert prefetcher.take.call_args[0][:2] == ("query", 3)
+        searxng.search.assert_not_called()
+
+    def test_fetch_results_parallel_stops_at_empty_page(self):
+        """Test merging stops at the first empty page"""
+        searxng = MagicMock()
+        searxng.search_pages.return_value = [self.page(1), [], self.page(3)]
+
+        results, pageno = fetch_results(
+            searxng, "query", make_fetch_args(num=25, parallel_pages=True), [], 0, 1
+        )
+
+        assert len(results) == 10
+        assert pageno == 2
+
+    def test_fetch_results_on_page(self):
+        """Test each page is passed to on_page as soon as it is fetched"""
+        searxng = MagicMock()
+        searxng.search.side_effect = lambda query, pageno, **kw: (
+            self.page(pageno) if pageno < 3 else []
+        )
+        pages = []
+
+        fetch_results(
+            searxng, "query", make_fetch_args(num=25), [], 0, 1, on_page=pages.append
+        )
+
+        assert [page[0]["title"] for page in pages] == ["1-0", "2-0"]
+
+    def test_fetch_results_parallel_on_page(self):
+        """Test parallel pages are passed to on_page in page order"""
+        searxng = MagicMock()
+        searxng.search_pages.side_effect = lambda query, pagenos, **kw: [
+            self.page(p) for p in pagenos
+        ]
+        pages = []
+
+        fetch_results(
+            searxng,
+            "query",
+            make_fetch_args(num=25, parallel_pages=True),
+            [],
+            0,
+            1,
+            on_page=pages.append,
+        )
+
+        assert [page[0]["title"] for page in pages] == ["1-0", "2-0", "3-0"]
+
+    @patch("sys.stdout.isatty", return_value=True)
+    @patch("searxngr.formatter.console")
+    def test_fetch_results_prints_pages_as_they_arrive(self, mock_console, _):
+        """Test each page is printed before the next one is requested"""
+        events = []
+        searxng = MagicMock()
+
+        def search(query, pageno, **kw):
+            events.append(f"search {pageno}")
+            return self.page(pageno)
+
+        searxng.search.side_effect = search
+        mock_console.render_str.side_effect = lambda text, **kw: text
+        mock_console.print.side_effect = lambda group, **kw: events.extend(
+            str(line) for line in group.renderables
+        )
+        results = []
+        printer = ResultPrinter(results, 15)
+
+        fetch_results(
+            searxng,
+            "query",
+            make_fetch_args(num=15),
+            results,
+            0,
+            1,
+            on_page=lambda page: printer.update(),
+        )
+
+        titles = [e for e in events if "[bold green]" in e]
+        assert len(titles) == 15
+        assert "[cyan] 1.[/cyan]" in titles[0] and "1-0" in titles[0]
+        assert "[cyan]11.[/cyan]" in titles[10] and "2-0" in titles[10]
+        # the first page was printed before the second was requested
+        assert events.index(titles[9]) < events.index("search 2")
+
+
+class TestPrefetchNextPages:
+    """Test prefetching the pages the interactive 'n' command requests"""
+
+    def test_pages_for_next_fetch(self):
+        """Test every page the next fetch needs is prefetched"""
+        prefetcher = MagicMock(max_pages=4)
+
+        prefetch_next_pages(prefetcher, "query", make_fetch_args(), [None] * 20, 0, 3)
+
+        pages = [c.args[1] for c in prefetcher.prefetch.call_args_list]
+        # 'n' shows results 11-20 from the buffer, the next one needs 21-31
+        assert pages == [4, 5]
+
+    def test_limited_to_max_pages(self):
+        """Test no more pages are prefetched than the prefetcher holds"""
+        prefetcher = MagicMock(max_pages=2)
+
+        prefetch_next_pages(
+            prefetcher, "query", make_fetch_args(num=50), [None] * 50, 0, 6
+        )
+
+        assert prefetcher.prefetch.call_count == 2
+
+    def test_next_page_without_waiting(self, tmp_path, monkeypatch):
+        """Test 'n' makes no search request of its own with --prefetch"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        searches = []
+        search = SearXNGClient.search
+
+        def record_search(client, query, **kwargs):
+            searches.append((threading.current_thread().name, kwargs["pageno"]))
+            return search(client, query, **kwargs)
+
+        prompts = []
+
+        def ask(*args, **kwargs):
+            prompts.append(len(searches))
+            if len(prompts) == 3:
+                # let the last prefetches finish before the server stops
+                for thread in threading.enumerate():
+                    if thread.name == "searxngr-prefetch":
+                        thread.join()
+                return "q"
+            return "n"
+
+        with MockSearXNGServer() as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "--prefetch", "query"]
+            with (
+                patch("sys.argv", argv),
+                patch.object(SearXNGClient, "search", record_search),
+                patch("searxngr.interactive.Prompt.ask", side_effect=ask),
+                patch("searxngr.formatter.console"),
+                patch("searxngr.interactive.console"),
+                patch("searxngr.client.console"),
+            ):
+                with pytest.raises(SystemExit):
+                    main()
+
+        # only the first screen of results was fetched while the user waited,
+        # the pages for both 'n' commands were prefetched in the background
+        assert [page for name, page in searches if name == "MainThread"] == [1, 2]
+        prefetched = sorted(p for name, p in searches if name != "MainThread")
+        assert prefetched == [4, 5, 7, 8]
+
+
+class TestWriteJsonLines:
+    """Test write_json_lines function"""
+
+    def test_write_json_lines(self):
+        """Test each result is written as a compact JSON line"""
+        out = io.StringIO()
+
+        write_json_lines([{"title": "café", "score": 1.5}, {"title": "b"}], out)
+
+        assert out.getvalue() == '{"title":"café","score":1.5}\n{"title":"b"}\n'
+        assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+            {"title": "café", "score": 1.5},
+            {"title": "b"},
+        ]
+
+    def test_write_json_lines_flushes(self):
+        """Test the output is flushed after each page"""
+        out = MagicMock()
+
+        write_json_lines([{"title": "a"}], out)
+
+        out.flush.assert_called_once()
+
+
+class TestNdjsonOutput:
+    """Test --ndjson output"""
+
+    def test_ndjson_main(self, tmp_path, monkeypatch, capsys):
+        """Test every fetched result is written to stdout as a JSON line"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        with MockSearXNGServer(
+            unresponsive_engines=[("wikipedia", "timeout")]
+        ) as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "-n", "15", "--ndjson", "query"]
+            with patch("sys.argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert len(lines) == 20
+        assert "page=1&index=0" in lines[0]["url"]
+        assert "page=2&index=10" in lines[10]["url"]
+        assert "wikipedia" in captured.err
@@ -56,6 +56,36 @@ categories = news general
                     assert config.engines == ["google", "duckduckgo"]
                     assert config.categories == ["news", "general"]
 
+    def test_instance_rate_limits(self):
+        """Test rate limits set for one instance override the default"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_content = """
+[searxngr]
+searxng_url = https://test.com
+rate_limit = 2
+rate_limit_burst = 4
+
+[https://slow.example.com/]
+rate_limit = 0.5
+
+[https://busy.example.com]
+rate_limit_burst = 1
+"""
+
+            with patch("builtins.open", mock_open(read_data=config_content)):
+                with patch("os.path.exists", return_value=True):
+                    config = SearxngrConfig(config_path=temp_dir)
+
+                    assert config.rate_limit_for("https://test.com") == (2.0, 4)
+                    assert config.rate_limit_for("https://slow.example.com") == (
+                        0.5,
+                        4,
+                    )
+                    assert config.rate_limit_for("https://busy.example.com/") == (
+                        2.0,
+                        1,
+                    )
+
     def test_category_validation(self):
         """Test category validation functionality"""
         # Test valid categories
@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from searxngr.cache import EngineCache
+from searxngr.cli import client_settings, create_parser, daemon_reply_timeout, main
+from searxngr.client import (
+    SearXNGClient,
+    SearXNGConnectionError,
+    SearXNGError,
+    SearXNGHTTPError,
+    SearXNGJSONError,
+    SearXNGTimeoutError,
+)
+from searxngr.config import SearxngrConfig
+from searxngr.daemon import DaemonClient, SearXNGDaemon, connect_daemon
+from searxngr.testing import MockSearXNGServer
+
+
+def cli_settings(argv):
+    """Return the client settings of a searxngr run with the given arguments."""
+    cfg = SearxngrConfig(skip_config_creation=True)
+    args = create_parser(cfg).parse_args(argv[1:])
+    return client_settings(args, cfg, args.searxng_url)
+
+
+def reply_once(path, reply):
+    """Answer one connection to a Unix socket at path with reply, then close it"""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+
+    def serve():
+        with listener:
+            conn, _ = listener.accept()
+            with conn:
+                conn.makefile("rb").readline()
+                conn.sendall(reply)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def server():
+    with MockSearXNGServer() as server:
+        yield server
+
+
+@pytest.fixture
+def daemon(server, tmp_path):
+    searxng = SearXNGClient(url=server.url, engine_cache=EngineCache(persist=False))
+    daemon = SearXNGDaemon(searxng, path=str(tmp_path / "daemon.sock"))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    thread.join()
+
+
+class TestDaemon:
+    """Test forwarding searches to a searxngr daemon"""
+
+    def test_search(self, server, daemon):
+        """Test searches through the daemon match direct searches"""
+        client = DaemonClient(daemon.path, server.url)
+
+        results = client.search("test query", pageno=2, categories=["news"])
+
+        assert results == SearXNGClient(url=server.url).search(
+            "test query", pageno=2, categories=["news"]
+        )
+
+    def test_search_pages(self, server, daemon):
+        """Test search_pages returns the pages in page order"""
+        client = DaemonClient(daemon.path, server.url)
+
+        pages = client.search_pages("test query", range(1, 4))
+
+        assert len(pages) == 3
+        assert ["page=2" in r["url"] for r in pages[1]] == [True] * 10
+
+    def test_engines_and_categories(self, server, daemon):
+        """Test the engine list is fetched once and categories are sets"""
+        client = DaemonClient(daemon.path, server.url)
+
+        engines = client.engines()
+        categories = client.categories()
+
+        assert engines
+        assert all(isinstance(names, set) for names in categories.values())
+        preferences = [r for r in server.requests if r["path"] == "/preferences"]
+        assert len(preferences) == 1
+
+    def test_errors(self, tmp_path):
+        """Test SearXNG errors are answered with their type and status code"""
+        with MockSearXNGServer(error_rate=1.0, error_status=503) as server:
+            daemon = SearXNGDaemon(
+                SearXNGClient(url=server.url), path=str(tmp_path / "daemon.sock")
+            )
+            response = daemon.dispatch({"method": "search", "params": {"query": "q"}})
+
+        assert response["error"]["type"] == "SearXNGHTTPError"
+        assert response["error"]["status_code"] == 503
+
+    def test_bad_argument(self, daemon, server):
+        """Test a request with a bad argument is answered with an error"""
+        response = daemon.dispatch(
+            {"method": "search", "params": {"query": "x", "http_method": "PUT"}}
+        )
+
+        assert response["error"]["type"] == "SearXNGError"
+        assert "Bad request" in response["error"]["message"]
+        with pytest.raises(SearXNGError):
+            DaemonClient(daemon.path, server.url).search("x", http_method="PUT")
+
+    @pytest.mark.parametrize("method", ["search", "search_pages"])
+    def test_unresponsive_engines_reported(self, tmp_path, method):
+        """Test the CLI side reports the engines the instance found unresponsive"""
+        with MockSearXNGServer(unresponsive_engines=[("bing", "timeout")]) as server:
+            daemon = SearXNGDaemon(
+                SearXNGClient(url=server.url), path=str(tmp_path / "daemon.sock")
+            )
+            params = {"query": "q"}
+            if method == "search_pages":
+                params["pagenos"] = [1, 2]
+            with patch("searxngr.client.console") as mock_console:
+                response = daemon.dispatch({"method": method, "params": params})
+
+            # the daemon returns the engines rather than printing them
+            mock_console.print.assert_not_called()
+            assert response["unresponsive_engines"] == [["bing", "timeout"]] * (
+                len(params.get("pagenos", [1]))
+            )
+
+            daemon.bind()
+            thread = threading.Thread(
+                target=daemon.serve_forever, args=(0.05,), daemon=True
+            )
+            thread.start()
+            try:
+                client = DaemonClient(daemon.path, server.url)
+                with patch("searxngr.client.console") as mock_console:
+                    getattr(client, method)(**params)
+            finally:
+                daemon.shutdown()
+                thread.join()
+
+        mock_console.print.assert_called_once_with("Engine: bing [red]timeout[/red]")
+
+    def test_http_error_raised(self, daemon, server):
+        """Test an error response is raised as the matching exception type"""
+        client = DaemonClient(daemon.path, server.url)
+
+        with patch.object(
+            daemon.searxng, "search", side_effect=SearXNGHTTPError("Bad gateway", 502)
+        ):
+            with pytest.raises(SearXNGHTTPError) as exc_info:
+                client.search("test query")
+
+        assert exc_info.value.status_code == 502
+        assert str(exc_info.value) == "Bad gateway"
+
+    def test_reply_timeout(self, daemon, server):
+        """Test a call may take longer than the connect timeout to be answered"""
+        search = daemon.searxng.search
+
+        def slow_search(*args, **kwargs):
+            time.sleep(0.3)
+            return search(*args, **kwargs)
+
+        with patch.object(daemon.searxng, "search", side_effect=slow_search):
+            client = DaemonClient(daemon.path, server.url, timeout=0.1)
+            with pytest.raises(SearXNGTimeoutError):
+                client.search("test query")
+
+            client = DaemonClient(daemon.path, server.url, timeout=0.1, reply_timeout=5)
+            assert len(client.search("test query")) == 10
+
+    @pytest.mark.parametrize(
+        "reply, error",
+        [
+            (b"", SearXNGConnectionError),
+            (b"\n", SearXNGConnectionError),
+            (b'{"result": [', SearXNGJSONError),
+            (b"not json\n", SearXNGJSONError),
+            (b"[]\n", SearXNGJSONError),
+        ],
+    )
+    def test_invalid_reply(self, tmp_path, reply, error):
+        """Test short or garbled replies raise SearXNG errors"""
+        path = str(tmp_path / "daemon.sock")
+        thread = reply_once(path, reply)
+
+        with pytest.raises(error):
+            DaemonClient(path, timeout=5).search("test query")
+        thread.join()
+
+    def test_cli_reply_timeout(self):
+        """Test the CLI waits for the daemon's retries before timing out"""
+        args = argparse.Namespace(timeout=30.0, retries=0, retry_deadline=60.0)
+        assert daemon_reply_timeout(args) == 40.0
+        args.retries = 3
+        assert daemon_reply_timeout(args) == 100.0
+        args.retry_deadline = 0
+        assert daemon_reply_timeout(args) == 160.0
+
+    def test_unknown_method(self, daemon):
+        """Test an unknown method is answered with an error"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(daemon.path)
+            sock.sendall(b'{"method": "shutdown"}\n')
+            response = json.loads(sock.makefile("rb").readline())
+
+        assert response["error"]["type"] == "SearXNGError"
+
+    def test_connect_daemon(self, server, daemon, tmp_path):
+        """Test connect_daemon only returns a client for the same instance"""
+        assert connect_daemon(server.url + "/", daemon.path) is not None
+        assert connect_daemon("https://other.example.com", daemon.path) is None
+        assert connect_daemon(server.url, str(tmp_path / "missing.sock")) is None
+
+    def test_connect_daemon_settings(self, server, daemon):
+        """Test connect_daemon skips a daemon started with other client settings"""
+        daemon.settings = {"timeout": 30.0, "verify_ssl": True}
+
+        assert connect_daemon(server.url, daemon.path, settings=None) is not None
+        assert (
+            connect_daemon(server.url, daemon.path, settings=daemon.settings)
+            is not None
+        )
+        settings = dict(daemon.settings, timeout=5.0)
+        assert connect_daemon(server.url, daemon.path, settings=settings) is None
+
+    def test_socket_private(self, daemon):
+        """Test only the current user can connect to the daemon socket"""
+        assert os.stat(daemon.path).st_mode & 0o777 == 0o600
+
+    def test_bind_replaces_stale_socket(self, server, tmp_path):
+        """Test a socket left by a daemon that died is replaced"""
+        path = str(tmp_path / "daemon.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+
+        daemon = SearXNGDaemon(SearXNGClient(url=server.url), path=path)
+        daemon.bind()
+        daemon.close()
+
+        assert not os.path.exists(path)
+
+    def test_bind_refuses_running_daemon(self, server, daemon):
+        """Test a second daemon does not take over a running daemon's socket"""
+        second = SearXNGDaemon(SearXNGClient(url=server.url), path=daemon.path)
+
+        with pytest.raises(SearXNGError):
+            second.bind()
+
+    def test_cli_forwards_to_daemon(self, server, daemon, tmp_path, monkeypatch):
+        """Test the CLI searches through a running daemon"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        argv = ["searxngr", "--searxng-url", server.url, "--url-handler", "true"]
+        argv += ["--json", "--np", "query"]
+        daemon.settings = cli_settings(argv)
+
+        with patch("searxngr.daemon.daemon_socket_path", return_value=daemon.path):
+            with patch("searxngr.client.SearXNGClient") as mock_client:
+                with patch("sys.argv", argv):
+                    with pytest.raises(SystemExit) as exc_info:
+                        main()
+
+        assert exc_info.value.code == 0
+        mock_client.assert_not_called()
+        assert server.requests[-1]["params"]["q"] == "query"
+
+    @pytest.mark.parametrize(
+        "option",
+        [
+            ["--timeout", "5"],
+            ["--no-verify-ssl"],
+            ["--retries", "3"],
+            ["--rate-limit", "2"],
+            ["--noua"],
+        ],
+    )
+    def test_cli_skips_daemon_with_other_settings(
+        self, server, daemon, tmp_path, monkeypatch, option
+    ):
+        """Test a run with other client options connects to the server itself"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        argv = ["searxngr", "--searxng-url", server.url, "--url-handler", "true"]
+        argv += ["--json", "--np", "query"]
+        daemon.settings = cli_settings(argv)
+
+        with patch("searxngr.daemon.daemon_socket_path", return_value=daemon.path):
+            with patch.object(daemon, "dispatch", wraps=daemon.dispatch) as dispatch:
+                with patch("sys.argv", argv[:-1] + option + argv[-1:]):
+                    with pytest.raises(SystemExit) as exc_info:
+                        main()
+
+        assert exc_info.value.code == 0
+        assert [c.args[0]["method"] for c in dispatch.call_args_list] == ["ping"]
+        assert server.requests[-1]["params"]["q"] == "query"
@@ -0,0 +1,82 @@
+import os
+from unittest.mock import patch
+
+from searxngr.engines import (
+    extract_engines_from_preferences,
+    _extract_engines_with_soup,
+    _unique_sorted_engines,
+)
+from searxngr.testing import FIXTURES_DIR
+
+
+def load_preferences() -> str:
+    with open(os.path.join(FIXTURES_DIR, "preferences.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def normalize(engines):
+    return [dict(e, categories=sorted(e["categories"])) for e in engines]
+
+
+class TestExtractEngines:
+    """Test engine extraction from the preferences page"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.html = load_preferences()
+        self.engines = {
+            e["name"]: e for e in extract_engines_from_preferences(self.html)
+        }
+
+    def test_matches_soup_parser(self):
+        """Test the streaming parser yields the same engines as the tree walk"""
+        streamed = extract_engines_from_preferences(self.html)
+        soup = _unique_sorted_engines(_extract_engines_with_soup(self.html))
+
+        assert len(streamed) == 30
+        assert normalize(streamed) == normalize(soup)
+
+    def test_engine_fields(self):
+        """Test the fields extracted for an engine row"""
+        google = self.engines["google"]
+
+        assert google["url"] == "https://www.google.com"
+        assert google["bangs"] == ["!go"]
+        assert sorted(google["categories"]) == ["!general", "!web"]
+        assert google["reliability"] == "100"
+        assert google["errors"] is None
+
+    def test_engine_errors(self):
+        """Test reliability errors are read from the reliability tooltip"""
+        assert self.engines["bing"]["reliability"] == "0"
+        assert self.engines["bing"]["errors"] == "Timeout (max time exceeded)"
+        assert self.engines["currency"]["reliability"] is None
+
+    def test_engines_are_unique_and_sorted(self):
+        """Test engines listed in several categories appear once, sorted by name"""
+        names = [e["name"] for e in extract_engines_from_preferences(self.html)]
+
+        assert names.count("youtube") == 1
+        assert names == sorted(names, key=str.lower)
+
+    def test_header_rows_before_group_are_ignored(self):
+        """Test rows are only engines when they follow a pref-group header"""
+        html = """
+        <table>
+          <tr><th class="name"><label>orphan</label></th></tr>
+          <tr class="pref-group"><th colspan="2">web</th></tr>
+          <tr><th class="name"><label>listed</label></th><td><span>90</span></td></tr>
+        </table>
+        """
+        engines = extract_engines_from_preferences(html)
+
+        assert [e["name"] for e in engines] == ["listed"]
+        assert engines[0]["reliability"] == "90"
+
+    def test_falls_back_to_soup_parser(self):
+        """Test unrecognised markup falls back to the BeautifulSoup parser"""
+        with patch(
+            "searxngr.engines._extract_engines_with_soup", return_value=[]
+        ) as mock_soup:
+            assert extract_engines_from_preferences("<html></html>") == []
+        mock_soup.assert_called_once()
@@ -0,0 +1,104 @@
+import pytest
+
+from searxngr.health import InstanceHealth
+
+
+def create_health(tmp_path, **kwargs):
+    return InstanceHealth(path=str(tmp_path / "health.json"), **kwargs)
+
+
+class TestInstanceHealth:
+    """Test the rolling per-instance latency and error statistics"""
+
+    def test_latency_ewma(self, tmp_path):
+        """Test the latency average weights the newest request by alpha"""
+        health = create_health(tmp_path, alpha=0.5)
+
+        health.record_success("https://a.example.com/", 1.0)
+        health.record_success("https://a.example.com", 3.0)
+
+        entry = health.get("https://a.example.com")
+        assert entry["latency"] == pytest.approx(2.0)
+        assert entry["samples"] == [1.0, 3.0]
+
+    def test_failures_make_instance_unhealthy(self, tmp_path):
+        """Test repeated failures mark an instance unhealthy until retry_after"""
+        health = create_health(tmp_path, retry_after=60)
+        url = "https://a.example.com"
+
+        health.record_failure(url)
+        assert health.is_healthy(url)
+        health.record_failure(url)
+        assert not health.is_healthy(url)
+
+        health.retry_after = 0
+        assert health.is_healthy(url)
+
+    def test_successes_recover_instance(self, tmp_path):
+        """Test successful requests bring the error rate back down"""
+        health = create_health(tmp_path)
+        url = "https://a.example.com"
+        for _ in range(3):
+            health.record_failure(url)
+
+        for _ in range(3):
+            health.record_success(url, 0.1)
+
+        assert health.get(url)["errors"] < 0.5
+        assert health.is_healthy(url)
+
+    def test_rank(self, tmp_path):
+        """Test instances are ranked fastest healthy first"""
+        health = create_health(tmp_path)
+        health.record_success("https://slow.example.com", 2.0)
+        health.record_success("https://fast.example.com", 0.5)
+        health.record_success("https://down.example.com", 0.1)
+        for _ in range(3):
+            health.record_failure("https://down.example.com")
+
+        ranked = health.rank(
+            [
+                "https://down.example.com",
+                "https://slow.example.com",
+                "https://new.example.com",
+                "https://fast.example.com",
+            ]
+        )
+
+        assert ranked == [
+            "https://new.example.com",
+            "https://fast.example.com",
+            "https://slow.example.com",
+            "https://down.example.com",
+        ]
+
+    def test_latency_percentile(self, tmp_path):
+        """Test percentiles need enough samples and use recent response times"""
+        health = create_health(tmp_path)
+        url = "https://a.example.com"
+        health.record_success(url, 1.0)
+        assert health.latency_percentile(url, 90) is None
+
+        for latency in range(2, 11):
+            health.record_success(url, float(latency))
+
+        assert health.latency_percentile(url, 90) == 9.0
+        assert health.latency_percentile(url, 50) == 5.0
+        assert health.latency_percentile(url, 100) == 10.0
+
+    def test_persisted(self, tmp_path):
+        """Test statistics are saved and loaded between runs"""
+        create_health(tmp_path).record_success("https://a.example.com", 0.25)
+
+        entry = create_health(tmp_path).get("https://a.example.com")
+
+        assert entry["latency"] == 0.25
+
+    def test_not_persisted(self, tmp_path):
+        """Test persist=False keeps the statistics in memory only"""
+        health = create_health(tmp_path, persist=False)
+        health.record_success("https://a.example.com", 0.25)
+
+        assert health.get("https://a.example.com")["latency"] == 0.25
+        assert not (tmp_path / "health.json").exists()
+        assert create_health(tmp_path).get("https://a.example.com") is None
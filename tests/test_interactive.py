@@ -1,7 +1,11 @@
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch
 
+from searxngr.cli import main
 from searxngr.interactive import run_interactive_loop
+from searxngr.testing import MockSearXNGServer
 
 
 class MockArgs:
@@ -13,6 +17,7 @@ class MockArgs:
         self.num = 10
         self.expand = False
         self.max_content_words = 128
+        self.nocolor = False
         self.safe_search = "strict"
         self.time_range = None
         self.engines = None
@@ -88,6 +93,47 @@ class TestInteractive:
             assert start_at == 0
             assert pageno == 1
 
+    def test_run_interactive_loop_new_search_cancels_prefetch(self):
+        """Test that a new query discards prefetched pages"""
+        mock_args = MockArgs()
+        prefetcher = MagicMock()
+
+        with patch("searxngr.interactive.Prompt.ask") as mock_prompt:
+            mock_prompt.return_value = "new search query"
+
+            run_interactive_loop(
+                mock_args,
+                [],
+                query="old query",
+                start_at=0,
+                pageno=1,
+                searxng=MagicMock(),
+                prefetcher=prefetcher,
+            )
+
+        prefetcher.cancel.assert_called_once()
+
+    def test_run_interactive_loop_time_range_cancels_prefetch(self):
+        """Test that changing the time range discards prefetched pages"""
+        mock_args = MockArgs()
+        prefetcher = MagicMock()
+
+        with patch("searxngr.interactive.Prompt.ask") as mock_prompt:
+            mock_prompt.return_value = "t week"
+
+            run_interactive_loop(
+                mock_args,
+                [],
+                query="test",
+                start_at=0,
+                pageno=1,
+                searxng=MagicMock(),
+                prefetcher=prefetcher,
+            )
+
+        assert mock_args.time_range == "week"
+        prefetcher.cancel.assert_called_once()
+
     def test_run_interactive_loop_toggle_expand(self):
         """Test that x command toggles expand"""
         mock_args = MockArgs()
@@ -157,3 +203,24 @@ class TestInteractive:
             )
 
             assert new_query == "invalid_command_xyz"
+
+    def test_json_command_shows_raw_result(self, tmp_path, monkeypatch):
+        """Test 'j' prints the whole result JSON, not only the displayed fields"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        with MockSearXNGServer() as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "query"]
+            with (
+                patch("sys.argv", argv),
+                patch("searxngr.interactive.Prompt.ask", side_effect=["j 1", "q"]),
+                patch("searxngr.interactive.console") as mock_console,
+                patch("searxngr.formatter.console"),
+                patch("searxngr.client.console"),
+            ):
+                with pytest.raises(SystemExit):
+                    main()
+
+        result = json.loads(mock_console.print.call_args_list[0][0][0])
+        assert "parsed_url" in result
+        assert "score" in result
@@ -0,0 +1,87 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from searxngr.cache import EngineCache
+from searxngr.client import SearXNGClient, SearXNGHTTPError
+from searxngr.testing import MockSearXNGServer
+
+
+class TestMockSearXNGServer:
+    """Test the local stand-in SearXNG server"""
+
+    def test_search_pagination(self):
+        """Test pages hold page_size unique results up to max_pages"""
+        with MockSearXNGServer(page_size=5, max_pages=2) as server:
+            client = SearXNGClient(url=server.url)
+            first = client.search("test query", pageno=1)
+            second = client.search("test query", pageno=2)
+            third = client.search("test query", pageno=3)
+
+        assert len(first) == 5
+        assert len(second) == 5
+        assert third == []
+        assert not {r["url"] for r in first} & {r["url"] for r in second}
+
+    def test_search_categories_and_post(self):
+        """Test the category fixture is served for GET and POST requests"""
+        with MockSearXNGServer() as server:
+            client = SearXNGClient(url=server.url)
+            images = client.search("test query", categories=["images"])
+            news = client.search("test query", categories=["news"], http_method="POST")
+
+        assert {r["category"] for r in images} == {"images"}
+        assert {r["category"] for r in news} == {"news"}
+        assert server.requests[-1]["method"] == "POST"
+        assert server.requests[-1]["params"]["q"] == "test query"
+
+    def test_error_rate(self):
+        """Test error_rate answers requests with error_status"""
+        with MockSearXNGServer(error_rate=1.0, error_status=503) as server:
+            client = SearXNGClient(url=server.url)
+            with pytest.raises(SearXNGHTTPError) as exc_info:
+                client.search("test query")
+
+        assert exc_info.value.status_code == 503
+
+    def test_latency(self):
+        """Test responses are delayed by the configured latency"""
+        with MockSearXNGServer(latency=0.2) as server:
+            client = SearXNGClient(url=server.url)
+            start = time.perf_counter()
+            client.search("test query")
+
+        assert time.perf_counter() - start >= 0.2
+
+    def test_unresponsive_engines(self):
+        """Test unresponsive_engines are included in search responses"""
+        with MockSearXNGServer(unresponsive_engines=[("brave", "timeout")]) as server:
+            client = SearXNGClient(url=server.url)
+            with patch("searxngr.client.console") as mock_console:
+                client.search("test query")
+
+        assert "brave" in str(mock_console.print.call_args)
+
+    def test_preferences_etag_revalidation(self, tmp_path):
+        """Test the preferences page supports ETag revalidation"""
+        engine_cache = EngineCache(path=str(tmp_path / "engines.json"), ttl=0)
+        with MockSearXNGServer() as server:
+            client = SearXNGClient(url=server.url, engine_cache=engine_cache)
+            engines = client.engines()
+            assert client.engines() == engines
+
+        assert len(engines) == 30
+        assert len(server.requests) == 2
+        assert "If-None-Match" not in server.requests[0]["headers"]
+        assert server.requests[1]["headers"]["If-None-Match"].startswith('"')
+
+    def test_keepalive_connections(self):
+        """Test connections are reused and counted"""
+        with MockSearXNGServer() as server:
+            client = SearXNGClient(url=server.url)
+            for _ in range(3):
+                client.search("test query")
+
+        assert server.connections == 1
+        assert len(server.requests) == 3
@@ -0,0 +1,331 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from searxngr.cache import EngineCache, ResultCache
+from searxngr.cli import main
+from searxngr.client import SearXNGClient, SearXNGHTTPError
+from searxngr.health import InstanceHealth
+from searxngr.multi import (
+    FailoverSearXNGClient,
+    MultiSearXNGClient,
+    merge_results,
+    normalize_result_url,
+)
+from searxngr.testing import MockSearXNGServer
+
+
+def create_client(server):
+    return SearXNGClient(url=server.url, engine_cache=EngineCache(persist=False))
+
+
+class TestMergeResults:
+    """Test merging result pages from several instances"""
+
+    def test_normalize_result_url(self):
+        """Test URL variants of the same page share a key"""
+        key = normalize_result_url("https://example.com/a%20b")
+
+        assert normalize_result_url("http://www.example.com/a b/") == key
+        assert normalize_result_url("https://EXAMPLE.com/a%20b#top") == key
+        assert normalize_result_url("https://example.com/a%20b?x=1") != key
+
+    def test_merge_and_rank(self):
+        """Test duplicates are merged and ranked by their combined score"""
+        first = [
+            {"url": "https://a.example.com", "score": 3.0, "engines": ["google"]},
+            {"url": "https://b.example.com/", "score": 2.0, "engines": ["google"]},
+        ]
+        second = [
+            {"url": "https://www.b.example.com", "score": 2.0, "engines": ["brave"]},
+            {"url": "https://c.example.com", "score": 1.0, "engines": ["brave"]},
+        ]
+
+        results = merge_results([first, second])
+
+        assert [r["url"] for r in results] == [
+            "https://b.example.com/",
+            "https://a.example.com",
+            "https://c.example.com",
+        ]
+        assert results[0]["engines"] == ["google", "brave"]
+        assert results[0]["score"] == 4.0
+        # the input results are not changed
+        assert first[1]["engines"] == ["google"]
+
+    def test_score_from_positions(self):
+        """Test results without a score are ranked by position"""
+        results = merge_results(
+            [
+                [{"url": "https://a.example.com", "positions": [4]}],
+                [{"url": "https://b.example.com", "positions": [1, 2]}],
+            ]
+        )
+
+        assert [r["url"] for r in results] == [
+            "https://b.example.com",
+            "https://a.example.com",
+        ]
+
+
+class TestMultiSearXNGClient:
+    """Test searching several SearXNG instances at once"""
+
+    def test_search_merges_instances(self):
+        """Test results found on both instances are merged with summed scores"""
+        with MockSearXNGServer(page_size=10) as first:
+            with MockSearXNGServer(page_size=20) as second:
+                single = create_client(first).search("test query", categories=["news"])
+                multi = MultiSearXNGClient(
+                    [create_client(first), create_client(second)]
+                )
+                results = multi.search("test query", categories=["news"])
+
+        assert len(results) == 20
+        assert len({r["url"] for r in results}) == 20
+        scores = {r["url"]: r["score"] for r in results}
+        # the first instance's results are also on the second instance
+        for result in single:
+            assert scores[result["url"]] == pytest.approx(2 * result["score"])
+        assert [r["score"] for r in results] == sorted(scores.values(), reverse=True)
+        assert first.requests[-1]["params"]["categories"] == "news"
+
+    def test_quorum(self):
+        """Test a search returns once the quorum of instances has answered"""
+        with MockSearXNGServer() as fast, MockSearXNGServer(latency=2) as slow:
+            multi = MultiSearXNGClient(
+                [create_client(slow), create_client(fast)], quorum=1
+            )
+            start = time.monotonic()
+            results = multi.search("test query")
+            elapsed = time.monotonic() - start
+
+        assert len(results) == 10
+        assert elapsed < 1
+
+    def test_deadline(self):
+        """Test slower instances are left out once the deadline has passed"""
+        with MockSearXNGServer() as fast, MockSearXNGServer(latency=2) as slow:
+            multi = MultiSearXNGClient(
+                [create_client(fast), create_client(slow)], deadline=0.2
+            )
+            start = time.monotonic()
+            results = multi.search("test query")
+            elapsed = time.monotonic() - start
+
+        assert len(results) == 10
+        assert 0.2 <= elapsed < 1
+
+    @patch("searxngr.multi.console")
+    def test_failed_instance_reported(self, mock_console):
+        """Test a failing instance is reported and the others are used"""
+        with MockSearXNGServer() as ok, MockSearXNGServer(error_rate=1.0) as failing:
+            multi = MultiSearXNGClient([create_client(failing), create_client(ok)])
+            results = multi.search("test query")
+
+        assert len(results) == 10
+        assert failing.url in mock_console.print.call_args[0][0]
+
+    def test_all_instances_fail(self):
+        """Test the search fails with the first instance's error if all fail"""
+        with MockSearXNGServer(error_rate=1.0, error_status=503) as first:
+            with MockSearXNGServer(error_rate=1.0) as second:
+                multi = MultiSearXNGClient(
+                    [create_client(first), create_client(second)]
+                )
+
+                with pytest.raises(SearXNGHTTPError) as exc_info:
+                    multi.search("test query")
+
+        assert exc_info.value.status_code == 503
+
+    def test_engines_falls_back(self):
+        """Test the engine list comes from the first instance that answers"""
+        with MockSearXNGServer(error_rate=1.0) as failing, MockSearXNGServer() as ok:
+            multi = MultiSearXNGClient([create_client(failing), create_client(ok)])
+
+            assert multi.engines()
+            assert multi.categories()
+
+    def test_cli_searxng_urls(self, tmp_path, monkeypatch, capsys):
+        """Test --searxng-urls searches every instance"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        with MockSearXNGServer() as first, MockSearXNGServer() as second:
+            argv = ["searxngr", "--searxng-urls", first.url, second.url]
+            argv += ["--url-handler", "true", "--json", "--np", "query"]
+            with patch("sys.argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        start = out.index("[")
+        results = json.loads(out[start:])
+        assert len({r["url"] for r in results}) == len(results)
+        assert first.requests[-1]["params"]["q"] == "query"
+        assert second.requests[-1]["params"]["q"] == "query"
+
+
+class TestFailoverSearXNGClient:
+    """Test routing searches to the fastest healthy instance"""
+
+    def test_routes_to_fastest(self):
+        """Test searches go to the instance with the lowest average latency"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer() as slow, MockSearXNGServer() as fast:
+            health.record_success(slow.url, 1.0)
+            health.record_success(fast.url, 0.1)
+            failover = FailoverSearXNGClient(
+                [create_client(slow), create_client(fast)], health
+            )
+
+            results = failover.search("test query")
+
+        assert len(results) == 10
+        assert not slow.requests
+        assert len(fast.requests) == 1
+        assert len(health.get(fast.url)["samples"]) == 2
+
+    def test_cache_hits_not_recorded(self, tmp_path):
+        """Test only searches sent to the instance are timed"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer(latency=0.05) as server:
+            client = SearXNGClient(
+                url=server.url,
+                cache=ResultCache(path=str(tmp_path / "results.db")),
+                engine_cache=EngineCache(persist=False),
+            )
+            failover = FailoverSearXNGClient([client], health)
+
+            failover.search("test query")
+            failover.search("test query")
+
+        assert len(server.requests) == 1
+        assert len(health.get(server.url)["samples"]) == 1
+        assert health.get(server.url)["latency"] >= 0.05
+
+    @patch("searxngr.multi.console")
+    def test_fails_over(self, mock_console):
+        """Test a failing instance is recorded and the next one is used"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer(error_rate=1.0) as failing, MockSearXNGServer() as ok:
+            failover = FailoverSearXNGClient(
+                [create_client(failing), create_client(ok)], health
+            )
+
+            results = failover.search("test query")
+            failover.search("test query", pageno=2)
+
+        assert len(results) == 10
+        assert failing.url in mock_console.print.call_args_list[0][0][0]
+        assert health.get(failing.url)["errors"] > 0
+        # the second search skips the failing instance
+        assert len(failing.requests) == 1
+        assert len(ok.requests) == 2
+
+    def test_all_instances_fail(self):
+        """Test the error of the first instance tried is raised"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer(error_rate=1.0, error_status=503) as first:
+            with MockSearXNGServer(error_rate=1.0) as second:
+                failover = FailoverSearXNGClient(
+                    [create_client(first), create_client(second)], health
+                )
+
+                with pytest.raises(SearXNGHTTPError) as exc_info:
+                    failover.search("test query")
+
+        assert exc_info.value.status_code == 503
+        assert len(second.requests) == 1
+
+    def test_hedged_request(self):
+        """Test a slow instance is hedged with the next one after its percentile"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer(latency=0.5) as slow, MockSearXNGServer() as fast:
+            for _ in range(5):
+                health.record_success(slow.url, 0.05)
+                health.record_success(fast.url, 0.1)
+            failover = FailoverSearXNGClient(
+                [create_client(slow), create_client(fast)],
+                health,
+                hedge_percentile=90,
+            )
+            start = time.monotonic()
+            results = failover.search("test query")
+            elapsed = time.monotonic() - start
+
+            # the slower request still finishes and is recorded
+            while len(health.get(slow.url)["samples"]) < 6:
+                assert time.monotonic() - start < 5
+                time.sleep(0.05)
+
+        assert len(results) == 10
+        assert elapsed < 0.4
+        assert health.get(slow.url)["samples"][-1] >= 0.5
+        assert len(slow.requests) == 1
+        assert len(fast.requests) == 1
+
+    def test_hedge_timed_from_request_start(self):
+        """Test a failed hedge does not restart the timer for the next one"""
+        health = InstanceHealth(persist=False)
+        with (
+            MockSearXNGServer(latency=1.0) as slow,
+            MockSearXNGServer(latency=0.2, error_rate=1.0) as failing,
+            MockSearXNGServer() as fast,
+        ):
+            for _ in range(5):
+                health.record_success(slow.url, 0.05)
+                health.record_success(failing.url, 0.3)
+                health.record_success(fast.url, 0.4)
+            failover = FailoverSearXNGClient(
+                [create_client(slow), create_client(failing), create_client(fast)],
+                health,
+                hedge_percentile=90,
+            )
+            start = time.monotonic()
+            results = failover.search("test query")
+            elapsed = time.monotonic() - start
+
+        assert len(results) == 10
+        # the last hedge is sent 0.3s after the failing one was, not 0.3s
+        # after it failed
+        assert elapsed < 0.5
+        assert len(fast.requests) == 1
+
+    def test_no_hedge_without_percentile(self):
+        """Test the next instance is not queried when hedging is off"""
+        health = InstanceHealth(persist=False)
+        with MockSearXNGServer(latency=0.3) as slow, MockSearXNGServer() as fast:
+            for _ in range(5):
+                health.record_success(slow.url, 0.05)
+                health.record_success(fast.url, 0.1)
+            failover = FailoverSearXNGClient(
+                [create_client(slow), create_client(fast)], health
+            )
+
+            assert len(failover.search("test query")) == 10
+
+        assert not fast.requests
+
+    def test_cli_failover(self, tmp_path, monkeypatch, capsys):
+        """Test --failover searches one instance and saves its statistics"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        with MockSearXNGServer() as first, MockSearXNGServer() as second:
+            argv = ["searxngr", "--searxng-urls", first.url, second.url, "--failover"]
+            argv += ["--url-handler", "true", "--json", "--np", "query"]
+            with patch("sys.argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        start = out.index("[")
+        requests = len(first.requests) + len(second.requests)
+        # each page was only searched on one instance
+        assert len(json.loads(out[start:])) == 10 * requests
+        health = InstanceHealth(path=str(tmp_path / "searxngr" / "health.json"))
+        assert health.get(first.url) or health.get(second.url)
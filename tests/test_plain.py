@@ -0,0 +1,116 @@
+import io
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+
+import searxngr.formatter as formatter
+from searxngr.cli import main
+from searxngr.render import RenderContext, print_results, render_cache
+from searxngr.plain import plain_lines, write_plain_range
+from searxngr.results import to_search_results
+from searxngr.testing import MockSearXNGServer
+from searxngr.testing.mock_server import CATEGORY_FIXTURES, FIXTURES_DIR
+
+
+def fixture_results(category):
+    with open(os.path.join(FIXTURES_DIR, CATEGORY_FIXTURES[category])) as f:
+        return to_search_results(json.load(f)["results"])
+
+
+class TestPlainRenderer:
+    """Test writing results as plain text without Rich"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        render_cache.clear()
+        self.results = to_search_results(
+            [
+                {
+                    "title": "Test Result 1",
+                    "url": "https://example.com/result1",
+                    "content": "<p>Use [bold]tags[/bold] and :smile: codes</p>",
+                    "engine": "testengine",
+                    "category": "general",
+                    "engines": ["testengine", "otherengine"],
+                }
+            ]
+        )
+
+    @pytest.mark.parametrize("category", sorted(CATEGORY_FIXTURES))
+    def test_same_text_as_rich(self, category):
+        """Test the plain lines match the Rich output without colour"""
+        results = fixture_results(category)
+        context = RenderContext(95, None, expand=True)
+        out = io.StringIO()
+        console = Console(file=out, width=1000, force_terminal=True, color_system=None)
+
+        with patch.object(formatter, "console", console):
+            formatter.print_rich_range(results, 0, len(results), context)
+
+        rich_lines = [line.rstrip() for line in out.getvalue().splitlines()]
+        lines = plain_lines(results, 0, len(results), context)
+        assert [line.rstrip() for line in lines] == rich_lines
+
+    def test_markup_is_not_parsed(self):
+        """Test text that looks like markup or emoji codes is written as is"""
+        out = io.StringIO()
+
+        write_plain_range(self.results, 0, 1, RenderContext(80, None), out=out)
+
+        assert out.getvalue().splitlines() == [
+            "  1. Test Result 1 [example.com]",
+            "     Use [bold]tags[/bold] and :smile: codes",
+            "     [testengine, otherengine]",
+            "",
+        ]
+
+    @patch("searxngr.render.os.get_terminal_size", side_effect=OSError)
+    def test_selected_for_pipes(self, mock_terminal_size, capsys):
+        """Test results are written plain when stdout is not a terminal"""
+        console = Console(file=io.StringIO(), force_terminal=True)
+
+        with patch.object(formatter, "console", console):
+            print_results(self.results, count=1)
+
+        assert console.file.getvalue() == ""
+        out = capsys.readouterr().out
+        assert out.startswith("\n  1. Test Result 1 [example.com]\n")
+
+    @patch("searxngr.render.os.get_terminal_size", side_effect=OSError)
+    def test_selected_for_nocolor(self, mock_terminal_size, capsys):
+        """Test results are written plain to a terminal with --nocolor"""
+        console = Console(file=io.StringIO(), force_terminal=True)
+
+        with patch.object(formatter, "console", console):
+            with patch.object(sys.stdout, "isatty", return_value=True):
+                print_results(self.results, count=1, plain=True)
+
+        assert console.file.getvalue() == ""
+        assert "[bold]tags[/bold]" in capsys.readouterr().out
+
+    def test_cli_piped_output(self, tmp_path, monkeypatch, capsys):
+        """Test a search piped to another program prints one line per title"""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        with MockSearXNGServer() as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "--np", "-n", "5", "query"]
+            with patch("sys.argv", argv):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert "\x1b[" not in out
+        titles = [line for line in out.splitlines() if line[:4].strip().endswith(".")]
+        assert [title.split(".")[0].strip() for title in titles] == [
+            "1",
+            "2",
+            "3",
+            "4",
+            "5",
+        ]
@@ -0,0 +1,69 @@
+import threading
+from unittest.mock import MagicMock
+
+from searxngr.client import SearXNGTimeoutError
+from searxngr.prefetch import PagePrefetcher
+
+
+class TestPagePrefetcher:
+    """Test background page prefetching"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.searxng = MagicMock()
+        self.searxng.search.side_effect = lambda query, pageno, **kwargs: [
+            {"title": f"{query} page {pageno}"}
+        ]
+
+    def test_take_returns_prefetched_page(self):
+        """Test a prefetched page is returned without another search"""
+        prefetcher = PagePrefetcher(self.searxng)
+        prefetcher.prefetch("query", 2, safe_search="strict")
+
+        results = prefetcher.take("query", 2, safe_search="strict")
+
+        assert results == [{"title": "query page 2"}]
+        assert self.searxng.search.call_count == 1
+        assert prefetcher.take("query", 2, safe_search="strict") is None
+
+    def test_take_with_different_filters_misses(self):
+        """Test a page prefetched for other filters is not handed out"""
+        prefetcher = PagePrefetcher(self.searxng)
+        prefetcher.prefetch("query", 2, time_range="week")
+
+        assert prefetcher.take("query", 2, time_range="day") is None
+        assert prefetcher.take("other", 2, time_range="week") is None
+
+    def test_cancel_discards_pages(self):
+        """Test cancel drops pending and completed prefetches"""
+        release = threading.Event()
+
+        def slow_search(query, pageno, **kwargs):
+            release.wait(5)
+            return [{"title": "stale"}]
+
+        self.searxng.search.side_effect = slow_search
+        prefetcher = PagePrefetcher(self.searxng)
+        prefetcher.prefetch("query", 2)
+        prefetcher.cancel()
+        release.set()
+
+        assert prefetcher.take("query", 2) is None
+
+    def test_memory_is_bounded(self):
+        """Test older prefetched pages are evicted beyond max_pages"""
+        prefetcher = PagePrefetcher(self.searxng, max_pages=2)
+        for pageno in range(2, 6):
+            prefetcher.prefetch("query", pageno)
+
+        assert len(prefetcher._pages) == 2
+        assert prefetcher.take("query", 2) is None
+        assert prefetcher.take("query", 5) == [{"title": "query page 5"}]
+
+    def test_failed_prefetch_returns_none(self):
+        """Test a failed prefetch lets the caller search again"""
+        self.searxng.search.side_effect = SearXNGTimeoutError("timed out")
+        prefetcher = PagePrefetcher(self.searxng)
+        prefetcher.prefetch("query", 2)
+
+        assert prefetcher.take("query", 2) is None
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from searxngr.cache import EngineCache
+from searxngr.client import AsyncSearXNGClient, SearXNGClient
+from searxngr.ratelimit import (
+    SharedTokenBucket,
+    TokenBucket,
+    shared_rate_limit_available,
+)
+from searxngr.testing import MockSearXNGServer
+
+
+class TestTokenBucket:
+    """Test the token bucket rate limiter"""
+
+    def test_burst_then_rate(self):
+        """Test a full bucket allows a burst and then spaces requests out"""
+        bucket = TokenBucket(rate=10, burst=3)
+
+        waits = [bucket.reserve() for _ in range(5)]
+
+        assert waits[:3] == [0, 0, 0]
+        assert waits[3] == pytest.approx(0.1, abs=0.01)
+        assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+    def test_refills(self):
+        """Test tokens come back at the configured rate"""
+        bucket = TokenBucket(rate=20, burst=1)
+        assert bucket.reserve() == 0
+
+        time.sleep(0.06)
+
+        assert bucket.reserve() == 0
+
+    def test_default_burst(self):
+        """Test the burst defaults to one second of requests, at least one"""
+        assert TokenBucket(rate=5).burst == 5
+        assert TokenBucket(rate=0.2).burst == 1
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_concurrent_acquire(self):
+        """Test threads sharing a bucket are spaced out by the rate"""
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: bucket.acquire(), range(6)))
+
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.skipif(
+        not shared_rate_limit_available(), reason="needs fcntl file locks"
+    )
+    def test_shared_bucket(self, tmp_path):
+        """Test buckets using the same file draw on one budget"""
+        path = str(tmp_path / "bucket.json")
+        first = SharedTokenBucket("https://a.example.com", 10, 2, path=path)
+        second = SharedTokenBucket("https://a.example.com", 10, 2, path=path)
+
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() == pytest.approx(0.1, abs=0.01)
+
+    @pytest.mark.skipif(
+        not shared_rate_limit_available(), reason="needs fcntl file locks"
+    )
+    def test_shared_bucket_path(self, tmp_path, monkeypatch):
+        """Test each instance gets its own bucket file in the cache directory"""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        first = SharedTokenBucket("https://a.example.com/", 1)
+        second = SharedTokenBucket("https://b.example.com", 1)
+
+        assert first.path.startswith(str(tmp_path))
+        assert first.path == SharedTokenBucket("https://a.example.com", 1).path
+        assert first.path != second.path
+
+
+class TestClientRateLimit:
+    """Test the SearXNG clients wait for the rate limiter"""
+
+    def test_all_requests_limited(self):
+        """Test searches and the /preferences download each take a token"""
+        bucket = TokenBucket(rate=20, burst=1)
+        with MockSearXNGServer() as server:
+            client = SearXNGClient(
+                url=server.url,
+                engine_cache=EngineCache(persist=False),
+                rate_limiter=bucket,
+            )
+            start = time.monotonic()
+
+            client.engines()
+            client.search("test query")
+            client.search("test query", pageno=2)
+            elapsed = time.monotonic() - start
+
+        assert len(server.requests) == 3
+        # the first request uses the burst, the others wait 50ms each
+        assert elapsed >= 0.09
+
+    def test_async_client_limited(self):
+        """Test concurrent async searches are spaced out by the rate"""
+        bucket = TokenBucket(rate=20, burst=1)
+        with MockSearXNGServer() as server:
+
+            async def search():
+                async with AsyncSearXNGClient(
+                    url=server.url, rate_limiter=bucket
+                ) as client:
+                    return await client.search_pages("test query", [1, 2, 3])
+
+            start = time.monotonic()
+            pages = asyncio.run(search())
+            elapsed = time.monotonic() - start
+
+        assert [len(page) for page in pages] == [10, 10, 10]
+        assert elapsed >= 0.09
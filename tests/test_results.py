@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+from searxngr.results import (
+    FileResult,
+    ImageResult,
+    SearchResult,
+    to_search_results,
+)
+from searxngr.testing.mock_server import CATEGORY_FIXTURES, FIXTURES_DIR
+
+
+def load_page(category):
+    with open(os.path.join(FIXTURES_DIR, CATEGORY_FIXTURES[category])) as f:
+        return json.load(f)["results"]
+
+
+class TestSearchResult:
+    """Test the compact result model built from the SearXNG JSON"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.data = {
+            "title": "Test Result",
+            "url": "https://example.com/result",
+            "content": "Some content",
+            "engine": "duckduckgo",
+            "engines": ["duckduckgo", "brave"],
+            "category": "general",
+            "publishedDate": "2023-01-15T10:30:00Z",
+            "parsed_url": ["https", "example.com", "/result", "", "", ""],
+            "score": 2.5,
+        }
+
+    def test_category_subclass(self):
+        """Test results with category fields use the matching subclass"""
+        image = SearchResult.from_dict(load_page("images")[0])
+        general = SearchResult.from_dict(self.data)
+
+        assert isinstance(image, ImageResult)
+        assert image.img_src == load_page("images")[0]["img_src"]
+        assert type(general) is SearchResult
+        assert isinstance(SearchResult.from_dict({"category": "files"}), FileResult)
+
+    def test_slots(self):
+        """Test results have no per-instance dict"""
+        for category in CATEGORY_FIXTURES:
+            for result in to_search_results(load_page(category)):
+                assert not hasattr(result, "__dict__")
+
+    def test_get(self):
+        """Test get() mirrors dict.get with the SearXNG key names"""
+        result = SearchResult.from_dict(self.data)
+
+        assert result.get("title") == "Test Result"
+        assert result.get("publishedDate") == "2023-01-15T10:30:00Z"
+        assert result.published_date == "2023-01-15T10:30:00Z"
+        assert result["url"] == "https://example.com/result"
+        # fields searxngr does not use are dropped
+        assert result.get("score") is None
+        assert result.get("template", "default") == "default"
+        assert result.get("img_src", "") == ""
+        assert result.get("_raw") is None
+        with pytest.raises(KeyError):
+            result["parsed_url"]
+
+    def test_to_dict(self):
+        """Test to_dict() returns the used fields unless the raw JSON was kept"""
+        result = SearchResult.from_dict(self.data)
+
+        assert result.to_dict() == {
+            key: value
+            for key, value in self.data.items()
+            if key not in ("parsed_url", "score")
+        }
+
+    def test_to_dict_raw(self):
+        """Test the raw JSON is kept and returned when keep_raw is set"""
+        page = load_page("files")
+
+        assert [r.to_dict() for r in to_search_results(page, keep_raw=True)] == page
+        assert SearchResult.from_dict(page[0])._raw is None
+
+    def test_engines_not_shared(self):
+        """Test a result without engines does not share a default list"""
+        first = SearchResult.from_dict({})
+        second = SearchResult.from_dict({})
+
+        first.engines.append("brave")
+
+        assert second.engines == []
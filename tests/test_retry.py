@@ -0,0 +1,171 @@
+import asyncio
+import time
+from email.utils import formatdate
+from unittest.mock import patch
+
+import pytest
+
+from searxngr.cache import EngineCache
+from searxngr.client import AsyncSearXNGClient, SearXNGClient
+from searxngr.errors import (
+    SearXNGConnectionError,
+    SearXNGHTTPError,
+    SearXNGJSONError,
+    SearXNGTimeoutError,
+)
+from searxngr.retry import RetryPolicy, parse_retry_after, retry_reason
+from searxngr.testing import MockSearXNGServer
+
+
+def create_client(server, client_class=SearXNGClient, **retry_args):
+    return client_class(
+        url=server.url,
+        engine_cache=EngineCache(persist=False),
+        retry=RetryPolicy(**retry_args),
+    )
+
+
+class TestRetryPolicy:
+    """Test the retry policy for transient request failures"""
+
+    def test_parse_retry_after(self):
+        """Test Retry-After headers in seconds and as an HTTP date"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        later = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+        assert 25 < later <= 30
+        assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+    def test_retry_reason(self):
+        """Test only transient errors are retried"""
+        assert retry_reason(SearXNGTimeoutError("timeout")) == "timeout"
+        assert retry_reason(SearXNGConnectionError("refused")) == "connection"
+        assert retry_reason(SearXNGHTTPError("busy", 429)) == "429"
+        assert retry_reason(SearXNGHTTPError("down", 503)) == "503"
+        assert retry_reason(SearXNGHTTPError("missing", 404)) is None
+        assert retry_reason(SearXNGJSONError("bad json")) is None
+
+    def test_backoff_with_full_jitter(self):
+        """Test the wait is random, up to a doubling and capped backoff"""
+        policy = RetryPolicy(retries=10, backoff=1.0, max_backoff=5.0, deadline=0)
+        error = SearXNGHTTPError("down", 503)
+        start = time.monotonic()
+
+        with patch("searxngr.retry.random.uniform", return_value=0.5) as uniform:
+            assert policy.delay(0, error, start) == 0.5
+            uniform.assert_called_with(0, 1.0)
+            policy.delay(2, error, start)
+            uniform.assert_called_with(0, 4.0)
+            policy.delay(5, error, start)
+            uniform.assert_called_with(0, 5.0)
+
+        assert policy.counts == {"503": 3}
+        assert policy.total == 3
+
+    def test_retry_after_honoured(self):
+        """Test the server's Retry-After replaces the random backoff"""
+        policy = RetryPolicy(retries=1)
+        error = SearXNGHTTPError("busy", 429, retry_after=7.0)
+
+        assert policy.delay(0, error, time.monotonic()) == 7.0
+
+    def test_gives_up(self):
+        """Test errors are raised once retries or the deadline run out"""
+        policy = RetryPolicy(retries=1, deadline=5)
+        error = SearXNGHTTPError("busy", 429, retry_after=1.0)
+
+        with pytest.raises(SearXNGHTTPError):
+            policy.delay(1, error, time.monotonic())
+        # the retry would end after the deadline
+        with pytest.raises(SearXNGHTTPError):
+            policy.delay(0, error, time.monotonic() - 4.5)
+        with pytest.raises(SearXNGHTTPError):
+            policy.delay(0, SearXNGHTTPError("missing", 404), time.monotonic())
+        assert policy.total == 0
+
+    def test_long_retry_after_without_deadline(self):
+        """Test a Retry-After longer than max_backoff is not waited for without a deadline"""
+        policy = RetryPolicy(retries=1, max_backoff=10, deadline=0)
+        error = SearXNGHTTPError("busy", 429, retry_after=3600.0)
+
+        with pytest.raises(SearXNGHTTPError):
+            policy.delay(0, error, time.monotonic())
+        assert policy.total == 0
+        # waits within the cap are still honoured
+        error = SearXNGHTTPError("busy", 429, retry_after=10.0)
+        assert policy.delay(0, error, time.monotonic()) == 10.0
+
+
+class TestClientRetries:
+    """Test the SearXNG clients retry transient failures"""
+
+    def test_search_retried(self):
+        """Test a search that fails twice succeeds on the third attempt"""
+        with MockSearXNGServer(fail_first=2, error_status=503) as server:
+            client = create_client(server, retries=2, backoff=0.01)
+
+            results = client.search("test query")
+
+        assert len(results) == 10
+        assert len(server.requests) == 3
+        assert client.retry.counts == {"503": 2}
+
+    def test_search_not_retried_by_default(self):
+        """Test the default policy raises the first failure"""
+        with MockSearXNGServer(fail_first=1, error_status=503) as server:
+            client = SearXNGClient(url=server.url)
+
+            with pytest.raises(SearXNGHTTPError):
+                client.search("test query")
+
+        assert len(server.requests) == 1
+
+    def test_client_errors_not_retried(self):
+        """Test 4xx responses other than 429 fail straight away"""
+        with MockSearXNGServer(fail_first=1, error_status=403) as server:
+            client = create_client(server, retries=3, backoff=0.01)
+
+            with pytest.raises(SearXNGHTTPError) as exc_info:
+                client.search("test query")
+
+        assert exc_info.value.status_code == 403
+        assert len(server.requests) == 1
+
+    def test_retry_after_header(self):
+        """Test the Retry-After header of a 429 response is waited for"""
+        with MockSearXNGServer(
+            fail_first=1, error_status=429, retry_after="1"
+        ) as server:
+            client = create_client(server, retries=1, backoff=0.01)
+            start = time.monotonic()
+
+            results = client.search("test query")
+            elapsed = time.monotonic() - start
+
+        assert len(results) == 10
+        assert elapsed >= 1
+
+    def test_preferences_retried(self):
+        """Test the /preferences download is retried"""
+        with MockSearXNGServer(fail_first=1, error_status=502) as server:
+            client = create_client(server, retries=1, backoff=0.01)
+
+            assert client.engines()
+
+        assert [r["path"] for r in server.requests] == ["/preferences"] * 2
+
+    def test_async_search_retried(self):
+        """Test the async client retries searches"""
+        with MockSearXNGServer(fail_first=1, error_status=500) as server:
+
+            async def search():
+                async with create_client(
+                    server, AsyncSearXNGClient, retries=1, backoff=0.01
+                ) as client:
+                    return await client.search("test query"), client.retry
+
+            results, retry = asyncio.run(search())
+
+        assert len(results) == 10
+        assert retry.counts == {"500": 1}
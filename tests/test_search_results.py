@@ -1,6 +1,46 @@
+import io
 import os
-from unittest.mock import patch
-from searxngr.formatter import print_results
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from html2text import html2text
+from rich.console import Console, Group
+from rich.text import Text
+
+from searxngr.render import (
+    ResultPrinter,
+    print_results,
+    redraw_if_resized,
+    render_cache,
+)
+from searxngr.results import to_search_results
+
+
+@pytest.fixture(autouse=True)
+def terminal_stdout():
+    """Print results through Rich, as they are to a terminal"""
+    with patch.object(sys.stdout, "isatty", return_value=True):
+        yield
+
+
+def markup_console():
+    """Return a mock console whose ``render_str()`` returns the markup as is."""
+    console = MagicMock()
+    console.render_str.side_effect = lambda text, **kwargs: text
+    return console
+
+
+def printed_lines(mock_console):
+    """Return the markup of each line printed to a ``markup_console()``.
+
+    A range of results is printed as one ``Group`` holding a line each.
+    """
+    lines = []
+    for call in mock_console.print.call_args_list:
+        for obj in call[0]:
+            lines.extend(obj.renderables if isinstance(obj, Group) else [obj])
+    return [str(line) for line in lines]
 
 
 class TestSearchResults:
@@ -8,56 +48,61 @@ class TestSearchResults:
 
     def setup_method(self):
         """Set up test fixtures"""
-        self.sample_results = [
-            {
-                "title": "Test Result 1",
-                "url": "https://example.com/result1",
-                "content": "<p>This is a test result with some content to display.</p>",
-                "engine": "testengine",
-                "template": None,
-                "category": "general",
-                "engines": ["testengine", "otherengine"],
-                "publishedDate": None,
-            },
-            {
-                "title": "News Result",
-                "url": "https://news.example.com/article",
-                "content": "<p>This is a news article with content that might need to be truncated when displayed.</p>",
-                "engine": "testengine",
-                "template": None,
-                "category": "news",
-                "engines": ["testengine"],
-                "publishedDate": "2023-01-15T10:30:00Z",
-            },
-            {
-                "title": "Image Result",
-                "url": "https://images.example.com/photo",
-                "content": "<p>Image search result</p>",
-                "engine": "testengine",
-                "template": None,
-                "category": "images",
-                "engines": ["testengine"],
-                "publishedDate": None,
-                "source": "Image Source",
-                "resolution": "1920x1080",
-                "img_src": "https://example.com/image.jpg",
-            },
-            {
-                "title": "Video Result",
-                "url": "https://videos.example.com/watch",
-                "content": "<p>Video search result</p>",
-                "engine": "testengine",
-                "template": None,
-                "category": "videos",
-                "engines": ["testengine"],
-                "publishedDate": None,
-                "author": "Video Author",
-                "length": 122.0,
-            },
-        ]
+        self.sample_results = to_search_results(
+            [
+                {
+                    "title": "Test Result 1",
+                    "url": "https://example.com/result1",
+                    "content": "<p>This is a test result with some content to display.</p>",
+                    "engine": "testengine",
+                    "template": None,
+                    "category": "general",
+                    "engines": ["testengine", "otherengine"],
+                    "publishedDate": None,
+                },
+                {
+                    "title": "News Result",
+                    "url": "https://news.example.com/article",
+                    "content": (
+                        "<p>This is a news article with content that might need "
+                        "to be truncated when displayed.</p>"
+                    ),
+                    "engine": "testengine",
+                    "template": None,
+                    "category": "news",
+                    "engines": ["testengine"],
+                    "publishedDate": "2023-01-15T10:30:00Z",
+                },
+                {
+                    "title": "Image Result",
+                    "url": "https://images.example.com/photo",
+                    "content": "<p>Image search result</p>",
+                    "engine": "testengine",
+                    "template": None,
+                    "category": "images",
+                    "engines": ["testengine"],
+                    "publishedDate": None,
+                    "source": "Image Source",
+                    "resolution": "1920x1080",
+                    "img_src": "https://example.com/image.jpg",
+                },
+                {
+                    "title": "Video Result",
+                    "url": "https://videos.example.com/watch",
+                    "content": "<p>Video search result</p>",
+                    "engine": "testengine",
+                    "template": None,
+                    "category": "videos",
+                    "engines": ["testengine"],
+                    "publishedDate": None,
+                    "author": "Video Author",
+                    "length": 122.0,
+                },
+            ]
+        )
 
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_basic(self, mock_terminal_size, mock_console):
         """Test basic result printing functionality"""
         # Mock terminal size
@@ -67,15 +112,41 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that basic result elements were printed
-        call_args = mock_console.print.call_args_list
-        assert any("Test Result 1" in str(call) for call in call_args)
-        assert any("example.com" in str(call) for call in call_args)
-        assert any("testengine" in str(call) for call in call_args)
+        assert any("Test Result 1" in line for line in lines)
+        assert any("example.com" in line for line in lines)
+        assert any("testengine" in line for line in lines)
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_result_printer_prints_new_results(self, mock_terminal_size, mock_console):
+        """Test each update prints only the results added since the last one"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        results = []
+        printer = ResultPrinter(results, count=3, start_at=1)
 
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+        assert printer.update() == 0
+        results.extend(self.sample_results[:2])
+        assert printer.update() == 1
+        results.extend(self.sample_results[2:])
+        assert printer.update() == 2
+        assert printer.update() == 0
+
+        titles = [
+            line for line in printed_lines(mock_console) if "[bold green]" in line
+        ]
+        assert "News Result" in titles[0]
+        assert "Image Result" in titles[1]
+        assert [title.split("[/cyan]")[0] for title in titles] == [
+            " [cyan] 2.",
+            " [cyan] 3.",
+            " [cyan] 4.",
+        ]
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_with_long_content(self, mock_terminal_size, mock_console):
         """Test result printing with content that needs truncation"""
         # Mock terminal size
@@ -85,16 +156,14 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that content was truncated
-        call_args = mock_console.print.call_args_list
-        content_calls = [
-            call for call in call_args if "This is a test result" in str(call)
-        ]
-        assert len(content_calls) > 0
+        content_lines = [line for line in lines if "This is a test result" in line]
+        assert len(content_lines) > 0
 
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_with_expand(self, mock_terminal_size, mock_console):
         """Test result printing with expand option"""
         # Mock terminal size
@@ -104,13 +173,13 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that full URL was printed
-        call_args = mock_console.print.call_args_list
-        assert any("https://example.com/result1" in str(call) for call in call_args)
+        assert any("https://example.com/result1" in line for line in lines)
 
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_news_category(self, mock_terminal_size, mock_console):
         """Test result printing for news category with date"""
         # Mock terminal size
@@ -120,16 +189,16 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that news details were printed
-        call_args = mock_console.print.call_args_list
-        assert any("News Result" in str(call) for call in call_args)
-        assert any("example.com" in str(call) for call in call_args)
+        assert any("News Result" in line for line in lines)
+        assert any("example.com" in line for line in lines)
         # Check that published date was formatted (could be different format)
-        assert any("2023" in str(call) for call in call_args)
+        assert any("2023" in line for line in lines)
 
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_images_category(self, mock_terminal_size, mock_console):
         """Test result printing for images category"""
         # Mock terminal size
@@ -139,16 +208,16 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that image details were printed
-        call_args = mock_console.print.call_args_list
-        assert any("Image Result" in str(call) for call in call_args)
-        assert any("1920x1080" in str(call) for call in call_args)
-        assert any("Image Source" in str(call) for call in call_args)
-        assert any("https://example.com/image.jpg" in str(call) for call in call_args)
-
-    @patch("searxngr.formatter.console")
-    @patch("searxngr.formatter.os.get_terminal_size")
+        assert any("Image Result" in line for line in lines)
+        assert any("1920x1080" in line for line in lines)
+        assert any("Image Source" in line for line in lines)
+        assert any("https://example.com/image.jpg" in line for line in lines)
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
     def test_print_results_videos_category(self, mock_terminal_size, mock_console):
         """Test result printing for videos category"""
         # Mock terminal size
@@ -158,9 +227,164 @@ class TestSearchResults:
 
         # Verify that console.print was called
         mock_console.print.assert_called()
+        lines = printed_lines(mock_console)
 
         # Check that video details were printed
-        call_args = mock_console.print.call_args_list
-        assert any("Video Result" in str(call) for call in call_args)
-        assert any("Video Author" in str(call) for call in call_args)
-        assert any("02:02" in str(call) for call in call_args)  # Formatted length
+        assert any("Video Result" in line for line in lines)
+        assert any("Video Author" in line for line in lines)
+        assert any("02:02" in line for line in lines)  # Formatted length
+
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_print_results_single_write(self, mock_terminal_size):
+        """Test a page of results is written to the terminal at once"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        out = io.StringIO()
+        out.write = MagicMock(side_effect=out.write)
+        console = Console(file=out, width=80, force_terminal=True)
+
+        with patch("searxngr.formatter.console", console):
+            print_results(self.sample_results, count=4, expand=True)
+
+        assert out.write.call_count == 1
+        text = Text.from_ansi(out.getvalue()).plain
+        assert " 1. Test Result 1 [example.com]" in text
+        assert " 4. Video Result" in text
+        assert "     https://example.com/result1\n" in text
+
+
+class TestRenderCache:
+    """Test derived display values are reused across redraws"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        render_cache.clear()
+        self.results = to_search_results(
+            [
+                {
+                    "title": "News Result",
+                    "url": "https://news.example.com/article",
+                    "content": "<p>" + " ".join(["word"] * 40) + "</p>",
+                    "engine": "testengine",
+                    "category": "news",
+                    "engines": ["testengine"],
+                    "publishedDate": "2023-01-15T10:30:00Z",
+                }
+            ]
+        )
+
+    def content_lines(self, mock_console):
+        return [line for line in printed_lines(mock_console) if "word" in line]
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    @patch("html2text.html2text", side_effect=html2text)
+    def test_redraw_reuses_cleaned_content(
+        self, mock_html2text, mock_terminal_size, mock_console
+    ):
+        """Test html2text runs once per result across redraws"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+
+        print_results(self.results, count=1)
+        print_results(self.results, count=1, expand=True)
+
+        assert mock_html2text.call_count == 1
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    @patch("html2text.html2text", side_effect=html2text)
+    def test_new_results_list_recomputes(
+        self, mock_html2text, mock_terminal_size, mock_console
+    ):
+        """Test a new results list starts with an empty cache"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+
+        print_results(self.results, count=1)
+        print_results(list(self.results), count=1)
+
+        assert mock_html2text.call_count == 2
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_width_change_rewraps(self, mock_terminal_size, mock_console):
+        """Test the content is wrapped again when the terminal width changes"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        print_results(self.results, count=1)
+        wide = self.content_lines(mock_console)
+
+        mock_console.reset_mock()
+        mock_terminal_size.return_value = os.terminal_size((40, 24))
+        print_results(self.results, count=1)
+        narrow = self.content_lines(mock_console)
+
+        assert len(narrow) > len(wide)
+        assert all(len(line) <= 40 for line in narrow)
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_max_content_words_change(self, mock_terminal_size, mock_console):
+        """Test the content is truncated again when max_content_words changes"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        print_results(self.results, count=1, max_content_words=5)
+        short = " ".join(self.content_lines(mock_console))
+
+        mock_console.reset_mock()
+        print_results(self.results, count=1, max_content_words=0)
+        full = " ".join(self.content_lines(mock_console))
+
+        assert short.split().count("word") == 5
+        assert full.split().count("word") == 40
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_width_read_once_per_pass(self, mock_terminal_size, mock_console):
+        """Test the terminal size is read once however many results are printed"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        results = self.results * 5
+
+        print_results(results, count=5)
+
+        assert mock_terminal_size.call_count == 1
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    @patch("html2text.html2text", side_effect=html2text)
+    def test_redraw_if_resized(self, mock_html2text, mock_terminal_size, mock_console):
+        """Test the last results are redrawn from the cache after a resize"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        print_results(self.results, count=1)
+        assert not redraw_if_resized()
+
+        mock_console.reset_mock()
+        mock_terminal_size.return_value = os.terminal_size((40, 24))
+        assert redraw_if_resized()
+        narrow = self.content_lines(mock_console)
+        # the new width is now the one on screen
+        assert not redraw_if_resized()
+
+        assert narrow and all(len(line) <= 40 for line in narrow)
+        assert mock_html2text.call_count == 1
+
+    @patch("searxngr.formatter.console", new_callable=markup_console)
+    @patch("searxngr.render.os.get_terminal_size")
+    def test_redraw_keeps_printer_context(self, mock_terminal_size, mock_console):
+        """Test a page printed as it arrived is redrawn whole with its options"""
+        mock_terminal_size.return_value = os.terminal_size((80, 24))
+        results = []
+        printer = ResultPrinter(results, count=2, expand=True)
+        results.extend(self.results)
+        printer.update()
+        results.extend(to_search_results([{"title": "Second", "url": "https://b"}]))
+        printer.update()
+
+        mock_console.reset_mock()
+        mock_terminal_size.return_value = os.terminal_size((60, 24))
+        assert redraw_if_resized()
+
+        printed = printed_lines(mock_console)
+        assert any("News Result" in line for line in printed)
+        assert any("Second" in line for line in printed)
+        assert any("[link=https://b]" in line for line in printed)
+
+    def test_nothing_to_redraw(self):
+        """Test there is nothing to redraw before any results are printed"""
+        assert not redraw_if_resized()
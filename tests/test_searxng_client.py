@@ -1,9 +1,29 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager, nullcontext
 from unittest.mock import patch, MagicMock
 
-from searxngr.client import SearXNGClient
+import httpx
+import pytest
+
+from searxngr.client import (
+    AsyncSearXNGClient,
+    SearXNGClient,
+    SearXNGConnectionError,
+    SearXNGHTTPError,
+    SearXNGJSONError,
+)
 from searxngr.constants import SAFE_SEARCH_OPTIONS
 
 
+def search_response(data=None, content=None, status_code=200):
+    """Return a response for a mocked client.stream() search request"""
+    if content is None:
+        content = json.dumps(data).encode("utf-8")
+    request = httpx.Request("GET", "https://example.com/search")
+    return nullcontext(httpx.Response(status_code, request=request, content=content))
+
+
 class TestSearXNGClient:
     """Test SearXNG client functionality"""
 
@@ -30,6 +50,45 @@ class TestSearXNGClient:
         assert client.username == "testuser"
         assert client.password == "testpass"
 
+    @patch("searxngr.client.httpx.Client")
+    def test_client_pool_and_timeouts(self, mock_httpx_client):
+        """Test pool limits and per phase timeouts are passed to httpx"""
+        SearXNGClient(
+            url=self.base_url,
+            timeout=20,
+            max_connections=4,
+            keepalive_expiry=10,
+            connect_timeout=2,
+            pool_timeout=1,
+        )
+
+        kwargs = mock_httpx_client.call_args.kwargs
+        assert kwargs["timeout"] == httpx.Timeout(20, connect=2, read=20, pool=1)
+        assert kwargs["limits"] == httpx.Limits(
+            max_connections=4, max_keepalive_connections=4, keepalive_expiry=10
+        )
+        assert kwargs["http2"] is False
+
+    @patch("searxngr.client._http2_available", return_value=False)
+    @patch("searxngr.client.console")
+    @patch("searxngr.client.httpx.Client")
+    def test_client_http2_unavailable(self, mock_httpx_client, mock_console, _):
+        """Test HTTP/2 falls back to HTTP/1.1 with a warning without h2"""
+        client = SearXNGClient(url=self.base_url, http2=True)
+
+        assert client.http2 is False
+        assert mock_httpx_client.call_args.kwargs["http2"] is False
+        assert "h2" in mock_console.print.call_args[0][0]
+
+    @patch("searxngr.client._http2_available", return_value=True)
+    @patch("searxngr.client.httpx.Client")
+    def test_client_http2(self, mock_httpx_client, _):
+        """Test HTTP/2 is enabled when h2 is installed"""
+        client = SearXNGClient(url=self.base_url, http2=True)
+
+        assert client.http2 is True
+        assert mock_httpx_client.call_args.kwargs["http2"] is True
+
     @patch("searxngr.client.httpx.Client")
     def test_get_request(self, mock_httpx_client):
         """Test GET request functionality"""
@@ -74,19 +133,18 @@ class TestSearXNGClient:
     def test_search_get_method(self, mock_httpx_client):
         """Test search functionality with GET method"""
         # Mock the HTTP client and response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [
-                {
-                    "title": "Test Result",
-                    "url": "https://example.com/test",
-                    "content": "Test content",
-                    "engine": "testengine",
-                }
-            ]
-        }
-        mock_httpx_client.return_value.get.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {
+                "results": [
+                    {
+                        "title": "Test Result",
+                        "url": "https://example.com/test",
+                        "content": "Test content",
+                        "engine": "testengine",
+                    }
+                ]
+            }
+        )
 
         client = SearXNGClient(url=self.base_url)
         results = client.search(
@@ -102,31 +160,30 @@ class TestSearXNGClient:
         assert results[0]["title"] == "Test Result"
 
         # Verify the URL was constructed correctly
-        call_args = mock_httpx_client.return_value.get.call_args
-        assert "test query" in call_args[0][0]
-        assert "general" in call_args[0][0]
+        call_args = mock_httpx_client.return_value.stream.call_args
+        assert "test query" in call_args[1]["url"]
+        assert "general" in call_args[1]["url"]
         assert (
-            "testengine" not in call_args[0][0]
+            "testengine" not in call_args[1]["url"]
         )  # engines not used when category is set
-        assert str(SAFE_SEARCH_OPTIONS["moderate"]) in call_args[0][0]
+        assert str(SAFE_SEARCH_OPTIONS["moderate"]) in call_args[1]["url"]
 
     @patch("searxngr.client.httpx.Client")
     def test_search_post_method(self, mock_httpx_client):
         """Test search functionality with POST method"""
         # Mock the HTTP client and response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [
-                {
-                    "title": "Test Result",
-                    "url": "https://example.com/test",
-                    "content": "Test content",
-                    "engine": "testengine",
-                }
-            ]
-        }
-        mock_httpx_client.return_value.post.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {
+                "results": [
+                    {
+                        "title": "Test Result",
+                        "url": "https://example.com/test",
+                        "content": "Test content",
+                        "engine": "testengine",
+                    }
+                ]
+            }
+        )
 
         client = SearXNGClient(url=self.base_url)
         results = client.search(
@@ -142,7 +199,8 @@ class TestSearXNGClient:
         assert results[0]["title"] == "Test Result"
 
         # Verify the body was constructed correctly
-        call_args = mock_httpx_client.return_value.post.call_args
+        call_args = mock_httpx_client.return_value.stream.call_args
+        assert call_args[1]["method"] == "POST"
         body = call_args[1]["data"]
         assert body["q"] == "test query"
         assert body["categories"] == "general"
@@ -153,42 +211,39 @@ class TestSearXNGClient:
     def test_search_with_site_filter(self, mock_httpx_client):
         """Test search functionality with site filter"""
         # Mock the HTTP client and response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
-        mock_httpx_client.return_value.get.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": []}
+        )
 
         client = SearXNGClient(url=self.base_url)
         client.search(query="test query", site="example.com", http_method="GET")
 
         # Verify the site filter was applied
-        call_args = mock_httpx_client.return_value.get.call_args
-        assert "site:example.com test query" in call_args[0][0]
+        call_args = mock_httpx_client.return_value.stream.call_args
+        assert "site:example.com test query" in call_args[1]["url"]
 
     @patch("searxngr.client.httpx.Client")
     def test_search_with_time_range(self, mock_httpx_client):
         """Test search functionality with time range filter"""
         # Mock the HTTP client and response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
-        mock_httpx_client.return_value.get.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": []}
+        )
 
         client = SearXNGClient(url=self.base_url)
         client.search(query="test query", time_range="week", http_method="GET")
 
         # Verify the time range was applied
-        call_args = mock_httpx_client.return_value.get.call_args
-        assert "time_range=week" in call_args[0][0]
+        call_args = mock_httpx_client.return_value.stream.call_args
+        assert "time_range=week" in call_args[1]["url"]
 
     @patch("searxngr.client.httpx.Client")
     def test_empty_results_handling(self, mock_httpx_client):
         """Test handling of empty search results"""
         # Mock the HTTP client and response with empty results
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}
-        mock_httpx_client.return_value.get.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": []}
+        )
 
         client = SearXNGClient(url=self.base_url)
         results = client.search(query="test query")
@@ -200,16 +255,280 @@ class TestSearXNGClient:
     def test_unresponsive_engines_handling(self, mock_httpx_client):
         """Test handling of unresponsive engines"""
         # Mock the HTTP client and response with unresponsive engines
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [],
-            "unresponsive_engines": [["engine1", "timeout"], ["engine2", "error"]],
-        }
-        mock_httpx_client.return_value.get.return_value = mock_response
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {
+                "results": [],
+                "unresponsive_engines": [["engine1", "timeout"], ["engine2", "error"]],
+            }
+        )
 
         client = SearXNGClient(url=self.base_url)
         results = client.search(query="test query")
 
         # Verify results are returned despite unresponsive engines
         assert results == []
+
+    @patch("searxngr.client.httpx.Client")
+    def test_search_uses_result_cache(self, mock_httpx_client):
+        """Test cached results are returned without a network request"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": [{"title": "Test Result"}]}
+        )
+        cache = MagicMock()
+        cache.get.return_value = None
+
+        client = SearXNGClient(url=self.base_url, cache=cache)
+        results = client.search(query="test query", time_range="week")
+
+        cache.set.assert_called_once_with(cache.get.call_args[0][0], results)
+
+        cache.get.return_value = [{"title": "Cached Result"}]
+        results = client.search(query="test query", time_range="week")
+
+        assert results == [{"title": "Cached Result"}]
+        assert mock_httpx_client.return_value.stream.call_count == 1
+
+    @patch("searxngr.client.httpx.Client")
+    def test_search_refresh_skips_cache_read(self, mock_httpx_client):
+        """Test refresh_cache fetches from the server and updates the cache"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": [{"title": "Fresh Result"}]}
+        )
+        cache = MagicMock()
+        cache.get.return_value = [{"title": "Cached Result"}]
+
+        client = SearXNGClient(url=self.base_url, cache=cache, refresh_cache=True)
+        results = client.search(query="test query")
+
+        assert results == [{"title": "Fresh Result"}]
+        cache.get.assert_not_called()
+        cache.set.assert_called_once()
+
+    @patch("searxngr.client.httpx.Client")
+    def test_engines_uses_fresh_engine_cache(self, mock_httpx_client):
+        """Test a fresh cached catalogue skips the /preferences download"""
+        engine_cache = MagicMock()
+        engine_cache.get.return_value = {"engines": [{"name": "google"}]}
+        engine_cache.is_fresh.return_value = True
+
+        client = SearXNGClient(url=self.base_url, engine_cache=engine_cache)
+
+        assert client.engines() == [{"name": "google"}]
+        mock_httpx_client.return_value.get.assert_not_called()
+
+    @patch("searxngr.client.httpx.Client")
+    def test_engines_revalidates_stale_engine_cache(self, mock_httpx_client):
+        """Test a stale catalogue is revalidated with its ETag"""
+        request = httpx.Request("GET", f"{self.base_url}/preferences")
+        mock_httpx_client.return_value.get.return_value = httpx.Response(
+            304, request=request
+        )
+        engine_cache = MagicMock()
+        engine_cache.get.return_value = {
+            "engines": [{"name": "google"}],
+            "etag": '"v1"',
+            "last_modified": None,
+        }
+        engine_cache.is_fresh.return_value = False
+
+        client = SearXNGClient(url=self.base_url, engine_cache=engine_cache)
+
+        assert client.engines() == [{"name": "google"}]
+        headers = mock_httpx_client.return_value.get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        engine_cache.touch.assert_called_once_with(self.base_url)
+
+    @patch("searxngr.client.extract_engines_from_preferences")
+    @patch("searxngr.client.httpx.Client")
+    def test_engines_stores_catalogue(self, mock_httpx_client, mock_extract):
+        """Test a downloaded catalogue is stored with its validators"""
+        request = httpx.Request("GET", f"{self.base_url}/preferences")
+        mock_httpx_client.return_value.get.return_value = httpx.Response(
+            200, request=request, text="<html></html>", headers={"ETag": '"v2"'}
+        )
+        mock_extract.return_value = [{"name": "google"}]
+        engine_cache = MagicMock()
+        engine_cache.get.return_value = None
+
+        client = SearXNGClient(url=self.base_url, engine_cache=engine_cache)
+
+        assert client.engines() == [{"name": "google"}]
+        engine_cache.set.assert_called_once_with(
+            self.base_url, [{"name": "google"}], etag='"v2"', last_modified=None
+        )
+
+    @patch("searxngr.client.httpx.Client")
+    def test_iter_search_yields_results_as_received(self, mock_httpx_client):
+        """Test iter_search yields a result before the rest of the body arrives"""
+        received = []
+
+        def body():
+            for chunk in (
+                b'{"results": [{"title": "first"}',
+                b', {"title": "second"}]}',
+            ):
+                received.append(chunk)
+                yield chunk
+
+        request = httpx.Request("GET", f"{self.base_url}/search")
+        mock_httpx_client.return_value.stream.return_value = nullcontext(
+            httpx.Response(200, request=request, content=body())
+        )
+
+        client = SearXNGClient(url=self.base_url)
+        results = client.iter_search(query="test query")
+
+        assert next(results) == {"title": "first"}
+        assert len(received) == 1
+        assert list(results) == [{"title": "second"}]
+
+    @patch("searxngr.client.httpx.Client")
+    def test_search_pages_returns_pages_in_order(self, mock_httpx_client):
+        """Test search_pages fetches pages concurrently and keeps page order"""
+
+        def fake_stream(url, **kwargs):
+            pageno = url.split("pageno=")[1] if "pageno=" in url else "1"
+            return search_response({"results": [{"title": f"page {pageno}"}]})
+
+        mock_httpx_client.return_value.stream.side_effect = fake_stream
+
+        client = SearXNGClient(url=self.base_url)
+        pages = client.search_pages("test query", [1, 2, 3, 4])
+
+        assert [page[0]["title"] for page in pages] == [
+            "page 1",
+            "page 2",
+            "page 3",
+            "page 4",
+        ]
+        assert mock_httpx_client.return_value.stream.call_count == 4
+
+
+class TestAsyncSearXNGClient:
+    """Test asyncio SearXNG client functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.base_url = "https://example.com"
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_search_get_method(self, mock_httpx_client):
+        """Test async search builds the same GET request as the sync client"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": [{"title": "Test Result", "url": "https://example.com/test"}]}
+        )
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        results = asyncio.run(
+            client.search(query="test query", time_range="week", pageno=2)
+        )
+
+        assert results[0]["title"] == "Test Result"
+        call_args = mock_httpx_client.return_value.stream.call_args
+        assert "test query" in call_args[1]["url"]
+        assert "time_range=week" in call_args[1]["url"]
+        assert "pageno=2" in call_args[1]["url"]
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_search_post_method(self, mock_httpx_client):
+        """Test async search with POST method"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            {"results": []}
+        )
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        asyncio.run(
+            client.search(query="test query", categories=["news"], http_method="POST")
+        )
+
+        body = mock_httpx_client.return_value.stream.call_args[1]["data"]
+        assert body["q"] == "test query"
+        assert body["categories"] == "news"
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_concurrent_searches(self, mock_httpx_client):
+        """Test several searches can run concurrently on one event loop"""
+        in_flight = 0
+        max_in_flight = 0
+
+        @asynccontextmanager
+        async def fake_stream(url, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            with search_response({"results": [{"url": url}]}) as response:
+                yield response
+
+        mock_httpx_client.return_value.stream = fake_stream
+
+        async def run():
+            client = AsyncSearXNGClient(url=self.base_url)
+            return await asyncio.gather(
+                *(client.search(query=f"query {i}") for i in range(5))
+            )
+
+        pages = asyncio.run(run())
+
+        assert len(pages) == 5
+        assert max_in_flight == 5
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_search_pages_limits_concurrency(self, mock_httpx_client):
+        """Test search_pages sends no more than max_workers requests at once"""
+        in_flight = 0
+        max_in_flight = 0
+
+        @asynccontextmanager
+        async def fake_stream(url, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            with search_response({"results": [{"url": url}]}) as response:
+                yield response
+
+        mock_httpx_client.return_value.stream = fake_stream
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        pages = asyncio.run(
+            client.search_pages("test query", range(2, 10), max_workers=3)
+        )
+
+        assert all(f"pageno={i}" in page[0]["url"] for i, page in enumerate(pages, 2))
+        assert max_in_flight == 3
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_connect_error_translated(self, mock_httpx_client):
+        """Test httpx connection errors raise SearXNGConnectionError"""
+        mock_httpx_client.return_value.stream.side_effect = httpx.ConnectError(
+            "refused"
+        )
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        with pytest.raises(SearXNGConnectionError):
+            asyncio.run(client.search(query="test query"))
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_http_error_translated(self, mock_httpx_client):
+        """Test HTTP error responses raise SearXNGHTTPError"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            status_code=503
+        )
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        with pytest.raises(SearXNGHTTPError):
+            asyncio.run(client.search(query="test query"))
+
+    @patch("searxngr.client.httpx.AsyncClient")
+    def test_json_error_translated(self, mock_httpx_client):
+        """Test invalid JSON raises SearXNGJSONError"""
+        mock_httpx_client.return_value.stream.return_value = search_response(
+            content=b"<html></html>"
+        )
+
+        client = AsyncSearXNGClient(url=self.base_url)
+        with pytest.raises(SearXNGJSONError):
+            asyncio.run(client.search(query="test query"))
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from searxngr.cache import EngineCache
+from searxngr.client import AsyncSearXNGClient, SearXNGClient, SearXNGHTTPError
+from searxngr.singleflight import AsyncSingleFlight, SingleFlight
+from searxngr.testing import MockSearXNGServer
+
+
+def run_together(calls):
+    """Run the calls on separate threads at the same time and return the results."""
+    barrier = threading.Barrier(len(calls))
+
+    def run(call):
+        barrier.wait()
+        return call()
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+class TestSingleFlight:
+    """Test sharing calls that are in flight at the same time"""
+
+    def test_shared_call(self):
+        """Test concurrent callers with the same key share one call"""
+        flight = SingleFlight()
+        calls = []
+
+        def call():
+            calls.append(1)
+            time.sleep(0.2)
+            return "result"
+
+        results = run_together([lambda: flight.do("key", call)] * 4)
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        # the key is forgotten once the call has completed
+        assert flight.do("key", lambda: "again") == "again"
+
+    def test_different_keys(self):
+        """Test calls with different keys are not shared"""
+        flight = SingleFlight()
+
+        results = run_together(
+            [lambda: flight.do("a", lambda: "a"), lambda: flight.do("b", lambda: "b")]
+        )
+
+        assert results == ["a", "b"]
+
+    def test_exception_shared(self):
+        """Test every waiting caller gets the exception of the shared call"""
+        flight = SingleFlight()
+
+        def call():
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        def do():
+            with pytest.raises(ValueError):
+                flight.do("key", call)
+
+        run_together([do] * 3)
+
+    def test_async_shared_call(self):
+        """Test concurrent coroutines with the same key share one call"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", call) for _ in range(4)))
+
+        assert asyncio.run(main()) == ["result"] * 4
+        assert len(calls) == 1
+
+    def test_async_cancelled_caller(self):
+        """Test cancelling one caller does not cancel the call for the others"""
+        flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            first = asyncio.ensure_future(flight.do("key", call))
+            second = asyncio.ensure_future(flight.do("key", call))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == "result"
+
+
+class TestClientSingleFlight:
+    """Test the SearXNG clients share identical concurrent requests"""
+
+    def test_identical_searches_shared(self):
+        """Test identical concurrent searches make one request"""
+        with MockSearXNGServer(latency=0.2) as server:
+            client = SearXNGClient(url=server.url)
+
+            results = run_together(
+                [
+                    lambda: client.search("test query", categories=["news"]),
+                    lambda: client.search(" test query", categories=["news"]),
+                    lambda: client.search("test query", pageno=1, categories=["news"]),
+                ]
+            )
+
+        assert len(server.requests) == 1
+        assert results[0] == results[1] == results[2]
+        # each caller gets its own list
+        assert results[0] is not results[1]
+
+    def test_different_searches_not_shared(self):
+        """Test searches with different parameters each make a request"""
+        with MockSearXNGServer(latency=0.1) as server:
+            client = SearXNGClient(url=server.url)
+
+            run_together(
+                [
+                    lambda: client.search("test query"),
+                    lambda: client.search("test query", pageno=2),
+                ]
+            )
+
+        assert len(server.requests) == 2
+
+    def test_failed_search_shared(self):
+        """Test every caller of a shared search gets its error"""
+        with MockSearXNGServer(latency=0.2, error_rate=1.0) as server:
+            client = SearXNGClient(url=server.url)
+
+            def search():
+                with pytest.raises(SearXNGHTTPError):
+                    client.search("test query")
+
+            run_together([search] * 3)
+
+        assert len(server.requests) == 1
+
+    def test_engines_and_categories_shared(self):
+        """Test concurrent engines() and categories() share one /preferences"""
+        with MockSearXNGServer(latency=0.2) as server:
+            client = SearXNGClient(
+                url=server.url, engine_cache=EngineCache(persist=False)
+            )
+
+            engines, categories = run_together([client.engines, client.categories])
+
+        assert [r["path"] for r in server.requests] == ["/preferences"]
+        assert engines
+        assert categories
+
+    def test_async_identical_searches_shared(self):
+        """Test identical concurrent async searches make one request"""
+        with MockSearXNGServer(latency=0.1) as server:
+
+            async def search():
+                async with AsyncSearXNGClient(url=server.url) as client:
+                    return await asyncio.gather(
+                        client.search("test query"),
+                        client.search("test query"),
+                        client.engines(),
+                        client.categories(),
+                    )
+
+            first, second, engines, categories = asyncio.run(search())
+
+        assert first == second
+        assert first is not second
+        assert sorted(r["path"] for r in server.requests) == [
+            "/preferences",
+            "/search",
+        ]
@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from searxngr.testing import MockSearXNGServer
+
+HEAVY_MODULES = [
+    "babel",
+    "bs4",
+    "dateutil",
+    "html2text",
+    "httpx",
+    "prompt_toolkit",
+    "pyperclip",
+    "rich.table",
+]
+
+
+def imported_modules(code, env=None):
+    """Run code in a fresh interpreter with -X importtime and return the imported modules"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return result, modules
+
+
+def run_main(argv, tmp_path, hidden=()):
+    """Run searxngr with argv, as if the modules in hidden were not installed"""
+    env = dict(os.environ, XDG_CONFIG_HOME=str(tmp_path), XDG_CACHE_HOME=str(tmp_path))
+    return imported_modules(
+        f"""
+        import sys
+        sys.modules.update(dict.fromkeys({list(hidden)!r}))
+        sys.argv = {argv!r}
+        from searxngr.cli import main
+        main()
+        """,
+        env=env,
+    )
+
+
+class TestStartup:
+    """Test heavy dependencies are only imported on the code paths that use them"""
+
+    def test_import_cli(self):
+        """Test importing the CLI does not load any heavy dependency"""
+        result, modules = imported_modules("import searxngr.cli")
+
+        assert result.returncode == 0
+        assert "searxngr.cli" in modules
+        assert modules.isdisjoint(HEAVY_MODULES)
+
+    def test_version(self, tmp_path):
+        """Test --version does not load any heavy dependency or Rich"""
+        result, modules = run_main(["searxngr", "--version"], tmp_path)
+
+        assert result.returncode == 0
+        assert result.stdout.strip()
+        assert modules.isdisjoint(HEAVY_MODULES)
+        assert not {name for name in modules if name.split(".")[0] == "rich"}
+
+    def test_json_noprompt(self, tmp_path):
+        """Test a --json --np search only loads the HTTP client"""
+        with MockSearXNGServer() as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "--json", "--np", "query"]
+            result, modules = run_main(argv, tmp_path)
+
+        assert result.returncode == 0
+        assert "httpx" in modules
+        # httpx itself may load rich.table for its command line entry point
+        assert modules.isdisjoint(set(HEAVY_MODULES) - {"httpx", "rich.table"})
+        assert "searxngr.formatter" not in modules
+        assert "searxngr.interactive" not in modules
+
+    def test_noprompt_piped(self, tmp_path):
+        """Test a --np search piped to another program never loads Rich"""
+        # no unresponsive engines, which are reported through Rich
+        with MockSearXNGServer(unresponsive_engines=[]) as server:
+            argv = ["searxngr", "--searxng-url", server.url, "--no-cache"]
+            argv += ["--url-handler", "true", "--np", "query"]
+            # httpx loads Rich for its own command line when its cli extra is
+            # installed, so only the modules searxngr imports are counted
+            result, modules = run_main(argv, tmp_path, hidden=["httpx._main"])
+
+        assert result.returncode == 0
+        assert "  1. " in result.stdout
+        assert not {name for name in modules if name.split(".")[0] == "rich"}
+        assert "searxngr.formatter" not in modules
+        assert "searxngr.plain" in modules
@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+from searxngr.stream import SearchResponseDecoder
+from searxngr.testing.mock_server import CATEGORY_FIXTURES, FIXTURES_DIR
+
+
+def decode(body, chunk_size):
+    decoder = SearchResponseDecoder()
+    results = []
+    for start in range(0, len(body), chunk_size):
+        end = start + chunk_size
+        results += decoder.feed(body[start:end])
+    results += decoder.close()
+    return results, decoder
+
+
+class TestSearchResponseDecoder:
+    """Test incremental decoding of SearXNG search responses"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024, 1 << 20])
+    def test_matches_json_loads(self, chunk_size):
+        """Test the decoded results match json.loads for any chunk size"""
+        for fixture in CATEGORY_FIXTURES.values():
+            with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+                body = f.read()
+
+            results, _ = decode(body, chunk_size)
+
+            assert results == json.loads(body)["results"]
+
+    def test_fixtures_one_byte_at_a_time(self):
+        """Test every fixture decodes the same as json.loads fed byte by byte"""
+        for fixture in CATEGORY_FIXTURES.values():
+            with open(os.path.join(FIXTURES_DIR, fixture), "rb") as f:
+                body = f.read()
+            decoder = SearchResponseDecoder()
+            # wait for no more data than the next byte before decoding again
+            decoder._wait = 0
+            results = []
+            for byte in body:
+                results += decoder.feed(bytes((byte,)))
+                decoder._wait = 0
+            results += decoder.close()
+
+            assert results == json.loads(body)["results"]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b'{"number_of_results": 12.5, "results": [{"a": 1}]}',
+            b'{"results": [1.5, -2e+10, 3E-2, 4.25e1], "n": -0.5e-3}',
+        ],
+    )
+    def test_numbers_split_between_chunks(self, body):
+        """Test a number cut off by the end of a chunk waits for the rest of it"""
+        expected = json.loads(body)["results"]
+        for split in range(1, len(body)):
+            decoder = SearchResponseDecoder()
+
+            results = decoder.feed(body[:split])
+            results += decoder.feed(body[split:])
+            results += decoder.close()
+
+            assert results == expected
+
+    def test_results_available_before_end(self):
+        """Test each result is returned as soon as it has been received"""
+        decoder = SearchResponseDecoder()
+
+        first = decoder.feed(b'{"query": "q", "results": [{"title": "first"}, {"ti')
+        second = decoder.feed(b'tle": "second"}], "number_of_results": 2}')
+
+        assert first == [{"title": "first"}]
+        assert second == [{"title": "second"}]
+        assert decoder.close() == []
+
+    def test_other_values_dropped(self):
+        """Test only results and unresponsive engines are kept"""
+        body = json.dumps(
+            {
+                "results": [{"title": "result"}],
+                "infoboxes": [{"content": "x" * 10000}],
+                "suggestions": ["a", "b"],
+                "number_of_results": 12345,
+                "unresponsive_engines": [["brave", "timeout"]],
+            }
+        ).encode("utf-8")
+
+        results, decoder = decode(body, 5)
+
+        assert results == [{"title": "result"}]
+        assert decoder.unresponsive_engines == [["brave", "timeout"]]
+        assert not hasattr(decoder, "infoboxes")
+
+    def test_multibyte_characters_split(self):
+        """Test UTF-8 characters split between chunks are decoded"""
+        body = json.dumps({"results": [{"title": "Zürich 東京"}]}, ensure_ascii=False)
+
+        results, _ = decode(body.encode("utf-8"), 1)
+
+        assert results == [{"title": "Zürich 東京"}]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"",
+            b'{"results": [{"title": "a"}',
+            b"[]",
+            b'{"results" []}',
+            b"{} {}",
+            b'{"a": 1 "results": [1]}',
+            b'{,"results": [1]}',
+            b'{"a": 1,, "results": [1]}',
+            b'{"results": [1],}',
+            b'{"results": [1.]}',
+        ],
+    )
+    def test_invalid_json(self, body):
+        """Test malformed or truncated responses raise JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            decode(body, 3)